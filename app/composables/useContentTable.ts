@@ -7,19 +7,27 @@ import type { FilterState, SortState, TableAuthor, TableContentItem } from '~/ty
 import { tableParamsSchema } from '~/types/table'
 import {
   parseArrayParam,
-  applyFiltersExcept,
   buildFilterState,
-  applyAllFilters,
-  sortItems,
-  paginateItems,
   calculateTotalPages,
+  parsePageSize,
+  DEFAULT_PAGE_SIZE,
+  PAGE_SIZE_OPTIONS,
   isValidColumn,
   isValidDirection,
   buildAuthorMap,
   enrichContentWithAuthors,
 } from '~/utils/contentTableLogic'
+import {
+  buildContentFacetIndex,
+  countBits,
+  countFacetValues,
+  getSortOrder,
+  matchFilters,
+  selectRows,
+} from '~/utils/contentFacetIndex'
 
-const PAGE_SIZE = 25
+// Larger pages are rendered through the table's row virtualizer
+const VIRTUALIZE_MIN_PAGE_SIZE = 100
 
 export function useContentTable() {
   // URL-synced params via VueUse
@@ -33,6 +41,7 @@ export function useContentTable() {
   const sortParam = useRouteQuery<string | null>('sort', 'dateConsumed')
   const dirParam = useRouteQuery<string | null>('dir', 'desc')
   const pageParam = useRouteQuery<string | null>('page', '1')
+  const pageSizeParam = useRouteQuery<string | null>('pageSize')
 
   // Validated filters from URL
   const filters = computed<FilterState>(() => {
@@ -63,6 +72,15 @@ export function useContentTable() {
     set: (v) => { pageParam.value = String(v) },
   })
 
+  const pageSize = computed({
+    get: () => parsePageSize(pageSizeParam.value),
+    set: (v) => {
+      const size = parsePageSize(String(v))
+      pageSizeParam.value = size === DEFAULT_PAGE_SIZE ? null : String(size)
+      pageParam.value = '1'
+    },
+  })
+
   // Fetch content and authors
   const { data: rawContent, status: contentStatus } = useAsyncData('table-content', () => {
     return queryCollection('content')
@@ -88,37 +106,41 @@ export function useContentTable() {
     return enrichContentWithAuthors(rawContent.value, authorMap.value)
   })
 
-  // Client-side filtering using extracted pure functions
-  const filteredItems = computed(() => applyAllFilters(allContent.value, filters.value))
+  // Facet index over all items, rebuilt only when the content changes
+  const facetIndex = computed(() => buildContentFacetIndex(allContent.value))
 
-  // Client-side sorting using extracted pure function
-  const sortedItems = computed(() => {
+  // Bitset of rows matching the current filters
+  const matches = computed(() => matchFilters(facetIndex.value, filters.value))
+
+  const sortOrder = computed(() => {
     const { column, direction } = sort.value
-    return sortItems(filteredItems.value, column, direction)
+    return getSortOrder(facetIndex.value, column, direction)
   })
 
-  // Pagination using extracted pure functions
-  const paginatedItems = computed(() => paginateItems(sortedItems.value, page.value, PAGE_SIZE))
+  // Only the visible page is materialized
+  const paginatedItems = computed(() => {
+    const start = (page.value - 1) * pageSize.value
+    return selectRows(facetIndex.value, matches.value, sortOrder.value, start, pageSize.value)
+  })
 
-  const totalPages = computed(() => calculateTotalPages(sortedItems.value.length, PAGE_SIZE))
-  const totalItems = computed(() => sortedItems.value.length)
+  const totalItems = computed(() => countBits(matches.value))
+  const totalPages = computed(() => calculateTotalPages(totalItems.value, pageSize.value))
+  const virtualize = computed(() => pageSize.value >= VIRTUALIZE_MIN_PAGE_SIZE)
 
   // Dynamic filter options (based on current filtered results, excluding self)
   const availableTags = computed(() => {
-    const itemsWithoutTagFilter = applyFiltersExcept(allContent.value, filters.value, 'tags')
-    return [...new Set(itemsWithoutTagFilter.flatMap(i => i.tags ?? []))].sort()
+    return [...countFacetValues(facetIndex.value, filters.value, 'tags').keys()].sort()
   })
 
   const availableAuthors = computed(() => {
-    const itemsWithoutAuthorFilter = applyFiltersExcept(allContent.value, filters.value, 'authors')
-    const authors = itemsWithoutAuthorFilter.flatMap(i => i.authors ?? [])
-    const uniqueBySlug = [...new Map(authors.map(a => [a.slug, a])).values()]
-    return uniqueBySlug.sort((a, b) => a.name.localeCompare(b.name))
+    const slugs = countFacetValues(facetIndex.value, filters.value, 'authors').keys()
+    const authors = [...slugs].flatMap(slug => facetIndex.value.authors.get(slug) ?? [])
+    return authors.sort((a, b) => a.name.localeCompare(b.name))
   })
 
   const availableTypes = computed(() => {
-    const itemsWithoutTypeFilter = applyFiltersExcept(allContent.value, filters.value, 'type')
-    return [...new Set(itemsWithoutTypeFilter.map(i => i.type))].sort()
+    const counts = countFacetValues(facetIndex.value, filters.value, 'type')
+    return [...facetIndex.value.byType.keys()].filter(type => counts.has(type)).sort()
   })
 
   // Filter setters (reset page to 1)
@@ -201,7 +223,9 @@ export function useContentTable() {
 
     // Pagination
     page,
-    pageSize: PAGE_SIZE,
+    pageSize,
+    pageSizeOptions: PAGE_SIZE_OPTIONS,
+    virtualize,
 
     // Actions
     setTypeFilter,
@@ -1,25 +1,44 @@
 import type { FeatureExtractionPipeline } from '@huggingface/transformers'
 import { ref, shallowRef } from 'vue'
-import { z } from 'zod'
 import { tryCatchAsync } from '#shared/utils/tryCatch'
-import { dotProduct } from '~/utils/cosineSimilarity'
-import type { EmbeddingsData, SemanticSearchResult } from '~/types/embeddings'
+import {
+  EmbeddingsJsonSchema,
+  decodeEmbeddingsBinary,
+  embeddingsFromJson,
+  type EmbeddingsMatrix,
+} from '#shared/utils/embeddingsBinary'
+import { createVectorIndex, searchVectors, type VectorIndex } from '#shared/utils/vectorSearch'
+import type { SemanticSearchResult } from '~/types/embeddings'
 
 /**
- * Zod schema for runtime validation of embeddings.json.
- * Ensures the fetched data matches the expected structure.
+ * Fetches the binary embeddings artifact and decodes it straight from the
+ * response ArrayBuffer. Falls back to the legacy embeddings.json when the
+ * binary is missing or does not decode (stale format, truncated download,
+ * an HTML page served in its place).
  */
-const EmbeddingEntrySchema = z.object({
-  vector: z.array(z.number()),
-  title: z.string(),
-  type: z.string(),
-})
-
-const EmbeddingsDataSchema = z.object({
-  version: z.string(),
-  model: z.string(),
-  embeddings: z.record(z.string(), EmbeddingEntrySchema),
-})
+async function fetchEmbeddings(): Promise<EmbeddingsMatrix> {
+  const [binaryError, binary] = await tryCatchAsync(fetchEmbeddingsBinary)
+  if (!binaryError) {
+    return binary
+  }
+
+  const res = await fetch('/embeddings.json')
+  if (!res.ok) {
+    throw new Error(`Failed to load embeddings: ${res.status}`)
+  }
+  const data: unknown = await res.json()
+
+  // Validate the structure at runtime
+  return embeddingsFromJson(EmbeddingsJsonSchema.parse(data))
+}
+
+async function fetchEmbeddingsBinary(): Promise<EmbeddingsMatrix> {
+  const res = await fetch('/embeddings.bin')
+  if (!res.ok) {
+    throw new Error(`Failed to load embeddings.bin: ${res.status}`)
+  }
+  return decodeEmbeddingsBinary(await res.arrayBuffer())
+}
 
 /**
  * Module-level cache for embeddings and model.
@@ -27,7 +46,7 @@ const EmbeddingsDataSchema = z.object({
  * the embeddings file and ML model on every component mount.
  * The cache persists for the lifetime of the page session.
  */
-let embeddingsCache: EmbeddingsData | null = null
+let embeddingsCache: VectorIndex | null = null
 let modelCache: FeatureExtractionPipeline | null = null
 let modelLoadingPromise: Promise<FeatureExtractionPipeline | null> | null = null
 
@@ -45,29 +64,19 @@ export function useSemanticSearch() {
   const isLoading = ref(false)
   const error = shallowRef<Error | null>(null)
 
-  async function loadEmbeddings(): Promise<EmbeddingsData | null> {
+  async function loadEmbeddings(): Promise<VectorIndex | null> {
     if (embeddingsCache) {
       return embeddingsCache
     }
 
-    const [fetchError, response] = await tryCatchAsync(async () => {
-      const res = await fetch('/embeddings.json')
-      if (!res.ok) {
-        throw new Error(`Failed to load embeddings: ${res.status}`)
-      }
-      const data: unknown = await res.json()
-
-      // Validate the structure at runtime
-      const parsed = EmbeddingsDataSchema.parse(data)
-      return parsed
-    })
+    const [fetchError, response] = await tryCatchAsync(fetchEmbeddings)
 
     if (fetchError) {
       error.value = fetchError
       return null
     }
 
-    embeddingsCache = response
+    embeddingsCache = createVectorIndex(response)
     return embeddingsCache
   }
 
@@ -101,7 +110,7 @@ export function useSemanticSearch() {
     return modelLoadingPromise
   }
 
-  async function search(query: string, topN: number = 20): Promise<SemanticSearchResult[]> {
+  async function search(query: string, topN: number = 20, type?: string): Promise<SemanticSearchResult[]> {
     if (!query.trim()) {
       return []
     }
@@ -124,23 +133,17 @@ export function useSemanticSearch() {
       const output = await model(query, { pooling: 'mean', normalize: true })
       const queryVector = Array.from(output.data)
 
-      // Compute similarity against all embeddings
-      // Using dotProduct since both query and stored embeddings are normalized
-      const searchResults: SemanticSearchResult[] = []
-
-      for (const [slug, entry] of Object.entries(embeddings.embeddings)) {
-        const score = dotProduct(queryVector, entry.vector)
-        searchResults.push({
-          slug,
-          title: entry.title,
-          type: entry.type,
+      // Top-K dot product (cosine, both sides normalized) within the type's rows
+      const hits = searchVectors(embeddings, queryVector, { topK: topN, type })
+      return hits.map(({ row, score }): SemanticSearchResult => {
+        const entry = embeddings.matrix.manifest.entries[row]
+        return {
+          slug: entry?.slug ?? '',
+          title: entry?.title ?? '',
+          type: entry?.type ?? 'note',
           score,
-        })
-      }
-
-      // Sort by similarity score descending and return top N
-      searchResults.sort((a, b) => b.score - a.score)
-      return searchResults.slice(0, topN)
+        }
+      })
     })
 
     isLoading.value = false
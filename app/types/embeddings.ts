@@ -1,22 +1,8 @@
 /**
- * Shared type definitions for semantic search and embeddings.
+ * Shared type definitions for semantic search.
+ * The embeddings artifact format lives in shared/utils/embeddingsBinary.ts.
  */
 
-export interface EmbeddingEntry {
-  vector: number[]
-  title: string
-  type: string
-  hash?: string // Content hash for incremental generation
-}
-
-export interface EmbeddingsData {
-  version: string
-  model: string
-  generatedAt?: string
-  textMaxLength?: number
-  embeddings: Record<string, EmbeddingEntry>
-}
-
 export interface SemanticSearchResult {
   slug: string
   title: string
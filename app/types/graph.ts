@@ -81,6 +81,9 @@ export interface FullGraphNode {
   connections?: number
   maps?: string[]
   isMap?: boolean
+  // Settled position, centered on the origin (prerendered /api/graph only)
+  x?: number
+  y?: number
 }
 
 /**
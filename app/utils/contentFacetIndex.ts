@@ -0,0 +1,251 @@
+/**
+ * Faceted bitmap index for the content table.
+ *
+ * Built once per content load. Each type, tag and author maps to a bitset
+ * over item positions; filters become word-wise OR/AND over those bitsets
+ * and facet options come from intersections instead of re-filtering the
+ * item array. Sort orders are cached permutations per column/direction,
+ * so a page is read by walking the permutation and keeping matching rows
+ * until it is full.
+ *
+ * Filter and sort semantics are the same as applyAllFilters,
+ * applyFiltersExcept and sortItems in contentTableLogic.
+ */
+
+import type { ContentType } from '~/constants/contentTypes'
+import type { FilterState, SortState, TableAuthor, TableContentItem } from '~/types/table'
+import { compareValues, getSortValue } from '~/utils/contentTableLogic'
+
+// One bit per item, 32 items per word
+export type Bitset = Uint32Array
+
+export type FacetKey = 'type' | 'tags' | 'authors'
+
+export interface ContentFacetIndex {
+  items: TableContentItem[]
+  byType: Map<ContentType, Bitset>
+  byTag: Map<string, Bitset>
+  byAuthor: Map<string, Bitset>
+  // First author object seen per slug, for the author menu
+  authors: Map<string, TableAuthor>
+  // Parsed date/rating per item, NaN when missing
+  dateTimes: Float64Array
+  ratings: Float64Array
+  // Lazily built, keyed by `${column}:${direction}`
+  sortOrders: Map<string, Uint32Array>
+}
+
+/**
+ * Create an empty bitset, or one with the first `size` bits set.
+ */
+export function createBitset(size: number, fill = false): Bitset {
+  const bits = new Uint32Array(Math.ceil(size / 32))
+  if (!fill) return bits
+  bits.fill(0xFFFFFFFF)
+  const tail = size % 32
+  if (tail) bits[bits.length - 1] = (2 ** tail) - 1
+  return bits
+}
+
+function wordAt(bits: Bitset, index: number): number {
+  return bits[index] ?? 0
+}
+
+export function setBit(bits: Bitset, index: number): void {
+  const w = index >>> 5
+  bits[w] = wordAt(bits, w) | (1 << (index & 31))
+}
+
+export function hasBit(bits: Bitset, index: number): boolean {
+  return (wordAt(bits, index >>> 5) & (1 << (index & 31))) !== 0
+}
+
+// SWAR popcount of a 32-bit word
+function popcount(word: number): number {
+  let x = word - ((word >>> 1) & 0x55555555)
+  x = (x & 0x33333333) + ((x >>> 2) & 0x33333333)
+  x = (x + (x >>> 4)) & 0x0F0F0F0F
+  return Math.imul(x, 0x01010101) >>> 24
+}
+
+export function countBits(bits: Bitset): number {
+  let count = 0
+  for (const word of bits) count += popcount(word)
+  return count
+}
+
+/**
+ * Count the bits set in both `a` and `b` without allocating.
+ */
+export function countIntersection(a: Bitset, b: Bitset): number {
+  let count = 0
+  for (let w = 0; w < a.length; w++) count += popcount(wordAt(a, w) & wordAt(b, w))
+  return count
+}
+
+function orInto(target: Bitset, source: Bitset): void {
+  for (let w = 0; w < target.length; w++) target[w] = wordAt(target, w) | wordAt(source, w)
+}
+
+function andInto(target: Bitset, source: Bitset): void {
+  for (let w = 0; w < target.length; w++) target[w] = wordAt(target, w) & wordAt(source, w)
+}
+
+function addToFacet<K>(facet: Map<K, Bitset>, key: K, index: number, size: number): void {
+  let bits = facet.get(key)
+  if (!bits) {
+    bits = createBitset(size)
+    facet.set(key, bits)
+  }
+  setBit(bits, index)
+}
+
+function toTime(date: string | undefined): number {
+  if (!date) return Number.NaN
+  return new Date(date).getTime()
+}
+
+/**
+ * Build the index from enriched table items.
+ */
+export function buildContentFacetIndex(items: TableContentItem[]): ContentFacetIndex {
+  const size = items.length
+  const index: ContentFacetIndex = {
+    items,
+    byType: new Map(),
+    byTag: new Map(),
+    byAuthor: new Map(),
+    authors: new Map(),
+    dateTimes: new Float64Array(size),
+    ratings: new Float64Array(size),
+    sortOrders: new Map(),
+  }
+
+  items.forEach((item, i) => {
+    addToFacet(index.byType, item.type, i, size)
+    for (const tag of item.tags) addToFacet(index.byTag, tag, i, size)
+    for (const author of item.authors) {
+      addToFacet(index.byAuthor, author.slug, i, size)
+      if (!index.authors.has(author.slug)) index.authors.set(author.slug, author)
+    }
+    index.dateTimes[i] = toTime(item.date)
+    index.ratings[i] = item.rating ?? Number.NaN
+  })
+
+  return index
+}
+
+function facetBitsets(index: ContentFacetIndex, facet: FacetKey): Map<string, Bitset> {
+  if (facet === 'type') return index.byType
+  if (facet === 'tags') return index.byTag
+  return index.byAuthor
+}
+
+function facetSelection(filters: FilterState, facet: FacetKey): string[] | undefined {
+  if (facet === 'type') return filters.type
+  if (facet === 'tags') return filters.tags
+  return filters.authors
+}
+
+const FACETS: readonly FacetKey[] = ['type', 'tags', 'authors']
+
+/**
+ * Rows matching the type/tag/author filters (OR within a facet, AND across
+ * facets), optionally ignoring one facet. Mirrors applyFiltersExcept.
+ */
+export function matchFacets(index: ContentFacetIndex, filters: FilterState, exclude?: FacetKey): Bitset {
+  const result = createBitset(index.items.length, true)
+  for (const facet of FACETS) {
+    const selected = facetSelection(filters, facet)
+    if (facet === exclude || !selected?.length) continue
+
+    const bitsets = facetBitsets(index, facet)
+    const union = createBitset(index.items.length)
+    for (const value of selected) {
+      const bits = bitsets.get(value)
+      if (bits) orInto(union, bits)
+    }
+    andInto(result, union)
+  }
+  return result
+}
+
+function clearOutsideRange(bits: Bitset, values: Float64Array, min: number, max: number): void {
+  values.forEach((value, i) => {
+    // NaN (missing) fails both comparisons
+    if (!(value >= min && value <= max)) bits[i >>> 5] = wordAt(bits, i >>> 5) & ~(1 << (i & 31))
+  })
+}
+
+/**
+ * Rows matching every filter. Mirrors applyAllFilters.
+ */
+export function matchFilters(index: ContentFacetIndex, filters: FilterState): Bitset {
+  const result = matchFacets(index, filters)
+  const dateRange = filters.dateConsumedRange
+  if (dateRange) clearOutsideRange(result, index.dateTimes, toTime(dateRange[0]), toTime(dateRange[1]))
+  const ratingRange = filters.ratingRange
+  if (ratingRange) clearOutsideRange(result, index.ratings, ratingRange[0], ratingRange[1])
+  return result
+}
+
+/**
+ * Values of a facet that still have rows once the other facets are
+ * applied, with their row counts.
+ */
+export function countFacetValues(index: ContentFacetIndex, filters: FilterState, facet: FacetKey): Map<string, number> {
+  const base = matchFacets(index, filters, facet)
+  const counts = new Map<string, number>()
+  for (const [value, bits] of facetBitsets(index, facet)) {
+    const count = countIntersection(bits, base)
+    if (count > 0) counts.set(value, count)
+  }
+  return counts
+}
+
+/**
+ * Item positions sorted by column, computed once per column/direction.
+ * Uses the same stable comparison as sortItems.
+ */
+export function getSortOrder(
+  index: ContentFacetIndex,
+  column: SortState['column'],
+  direction: SortState['direction'],
+): Uint32Array {
+  const key = `${column}:${direction}`
+  const cached = index.sortOrders.get(key)
+  if (cached) return cached
+
+  const values = index.items.map(item => getSortValue(item, column))
+  const positions = index.items.map((_, i) => i)
+  positions.sort((a, b) => {
+    const cmp = compareValues(values[a], values[b])
+    return direction === 'asc' ? cmp : -cmp
+  })
+  const order = Uint32Array.from(positions)
+  index.sortOrders.set(key, order)
+  return order
+}
+
+/**
+ * Materialize `count` matching rows in sort order, skipping the first
+ * `start` matches. Only the visible page is ever built.
+ */
+export function selectRows(
+  index: ContentFacetIndex,
+  matches: Bitset,
+  order: Uint32Array,
+  start: number,
+  count: number,
+): TableContentItem[] {
+  const rows: TableContentItem[] = []
+  let seen = 0
+  for (const position of order) {
+    if (rows.length >= count) break
+    if (!hasBit(matches, position)) continue
+    const item = index.items[position]
+    if (item && seen >= start) rows.push(item)
+    seen++
+  }
+  return rows
+}
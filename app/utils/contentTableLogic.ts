@@ -268,6 +268,17 @@ export function calculateTotalPages(totalItems: number, pageSize: number): numbe
   return Math.ceil(totalItems / pageSize)
 }
 
+export const PAGE_SIZE_OPTIONS: readonly number[] = [25, 100, 500]
+export const DEFAULT_PAGE_SIZE = 25
+
+/**
+ * Parse page size param, falling back to the default for unknown sizes.
+ */
+export function parsePageSize(value: string | null): number {
+  const size = Number(value)
+  return PAGE_SIZE_OPTIONS.includes(size) ? size : DEFAULT_PAGE_SIZE
+}
+
 const validColumns: readonly string[] = ['title', 'type', 'dateConsumed', 'rating']
 
 /**
@@ -0,0 +1,190 @@
+import type { ForceEdge, ForceNode } from '#shared/utils/graphForces'
+import { tryCatch } from '#shared/utils/tryCatch'
+import {
+  applyPositions,
+  createLayoutSimulation,
+  toForceNode,
+  toLayoutEdge,
+  type LayoutOptions,
+  type LayoutWorkerRequest,
+  type LayoutWorkerResponse,
+} from '#shared/utils/graphLayout'
+
+// Smaller graphs settle fast enough on the main thread
+export const WORKER_LAYOUT_MIN_NODES = 300
+
+/**
+ * What BaseGraph needs from a running layout, wherever it runs.
+ */
+export interface GraphLayoutHandle {
+  // Like simulation.alpha(alpha).restart()
+  reheat: (alpha: number) => void
+  // Like simulation.alphaTarget(target).restart()
+  setAlphaTarget: (target: number) => void
+  // Pin a node (drag)
+  fix: (node: ForceNode, x: number, y: number) => void
+  release: (node: ForceNode) => void
+  stop: () => void
+  dispose: () => void
+}
+
+export interface LayoutCallbacks {
+  // Node positions changed
+  onTick: () => void
+  // The layout cooled down
+  onEnd: () => void
+}
+
+export interface LayoutWorkerLike {
+  postMessage: (request: LayoutWorkerRequest) => void
+  terminate: () => void
+  onmessage: ((event: MessageEvent<LayoutWorkerResponse>) => void) | null
+  onerror: ((event: ErrorEvent) => void) | null
+  onmessageerror: ((event: MessageEvent) => void) | null
+}
+
+type LayoutEdgeInput<N extends ForceNode> = ForceEdge<N> & { source: string | N, target: string | N, level?: 1 | 2 }
+
+/**
+ * Run the simulation on the main thread with d3's own timer.
+ */
+export function createInlineLayout<N extends ForceNode, E extends LayoutEdgeInput<N>>(
+  nodes: N[],
+  edges: E[],
+  options: LayoutOptions,
+  alpha: number,
+  callbacks: LayoutCallbacks,
+): GraphLayoutHandle {
+  const simulation = createLayoutSimulation(nodes, edges, options)
+    .alpha(alpha)
+    .on('tick', callbacks.onTick)
+    .on('end', callbacks.onEnd)
+
+  return {
+    reheat: (value) => {
+      simulation.alpha(value).restart()
+    },
+    setAlphaTarget: (target) => {
+      simulation.alphaTarget(target).restart()
+    },
+    fix: (node, x, y) => {
+      node.fx = x
+      node.fy = y
+    },
+    release: (node) => {
+      node.fx = null
+      node.fy = null
+    },
+    stop: () => {
+      simulation.stop()
+    },
+    dispose: () => {
+      simulation.stop()
+    },
+  }
+}
+
+/**
+ * Point edge endpoints at the node objects, as d3's link force does
+ * for the inline layout.
+ */
+export function resolveEdgeEndpoints<N extends ForceNode>(
+  nodes: N[],
+  edges: Array<{ source: string | N, target: string | N }>,
+): void {
+  const byId = new Map(nodes.map(node => [node.id, node]))
+  for (const edge of edges) {
+    edge.source = typeof edge.source === 'string' ? byId.get(edge.source) ?? edge.source : edge.source
+    edge.target = typeof edge.target === 'string' ? byId.get(edge.target) ?? edge.target : edge.target
+  }
+}
+
+/**
+ * Run the simulation in a worker. The component keeps its own node objects
+ * and receives positions for them in batches. If the worker fails to load
+ * or throws mid-simulation, the layout continues on the main thread from
+ * the last positions received.
+ */
+export function createWorkerLayout<N extends ForceNode, E extends LayoutEdgeInput<N>>(
+  worker: LayoutWorkerLike,
+  nodes: N[],
+  edges: E[],
+  options: LayoutOptions,
+  alpha: number,
+  callbacks: LayoutCallbacks,
+): GraphLayoutHandle {
+  nodes.forEach((node, index) => {
+    node.index = index
+  })
+
+  worker.onmessage = (event) => {
+    applyPositions(nodes, event.data.positions)
+    callbacks.onTick()
+    if (event.data.type === 'end') callbacks.onEnd()
+  }
+
+  worker.postMessage({
+    type: 'start',
+    nodes: nodes.map(toForceNode),
+    edges: edges.map(toLayoutEdge),
+    options: { ...options, radii: Float32Array.from(options.radii) },
+    alpha,
+  })
+  resolveEdgeEndpoints(nodes, edges)
+
+  const workerHandle: GraphLayoutHandle = {
+    reheat: value => worker.postMessage({ type: 'reheat', alpha: value }),
+    setAlphaTarget: target => worker.postMessage({ type: 'target', alphaTarget: target }),
+    fix: (node, x, y) => {
+      // Move the local copy right away; the worker confirms on its next batch
+      node.x = x
+      node.y = y
+      worker.postMessage({ type: 'fix', index: node.index ?? 0, x, y })
+    },
+    release: node => worker.postMessage({ type: 'release', index: node.index ?? 0 }),
+    stop: () => worker.postMessage({ type: 'stop' }),
+    dispose: () => worker.terminate(),
+  }
+  let active = workerHandle
+
+  const fallBackToInline = () => {
+    if (active !== workerHandle) return
+    worker.terminate()
+    active = createInlineLayout(nodes, edges, options, alpha, callbacks)
+  }
+  worker.onerror = fallBackToInline
+  worker.onmessageerror = fallBackToInline
+
+  return {
+    reheat: value => active.reheat(value),
+    setAlphaTarget: target => active.setAlphaTarget(target),
+    fix: (node, x, y) => active.fix(node, x, y),
+    release: node => active.release(node),
+    stop: () => active.stop(),
+    dispose: () => active.dispose(),
+  }
+}
+
+/**
+ * Start a layout, off the main thread when the graph is large and a worker
+ * is available.
+ */
+export function startGraphLayout<N extends ForceNode, E extends LayoutEdgeInput<N>>(
+  nodes: N[],
+  edges: E[],
+  options: LayoutOptions,
+  alpha: number,
+  callbacks: LayoutCallbacks,
+  createWorker?: () => LayoutWorkerLike,
+): GraphLayoutHandle {
+  if (!createWorker || nodes.length < WORKER_LAYOUT_MIN_NODES) {
+    return createInlineLayout(nodes, edges, options, alpha, callbacks)
+  }
+
+  // Workers can be unavailable (CSP, unsupported module workers)
+  const [workerError, worker] = tryCatch(createWorker)
+  if (workerError) {
+    return createInlineLayout(nodes, edges, options, alpha, callbacks)
+  }
+  return createWorkerLayout(worker, nodes, edges, options, alpha, callbacks)
+}
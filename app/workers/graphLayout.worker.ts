@@ -0,0 +1,85 @@
+/**
+ * Graph layout worker
+ *
+ * Runs the d3-force simulation off the main thread. The simulation is
+ * stepped in short time slices; after each slice the positions are posted
+ * back as a transferred Float32Array, and the worker yields so drag and
+ * reheat messages are handled between slices.
+ */
+
+import type { Simulation } from 'd3-force'
+import type { ForceNode } from '#shared/utils/graphForces'
+import {
+  createLayoutSimulation,
+  packPositions,
+  stepSimulation,
+  type LayoutEdge,
+  type LayoutWorkerRequest,
+  type LayoutWorkerResponse,
+} from '#shared/utils/graphLayout'
+
+// Leaves room for the main thread to render a frame per batch
+const SLICE_BUDGET_MS = 12
+
+let simulation: Simulation<ForceNode, LayoutEdge> | null = null
+let timer: ReturnType<typeof setTimeout> | null = null
+
+function post(response: LayoutWorkerResponse): void {
+  self.postMessage(response, { transfer: [response.positions.buffer] })
+}
+
+function runSlice(): void {
+  timer = null
+  if (!simulation) return
+
+  const active = stepSimulation(simulation, SLICE_BUDGET_MS)
+  post({ type: active ? 'tick' : 'end', positions: packPositions(simulation.nodes()) })
+  if (active) timer = setTimeout(runSlice, 0)
+}
+
+function ensureRunning(): void {
+  if (timer === null) timer = setTimeout(runSlice, 0)
+}
+
+function pause(): void {
+  if (timer !== null) clearTimeout(timer)
+  timer = null
+}
+
+function setFixed(index: number, x: number | null, y: number | null): void {
+  const node = simulation?.nodes()[index]
+  if (!node) return
+  node.fx = x
+  node.fy = y
+  ensureRunning()
+}
+
+function handleRequest(request: LayoutWorkerRequest): void {
+  switch (request.type) {
+    case 'start':
+      pause()
+      simulation = createLayoutSimulation(request.nodes, request.edges, request.options).stop().alpha(request.alpha)
+      ensureRunning()
+      return
+    case 'reheat':
+      simulation?.alpha(request.alpha)
+      ensureRunning()
+      return
+    case 'target':
+      simulation?.alphaTarget(request.alphaTarget)
+      ensureRunning()
+      return
+    case 'fix':
+      setFixed(request.index, request.x, request.y)
+      return
+    case 'release':
+      setFixed(request.index, null, null)
+      return
+    case 'stop':
+      pause()
+  }
+}
+
+self.onmessage = (event: MessageEvent<LayoutWorkerRequest>) => {
+  handleRequest(event.data)
+}
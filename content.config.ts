@@ -58,6 +58,8 @@ export default defineContentConfig({
         tags: z.array(z.string()).default([]),
         authors: z.array(z.string()).default([]),
         summary: z.string().optional(),
+        // Alternative names, matched as unlinked mentions like the title
+        aliases: z.array(z.string()).optional(),
         notes: z.string().optional(),
         date: z.string().optional(),
         // Manga-specific fields
@@ -70,6 +70,10 @@ export default defineNuxtConfig({
 
   runtimeConfig: {
     anthropicApiKey: '', // Set via NUXT_ANTHROPIC_API_KEY
+    tracing: {
+      enabled: false, // Set via NUXT_TRACING_ENABLED
+      histogram: false, // Set via NUXT_TRACING_HISTOGRAM
+    },
     public: {
       siteUrl: siteConfig.url,
     },
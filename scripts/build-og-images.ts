@@ -4,13 +4,31 @@
  *
  * Generates OG images at build time using Satori, similar to Astro Paper's approach.
  * Images are saved to public/og/[slug].png and served statically.
+ *
+ * Pipeline:
+ * 1. Fonts are fetched once on the main thread and handed to every worker
+ * 2. Frontmatter is hashed (title, summary, type, template version) and
+ *    compared with public/og/manifest.json, so unchanged cards are skipped
+ *    even on a fresh checkout (as long as public/og is restored)
+ * 3. Stale cards are rendered by a worker_threads pool, one card per worker
+ *    at a time, across all cores
+ *
+ * Flags:
+ * - --concurrency <n>   number of render workers (default: available cores)
+ * - --force             ignore the manifest and re-render every card
  */
 
-import { readdir, readFile, writeFile, mkdir, stat } from 'node:fs/promises'
+import { readdir, readFile, writeFile, mkdir, access } from 'node:fs/promises'
 import { join, basename } from 'node:path'
+import { createHash } from 'node:crypto'
+import { availableParallelism } from 'node:os'
+import { performance } from 'node:perf_hooks'
+import { Worker, isMainThread, parentPort, workerData } from 'node:worker_threads'
 import satori from 'satori'
 import { Resvg } from '@resvg/resvg-js'
 import * as lucideIcons from 'lucide-static'
+import { z } from 'zod'
+import { tryCatch, tryCatchAsync } from '../shared/utils/tryCatch'
 
 // Map content types to Lucide icon names (matches BaseTypeIcon.vue)
 const TYPE_TO_LUCIDE: Record<string, keyof typeof lucideIcons> = {
@@ -35,6 +53,16 @@ const TYPE_TO_LUCIDE: Record<string, keyof typeof lucideIcons> = {
 
 const CONTENT_DIR = join(process.cwd(), 'content')
 const OUTPUT_DIR = join(process.cwd(), 'public', 'og')
+const MANIFEST_PATH = join(OUTPUT_DIR, 'manifest.json')
+
+// Bump whenever createOgImageMarkup (or the icons/fonts) change, so every card is re-rendered
+const OG_TEMPLATE_VERSION = 1
+
+const FORCE = process.argv.includes('--force')
+const CONCURRENCY_INDEX = process.argv.indexOf('--concurrency')
+const CONCURRENCY = CONCURRENCY_INDEX === -1
+  ? availableParallelism()
+  : Math.max(1, Number(process.argv[CONCURRENCY_INDEX + 1]) || 1)
 
 // Excluded directories that don't need OG images
 const EXCLUDED_DIRS = [
@@ -51,15 +79,16 @@ const EXCLUDED_DIRS = [
   '_obsidian-templates',
 ]
 
-// Cache font data
-let fontRegular: ArrayBuffer | null = null
-let fontMedium: ArrayBuffer | null = null
-
-async function loadFonts(): Promise<{ regular: ArrayBuffer, medium: ArrayBuffer }> {
-  if (fontRegular && fontMedium) {
-    return { regular: fontRegular, medium: fontMedium }
-  }
+interface Fonts {
+  regular: ArrayBuffer
+  medium: ArrayBuffer
+}
 
+/**
+ * Fetch the Geist fonts. Called once on the main thread; workers receive the
+ * buffers through workerData instead of fetching them again.
+ */
+async function loadFonts(): Promise<Fonts> {
   console.log('  Loading Geist fonts...')
 
   const [regular, medium] = await Promise.all([
@@ -67,9 +96,6 @@ async function loadFonts(): Promise<{ regular: ArrayBuffer, medium: ArrayBuffer
     fetch('https://cdn.jsdelivr.net/npm/@fontsource/geist-sans@5/files/geist-sans-latin-500-normal.woff').then(r => r.arrayBuffer()),
   ])
 
-  fontRegular = regular
-  fontMedium = medium
-
   return { regular, medium }
 }
 
@@ -197,6 +223,21 @@ function parseSvgChildren(svgString: string): SatoriElement[] {
   ]
 }
 
+// Parsed icon children per Lucide icon (each worker parses an icon at most once)
+const iconChildrenCache = new Map<string, SatoriElement[]>()
+
+function getIconChildren(iconKey: keyof typeof lucideIcons): SatoriElement[] | null {
+  const cached = iconChildrenCache.get(iconKey)
+  if (cached) return cached
+
+  const svgString = lucideIcons[iconKey]
+  if (!svgString) return null
+
+  const children = parseSvgChildren(svgString)
+  iconChildrenCache.set(iconKey, children)
+  return children
+}
+
 /**
  * Create an SVG icon element for Satori from content type
  */
@@ -204,10 +245,8 @@ function createIconElement(type: string, size = 20): SatoriElement | null {
   const iconKey = TYPE_TO_LUCIDE[type]
   if (!iconKey) return null
 
-  const svgString = lucideIcons[iconKey]
-  if (!svgString) return null
-
-  const children = parseSvgChildren(svgString)
+  const children = getIconChildren(iconKey)
+  if (!children) return null
 
   return {
     type: 'svg',
@@ -425,29 +464,148 @@ function parseFrontmatter(content: string): Frontmatter {
   return frontmatter
 }
 
-async function generateOgImage(
-  title: string,
-  description: string,
-  type: string,
-  fonts: { regular: ArrayBuffer, medium: ArrayBuffer },
-): Promise<Buffer> {
-  const markup = createOgImageMarkup(title, description, type)
-
-  const svg = await satori(markup, {
-    width: 1200,
-    height: 630,
-    fonts: [
-      { name: 'Geist', data: fonts.regular, weight: 400, style: 'normal' },
-      { name: 'Geist', data: fonts.medium, weight: 500, style: 'normal' },
-    ],
+interface RenderTask {
+  slug: string
+  title: string
+  summary: string
+  type: string
+  outputPath: string
+}
+
+interface RenderResult {
+  slug: string
+  error: string | null
+  satoriMs: number
+  resvgMs: number
+  writeMs: number
+}
+
+interface WorkerInit {
+  fonts: Fonts
+}
+
+/**
+ * Render one card to disk, timing the satori, resvg and write phases.
+ * Runs inside a worker.
+ */
+async function renderCard(task: RenderTask, fonts: Fonts): Promise<RenderResult> {
+  const timings = { satoriMs: 0, resvgMs: 0, writeMs: 0 }
+
+  const [error] = await tryCatchAsync(async () => {
+    let start = performance.now()
+    const svg = await satori(createOgImageMarkup(task.title, task.summary, task.type), {
+      width: 1200,
+      height: 630,
+      fonts: [
+        { name: 'Geist', data: fonts.regular, weight: 400, style: 'normal' },
+        { name: 'Geist', data: fonts.medium, weight: 500, style: 'normal' },
+      ],
+    })
+    timings.satoriMs = performance.now() - start
+
+    start = performance.now()
+    const resvg = new Resvg(svg, {
+      fitTo: { mode: 'width', value: 1200 },
+    })
+    const png = resvg.render().asPng()
+    timings.resvgMs = performance.now() - start
+
+    start = performance.now()
+    await writeFile(task.outputPath, png)
+    timings.writeMs = performance.now() - start
   })
 
-  const resvg = new Resvg(svg, {
-    fitTo: { mode: 'width', value: 1200 },
+  return { slug: task.slug, error: error ? String(error) : null, ...timings }
+}
+
+/**
+ * Worker entry: render tasks posted by the main thread, one at a time
+ */
+function runWorker(): void {
+  const port = parentPort
+  if (!port) return
+
+  const { fonts }: WorkerInit = workerData
+  port.on('message', (task: RenderTask) => {
+    void renderCard(task, fonts).then(result => port.postMessage(result))
   })
+}
+
+/**
+ * Render tasks on a pool of workers (this file, re-entered off the main
+ * thread). Each worker gets the next task as soon as it reports a result.
+ * A worker that dies mid-task is replaced and its card reported as failed.
+ * tsx's loader is inherited through the default execArgv.
+ */
+function renderWithPool(
+  tasks: RenderTask[],
+  fonts: Fonts,
+  onResult: (result: RenderResult) => void,
+): Promise<number> {
+  const size = Math.min(CONCURRENCY, tasks.length)
+  if (size === 0) return Promise.resolve(0)
+
+  const init: WorkerInit = { fonts }
+  // Live workers; retired ones are removed before they are terminated
+  const workers = new Set<Worker>()
+  // Task each worker is rendering, so a crashed worker's card can be reported
+  const inFlight = new Map<Worker, RenderTask>()
+  let next = 0
+  let failed = false
+
+  return new Promise((resolve, reject) => {
+    const retire = (worker: Worker): void => {
+      workers.delete(worker)
+      void worker.terminate()
+      if (workers.size === 0) resolve(size)
+    }
+
+    const dispatch = (worker: Worker): void => {
+      const task = tasks[next++]
+      if (!task) {
+        retire(worker)
+        return
+      }
+      inFlight.set(worker, task)
+      worker.postMessage(task)
+    }
+
+    // A worker can exit without an 'error' event (OOM kill, process.exit in
+    // native code): fail its card and replace it while tasks remain
+    const replace = (worker: Worker, code: number): void => {
+      if (failed || !workers.has(worker)) return
+      workers.delete(worker)
+
+      const task = inFlight.get(worker)
+      if (task) {
+        onResult({ slug: task.slug, error: `Worker exited with code ${code}`, satoriMs: 0, resvgMs: 0, writeMs: 0 })
+      }
+      if (next < tasks.length) {
+        spawn()
+        return
+      }
+      if (workers.size === 0) resolve(size)
+    }
+
+    const spawn = (): void => {
+      const worker = new Worker(new URL(import.meta.url), { workerData: init })
+      workers.add(worker)
+      worker.on('message', (result: RenderResult) => {
+        inFlight.delete(worker)
+        onResult(result)
+        dispatch(worker)
+      })
+      worker.on('error', (error) => {
+        failed = true
+        for (const other of workers) void other.terminate()
+        reject(error)
+      })
+      worker.on('exit', code => replace(worker, code))
+      dispatch(worker)
+    }
 
-  const pngData = resvg.render()
-  return pngData.asPng()
+    for (let i = 0; i < size; i++) spawn()
+  })
 }
 
 async function findMarkdownFiles(dir: string, files: string[] = []): Promise<string[]> {
@@ -479,74 +637,178 @@ function getSlugFromPath(filePath: string): string {
   return basename(relativePath, '.md')
 }
 
-async function main() {
-  console.log('Generating OG images...')
+const manifestSchema = z.object({
+  entries: z.record(z.string(), z.string()),
+})
 
-  // Ensure output directory exists
-  await mkdir(OUTPUT_DIR, { recursive: true })
+type ManifestEntries = Record<string, string>
 
-  // Load fonts once
-  const fonts = await loadFonts()
+async function readManifest(): Promise<ManifestEntries> {
+  if (FORCE) return {}
 
-  // Find all markdown files
-  const files = await findMarkdownFiles(CONTENT_DIR)
-  console.log(`Found ${files.length} content file(s)`)
+  const [readError, raw] = await tryCatchAsync(() => readFile(MANIFEST_PATH, 'utf-8'))
+  if (readError) return {}
 
-  let generated = 0
-  let skipped = 0
-  let errors = 0
-
-  for (const filePath of files) {
-    const slug = getSlugFromPath(filePath)
-    const outputPath = join(OUTPUT_DIR, `${slug}.png`)
-
-    // Check if OG image already exists and is newer than source
-    const stats = await Promise.all([
-      stat(filePath),
-      stat(outputPath).catch(() => null),
-    ])
-    const [sourceStat, outputStat] = stats
-    if (outputStat && outputStat.mtime > sourceStat.mtime) {
-      skipped++
-      continue
-    }
+  const [parseError, json] = tryCatch(() => JSON.parse(raw))
+  if (parseError) return {}
 
-    const content = await readFile(filePath, 'utf-8').catch((error) => {
-      console.error(`  Error reading ${slug}:`, error)
-      errors++
-      return null
-    })
-    if (!content) continue
+  const parsed = manifestSchema.safeParse(json)
+  return parsed.success ? parsed.data.entries : {}
+}
 
-    const frontmatter = parseFrontmatter(content)
+/**
+ * Hash of everything that ends up on the card
+ */
+function hashCard(title: string, summary: string, type: string): string {
+  return createHash('sha256')
+    .update(JSON.stringify([OG_TEMPLATE_VERSION, title, summary, type]))
+    .digest('hex')
+    .slice(0, 16)
+}
 
-    if (!frontmatter.title) {
-      console.log(`  Skipping ${slug}: no title`)
-      skipped++
-      continue
-    }
+async function fileExists(path: string): Promise<boolean> {
+  const [error] = await tryCatchAsync(() => access(path))
+  return !error
+}
 
-    const png = await generateOgImage(
-      frontmatter.title,
-      frontmatter.summary || '',
-      frontmatter.type || 'note',
-      fonts,
-    ).catch((error) => {
-      console.error(`  Error generating OG image for ${slug}:`, error)
-      errors++
-      return null
-    })
-    if (!png) continue
+interface PlannedCard {
+  task: RenderTask
+  hash: string
+  fresh: boolean
+}
+
+type PlanOutcome = PlannedCard | { skipReason: string } | { readError: Error }
+
+async function planCard(filePath: string, manifest: ManifestEntries): Promise<PlanOutcome> {
+  const slug = getSlugFromPath(filePath)
+
+  const [readError, content] = await tryCatchAsync(() => readFile(filePath, 'utf-8'))
+  if (readError) return { readError }
 
-    await writeFile(outputPath, png)
-    generated++
+  const frontmatter = parseFrontmatter(content)
+  if (!frontmatter.title) return { skipReason: `Skipping ${slug}: no title` }
 
-    if (generated % 50 === 0) {
-      console.log(`  Generated ${generated} images...`)
+  const summary = frontmatter.summary || ''
+  const type = frontmatter.type || 'note'
+  const hash = hashCard(frontmatter.title, summary, type)
+  const outputPath = join(OUTPUT_DIR, `${slug}.png`)
+  const fresh = manifest[slug] === hash && await fileExists(outputPath)
+
+  return { task: { slug, title: frontmatter.title, summary, type, outputPath }, hash, fresh }
+}
+
+interface RenderPlan {
+  tasks: RenderTask[]
+  // Slug → hash to record once the card is rendered
+  hashes: Map<string, string>
+  // Manifest entries of cards that are already up to date
+  nextManifest: ManifestEntries
+  skipped: number
+}
+
+function partitionPlan(planned: PlanOutcome[]): RenderPlan {
+  const plan: RenderPlan = { tasks: [], hashes: new Map(), nextManifest: {}, skipped: 0 }
+
+  for (const outcome of planned) {
+    if ('readError' in outcome) {
+      console.error('  Error reading content file:', outcome.readError)
+      continue
     }
+    if ('skipReason' in outcome) {
+      console.log(`  ${outcome.skipReason}`)
+      plan.skipped++
+      continue
+    }
+    if (outcome.fresh) {
+      plan.nextManifest[outcome.task.slug] = outcome.hash
+      plan.skipped++
+      continue
+    }
+    plan.hashes.set(outcome.task.slug, outcome.hash)
+    plan.tasks.push(outcome.task)
   }
 
+  return plan
+}
+
+function formatMs(ms: number): string {
+  return ms >= 1000 ? `${(ms / 1000).toFixed(2)}s` : `${Math.round(ms)}ms`
+}
+
+async function timed<T>(phases: Array<[string, number]>, name: string, fn: () => Promise<T>): Promise<T> {
+  const start = performance.now()
+  const result = await fn()
+  phases.push([name, performance.now() - start])
+  return result
+}
+
+async function main() {
+  console.log('Generating OG images...')
+  const phases: Array<[string, number]> = []
+
+  // Ensure output directory exists
+  await mkdir(OUTPUT_DIR, { recursive: true })
+
+  const { files, planned, manifest } = await timed(phases, 'scan', async () => {
+    const [files, manifest] = await Promise.all([findMarkdownFiles(CONTENT_DIR), readManifest()])
+    const planned = await Promise.all(files.map(filePath => planCard(filePath, manifest)))
+    return { files, planned, manifest }
+  })
+  console.log(`Found ${files.length} content file(s)`)
+
+  const { tasks, hashes, nextManifest, skipped } = partitionPlan(planned)
+  let errors = planned.length - tasks.length - skipped
+
+  console.log(`  ${tasks.length} card(s) to render, ${Object.keys(manifest).length} in manifest`)
+
+  // Fonts are only needed when something has to be rendered
+  const fonts = tasks.length > 0 ? await timed(phases, 'fonts', loadFonts) : null
+
+  let generated = 0
+  const renderTotals = { satoriMs: 0, resvgMs: 0, writeMs: 0 }
+  const workerCount = fonts
+    ? await timed(phases, 'render', () => renderWithPool(tasks, fonts, (result) => {
+        renderTotals.satoriMs += result.satoriMs
+        renderTotals.resvgMs += result.resvgMs
+        renderTotals.writeMs += result.writeMs
+
+        if (result.error) {
+          console.error(`  Error generating OG image for ${result.slug}:`, result.error)
+          errors++
+          return
+        }
+
+        nextManifest[result.slug] = hashes.get(result.slug) ?? ''
+        generated++
+        if (generated % 50 === 0) {
+          console.log(`  Generated ${generated} images...`)
+        }
+      }))
+    : 0
+
+  // Only cards that exist on disk are recorded, so deleted notes drop out
+  await timed(phases, 'manifest', () => writeFile(
+    MANIFEST_PATH,
+    JSON.stringify({ templateVersion: OG_TEMPLATE_VERSION, entries: nextManifest }, null, 2) + '\n',
+  ))
+
   console.log(`Done! Generated: ${generated}, Skipped: ${skipped}, Errors: ${errors}`)
+  console.log('Timings:')
+  for (const [name, ms] of phases) {
+    console.log(`  ${name.padEnd(9)} ${formatMs(ms)}`)
+  }
+  if (workerCount > 0) {
+    console.log(`  (${workerCount} worker(s); summed per card: satori ${formatMs(renderTotals.satoriMs)}, resvg ${formatMs(renderTotals.resvgMs)}, write ${formatMs(renderTotals.writeMs)})`)
+  }
+}
+
+// Workers load this same file: they serve render tasks instead of running main
+function start(): void {
+  if (!isMainThread) {
+    runWorker()
+    return
+  }
+  main().catch(console.error)
 }
 
-main().catch(console.error)
+start()
@@ -0,0 +1,155 @@
+// oxlint-disable eslint/no-console
+/**
+ * Compare a `vitest bench` JSON report against a baseline
+ *
+ * Matches benchmarks by file, group and name, compares their mean time
+ * and writes the comparison to reports/bench/comparison.json. Exits with
+ * code 1 when any benchmark got slower than the threshold allows, so it
+ * can gate CI or a pre-push check.
+ *
+ * Typical flow:
+ *   pnpm bench:baseline   # on main, writes reports/bench/baseline.json
+ *   pnpm bench            # on the branch, runs and compares
+ *
+ * Flags:
+ * - --current <path>     report to check (default: reports/bench/latest.json)
+ * - --baseline <path>    report to compare against (default: reports/bench/baseline.json)
+ * - --threshold <ratio>  allowed slowdown, 0.25 = 25% (default: 0.25)
+ * - --out <path>         comparison output (default: reports/bench/comparison.json)
+ */
+
+import { mkdir, readFile, writeFile } from 'node:fs/promises'
+import { dirname, join } from 'node:path'
+import { z } from 'zod'
+import { tryCatch, tryCatchAsync } from '../shared/utils/tryCatch'
+
+const REPORT_DIR = join(process.cwd(), 'reports', 'bench')
+
+function readFlag(name: string, fallback: string): string {
+  const index = process.argv.indexOf(`--${name}`)
+  return index === -1 ? fallback : process.argv[index + 1] ?? fallback
+}
+
+const CURRENT_PATH = readFlag('current', join(REPORT_DIR, 'latest.json'))
+const BASELINE_PATH = readFlag('baseline', join(REPORT_DIR, 'baseline.json'))
+const OUT_PATH = readFlag('out', join(REPORT_DIR, 'comparison.json'))
+const THRESHOLD = Number(readFlag('threshold', '0.25'))
+
+// Subset of Vitest's --outputJson format that the comparison needs
+const BenchReportSchema = z.object({
+  files: z.array(z.object({
+    filepath: z.string(),
+    groups: z.array(z.object({
+      fullName: z.string(),
+      benchmarks: z.array(z.object({
+        name: z.string(),
+        mean: z.number(),
+        hz: z.number(),
+        rme: z.number(),
+        sampleCount: z.number().optional(),
+      })),
+    })),
+  })),
+})
+
+type BenchReport = z.infer<typeof BenchReportSchema>
+
+interface BenchResult {
+  mean: number
+  hz: number
+  rme: number
+}
+
+interface BenchComparison {
+  name: string
+  baselineMean: number | null
+  currentMean: number
+  // current / baseline mean, above 1 is slower
+  ratio: number | null
+  regressed: boolean
+}
+
+async function readReport(path: string): Promise<BenchReport | null> {
+  const [readError, content] = await tryCatchAsync(() => readFile(path, 'utf-8'))
+  if (readError) return null
+
+  const [parseError, data] = tryCatch((): unknown => JSON.parse(content))
+  if (parseError) throw new Error(`Invalid JSON in ${path}`)
+  return BenchReportSchema.parse(data)
+}
+
+// Group names are "<file> > <describe>", relative to the project root
+function indexResults(report: BenchReport): Map<string, BenchResult> {
+  const results = new Map<string, BenchResult>()
+  for (const group of report.files.flatMap(file => file.groups)) {
+    for (const bench of group.benchmarks) {
+      results.set(`${group.fullName} > ${bench.name}`, bench)
+    }
+  }
+  return results
+}
+
+function compare(current: Map<string, BenchResult>, baseline: Map<string, BenchResult>): BenchComparison[] {
+  return [...current].map(([name, result]) => {
+    const base = baseline.get(name)
+    const ratio = base && base.mean > 0 ? result.mean / base.mean : null
+    return {
+      name,
+      baselineMean: base?.mean ?? null,
+      currentMean: result.mean,
+      ratio,
+      regressed: ratio !== null && ratio > 1 + THRESHOLD,
+    }
+  })
+}
+
+function formatMs(ms: number | null): string {
+  if (ms === null) return '—'
+  return ms < 1 ? `${(ms * 1000).toFixed(1)}µs` : `${ms.toFixed(2)}ms`
+}
+
+function formatRatio(ratio: number | null): string {
+  if (ratio === null) return 'new'
+  const change = (ratio - 1) * 100
+  return `${change >= 0 ? '+' : ''}${change.toFixed(1)}%`
+}
+
+function printTable(comparisons: BenchComparison[]): void {
+  const width = Math.max(...comparisons.map(c => c.name.length))
+  for (const c of comparisons) {
+    const marker = c.regressed ? '✗' : ' '
+    console.log(`${marker} ${c.name.padEnd(width)}  ${formatMs(c.baselineMean).padStart(10)} → ${formatMs(c.currentMean).padStart(10)}  ${formatRatio(c.ratio)}`)
+  }
+}
+
+async function main() {
+  if (!Number.isFinite(THRESHOLD) || THRESHOLD < 0) {
+    throw new Error(`Invalid --threshold: ${THRESHOLD}`)
+  }
+
+  const current = await readReport(CURRENT_PATH)
+  if (!current) {
+    throw new Error(`No benchmark report at ${CURRENT_PATH}, run \`pnpm bench\` first`)
+  }
+
+  const baseline = await readReport(BASELINE_PATH)
+  if (!baseline) {
+    console.log(`No baseline at ${BASELINE_PATH}, skipping comparison (create one with \`pnpm bench:baseline\`)`)
+    return
+  }
+
+  const comparisons = compare(indexResults(current), indexResults(baseline))
+  printTable(comparisons)
+
+  await mkdir(dirname(OUT_PATH), { recursive: true })
+  await writeFile(OUT_PATH, JSON.stringify({ threshold: THRESHOLD, comparisons }, null, 2) + '\n')
+
+  const regressions = comparisons.filter(c => c.regressed)
+  console.log(`\n${comparisons.length} benchmark(s), ${regressions.length} slower than +${(THRESHOLD * 100).toFixed(0)}%`)
+  if (regressions.length > 0) process.exitCode = 1
+}
+
+main().catch((error: unknown) => {
+  console.error(error)
+  process.exitCode = 1
+})
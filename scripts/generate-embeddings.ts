@@ -4,12 +4,16 @@
  *
  * Uses Transformers.js with bge-small-en-v1.5 to generate 384-dimension
  * embeddings from content (title + summary + first 1500 chars of body).
- * Outputs to public/embeddings.json for client-side semantic search.
+ * Outputs to public/embeddings.bin for client- and server-side semantic search.
  *
  * Features:
  * - Incremental generation via content hashing (skips unchanged files)
  * - Batch processing for better throughput
- * - Reduced precision for smaller output (~40% size reduction)
+ * - Compact binary matrix, int8-quantized by default (see shared/utils/embeddingsBinary.ts)
+ *
+ * Flags:
+ * - --float32  store full-precision rows instead of int8
+ * - --json     also write the legacy public/embeddings.json
  */
 
 import { createHash } from 'node:crypto'
@@ -19,9 +23,21 @@ import { basename, join } from 'node:path'
 import { pipeline, type FeatureExtractionPipeline } from '@huggingface/transformers'
 import { parse as parseYaml } from 'yaml'
 import { tryCatch } from '../shared/utils/tryCatch'
+import {
+  EmbeddingsJsonSchema,
+  decodeEmbeddingsBinary,
+  embeddingsFromJson,
+  encodeEmbeddingsBinary,
+  getRowVector,
+  type EmbeddingsMatrix,
+} from '../shared/utils/embeddingsBinary'
 
 const CONTENT_DIR = join(process.cwd(), 'content')
-const OUTPUT_PATH = join(process.cwd(), 'public', 'embeddings.json')
+const OUTPUT_PATH = join(process.cwd(), 'public', 'embeddings.bin')
+const JSON_OUTPUT_PATH = join(process.cwd(), 'public', 'embeddings.json')
+
+const WRITE_FLOAT32 = process.argv.includes('--float32')
+const WRITE_JSON = process.argv.includes('--json')
 
 // Use bge-small-en-v1.5 for 384-dimension embeddings
 const MODEL_NAME = 'Xenova/bge-small-en-v1.5'
@@ -55,7 +71,7 @@ interface Frontmatter {
 }
 
 interface EmbeddingEntry {
-  vector: number[]
+  vector: ArrayLike<number>
   title: string
   type: string
   hash: string
@@ -184,25 +200,93 @@ function getSlugFromPath(filePath: string): string {
 }
 
 /**
- * Load existing embeddings file if it exists
+ * Read an existing artifact (binary, or legacy JSON for migration)
  */
-async function loadExistingEmbeddings(): Promise<EmbeddingsOutput | null> {
-  if (!existsSync(OUTPUT_PATH)) return null
+async function readExistingMatrix(): Promise<EmbeddingsMatrix | null> {
+  if (existsSync(OUTPUT_PATH)) {
+    const buffer = await readFile(OUTPUT_PATH).catch(() => null)
+    if (buffer) {
+      const [decodeError, matrix] = tryCatch(() => decodeEmbeddingsBinary(buffer.buffer, buffer.byteOffset, buffer.byteLength))
+      if (!decodeError) return matrix
+    }
+  }
+
+  if (!existsSync(JSON_OUTPUT_PATH)) return null
 
-  const content = await readFile(OUTPUT_PATH, 'utf-8').catch(() => null)
+  const content = await readFile(JSON_OUTPUT_PATH, 'utf-8').catch(() => null)
   if (!content) return null
 
-  const [parseError, parsed] = tryCatch(() => JSON.parse(content))
-  if (parseError) return null
+  const [parseError, matrix] = tryCatch(() => embeddingsFromJson(EmbeddingsJsonSchema.parse(JSON.parse(content))))
+  return parseError ? null : matrix
+}
+
+/**
+ * Load existing embeddings if present, keyed by slug
+ */
+async function loadExistingEmbeddings(): Promise<EmbeddingsOutput | null> {
+  const matrix = await readExistingMatrix()
+  if (!matrix) return null
+
+  const embeddings: Record<string, EmbeddingEntry> = {}
+  matrix.manifest.entries.forEach((entry, row) => {
+    embeddings[entry.slug] = {
+      vector: getRowVector(matrix, row),
+      title: entry.title,
+      type: entry.type,
+      hash: entry.hash ?? '',
+    }
+  })
+
+  return {
+    version: matrix.manifest.version,
+    model: matrix.manifest.model,
+    generatedAt: matrix.manifest.generatedAt ?? '',
+    textMaxLength: matrix.manifest.textMaxLength ?? TEXT_MAX_LENGTH,
+    embeddings,
+  }
+}
+
+/**
+ * Encode embeddings into the binary artifact.
+ * Rows are grouped by type so searches can filter by row range.
+ */
+function toBinary(output: EmbeddingsOutput): Uint8Array {
+  const slugs = Object.keys(output.embeddings).sort((a, b) =>
+    output.embeddings[a].type.localeCompare(output.embeddings[b].type) || a.localeCompare(b),
+  )
+  const entries = slugs.map((slug) => {
+    const { title, type, hash } = output.embeddings[slug]
+    return { slug, title, type, hash }
+  })
+
+  return encodeEmbeddingsBinary(
+    {
+      version: output.version,
+      model: output.model,
+      generatedAt: output.generatedAt,
+      textMaxLength: output.textMaxLength,
+      entries,
+    },
+    slugs.map(slug => output.embeddings[slug].vector),
+    WRITE_FLOAT32 ? 'float32' : 'int8',
+  )
+}
 
-  // eslint-disable-next-line @typescript-eslint/consistent-type-assertions -- JSON.parse returns unknown, structure validated by usage
-  return parsed as EmbeddingsOutput
+/**
+ * Legacy JSON shape with rounded vectors
+ */
+function toJson(output: EmbeddingsOutput): EmbeddingsOutput {
+  const embeddings: Record<string, EmbeddingEntry> = {}
+  for (const [slug, entry] of Object.entries(output.embeddings)) {
+    embeddings[slug] = { ...entry, vector: roundVector(entry.vector) }
+  }
+  return { ...output, embeddings }
 }
 
 /**
  * Round vector values to 5 decimal places for smaller output
  */
-function roundVector(vector: Float32Array): number[] {
+function roundVector(vector: ArrayLike<number>): number[] {
   return Array.from(vector).map((v) => Math.round(v * 100000) / 100000)
 }
 
@@ -277,8 +361,7 @@ async function processBatch(
     const start = j * VECTOR_SIZE
     const end = start + VECTOR_SIZE
     // eslint-disable-next-line @typescript-eslint/consistent-type-assertions -- Transformers.js returns Float32Array for fp32
-    const vectorData = (outputs.data as Float32Array).slice(start, end)
-    const vector = roundVector(vectorData)
+    const vector = (outputs.data as Float32Array).slice(start, end)
 
     embeddings[item.slug] = {
       vector,
@@ -349,12 +432,20 @@ async function main() {
     embeddings,
   }
 
-  await writeFile(OUTPUT_PATH, JSON.stringify(output))
+  const binary = toBinary(output)
+  await writeFile(OUTPUT_PATH, binary)
+
+  if (WRITE_JSON) {
+    await writeFile(JSON_OUTPUT_PATH, JSON.stringify(toJson(output)))
+  }
 
   const duration = ((Date.now() - startTime) / 1000).toFixed(1)
   console.log(`\nDone in ${duration}s!`)
   console.log(`  Generated: ${toProcess.length}, Cached: ${stats.cached}, Skipped: ${stats.skipped}, Errors: ${stats.errors}`)
-  console.log(`  Output: ${OUTPUT_PATH}`)
+  console.log(`  Output: ${OUTPUT_PATH} (${WRITE_FLOAT32 ? 'float32' : 'int8'}, ${(binary.byteLength / 1024).toFixed(0)} KB)`)
+  if (WRITE_JSON) {
+    console.log(`  Legacy JSON: ${JSON_OUTPUT_PATH}`)
+  }
 }
 
 main().catch(console.error)
@@ -0,0 +1,190 @@
+// oxlint-disable eslint/no-console
+/**
+ * Vault-wide "link suggestions" report
+ *
+ * Reads every note in content/, finds places where a note mentions another
+ * note's title (or alias) without linking to it, and prints a Markdown
+ * report grouped by the note that should get the link.
+ *
+ * Uses the same one-pass Aho-Corasick engine as /api/mentions
+ * (server/utils/mentionIndex.ts), with sections split on headings.
+ *
+ * Flags:
+ * - --json         print suggestions as JSON instead of Markdown
+ * - --out <path>   write the report to a file instead of stdout
+ */
+
+import { readdir, readFile, writeFile } from 'node:fs/promises'
+import { basename, join } from 'node:path'
+import { parse as parseYaml } from 'yaml'
+import { tryCatch } from '../shared/utils/tryCatch'
+import { normalizeSlug, wikiLinkRegex } from '../server/utils/wikilinks'
+import { buildMentionsIndex, collectMentionPatterns, toLinkSuggestions, type LinkSuggestion } from '../server/utils/mentionIndex'
+import type { ContentMeta, SearchSection } from '../server/utils/mentions'
+
+const CONTENT_DIR = join(process.cwd(), 'content')
+
+const WRITE_JSON = process.argv.includes('--json')
+const OUT_INDEX = process.argv.indexOf('--out')
+const OUT_PATH = OUT_INDEX === -1 ? null : process.argv[OUT_INDEX + 1] ?? null
+
+// Directories excluded from the content collection (see content.config.ts)
+const EXCLUDED_DIRS = [
+  'authors',
+  'pages',
+  'podcasts',
+  'tweets',
+  'newsletters',
+  'Readwise',
+  'blog',
+  'Excalidraw',
+  'newsletter-drafts',
+  'blog-ideas',
+  '_obsidian-templates',
+  'private',
+]
+
+interface Frontmatter {
+  title?: string
+  type?: string
+  aliases?: string[]
+}
+
+interface ParsedNote {
+  slug: string
+  meta: ContentMeta
+  aliases: string[]
+  sections: SearchSection[]
+}
+
+/**
+ * Recursively find all markdown files in directory
+ */
+async function findMarkdownFiles(dir: string, files: string[] = []): Promise<string[]> {
+  const entries = await readdir(dir, { withFileTypes: true })
+
+  for (const entry of entries) {
+    const fullPath = join(dir, entry.name)
+
+    if (entry.isDirectory()) {
+      if (!EXCLUDED_DIRS.includes(entry.name)) {
+        await findMarkdownFiles(fullPath, files)
+      }
+      continue
+    }
+
+    if (entry.name.endsWith('.md')) {
+      files.push(fullPath)
+    }
+  }
+
+  return files
+}
+
+/**
+ * Parse frontmatter from markdown content using YAML parser
+ */
+function parseFrontmatter(content: string): Frontmatter {
+  const match = content.match(/^---\n([\s\S]*?)\n---/)
+  if (!match) return {}
+
+  const [parseError, parsed] = tryCatch(() => parseYaml(match[1]))
+  if (parseError || typeof parsed !== 'object' || parsed === null) return {}
+
+  // eslint-disable-next-line @typescript-eslint/consistent-type-assertions -- YAML parser returns unknown, we validate object above
+  return parsed as Frontmatter
+}
+
+/**
+ * Collect link targets from wiki-links and internal markdown links
+ */
+function extractLinkTargets(body: string): Set<string> {
+  const targets = new Set<string>()
+  for (const match of body.matchAll(wikiLinkRegex)) {
+    targets.add(normalizeSlug(match[1]))
+  }
+  for (const match of body.matchAll(/\]\(\/([^)#\s]+)/g)) {
+    targets.add(match[1])
+  }
+  return targets
+}
+
+/**
+ * Split a body into plain-text sections on headings, like search sections
+ */
+function splitSections(slug: string, body: string): SearchSection[] {
+  const text = body
+    .replace(/```[\s\S]*?```/g, '') // Code blocks
+    .replace(wikiLinkRegex, (_, target: string, heading?: string, display?: string) => display ?? heading ?? target)
+    .replace(/!?\[([^\]]*)\]\([^)]+\)/g, '$1') // Links and images
+
+  return text
+    .split(/^#{1,6}\s+/m)
+    .map((content, i) => ({ id: `/${slug}#${i}`, content: content.trim() }))
+    .filter(section => section.content.length > 0)
+}
+
+async function parseNote(filePath: string): Promise<ParsedNote | null> {
+  const raw = await readFile(filePath, 'utf-8')
+  const frontmatter = parseFrontmatter(raw)
+  if (!frontmatter.title) return null
+
+  const slug = basename(filePath, '.md')
+  const body = raw.replace(/^---\n[\s\S]*?\n---\n?/, '')
+
+  return {
+    slug,
+    meta: { title: frontmatter.title, type: frontmatter.type ?? 'note', linksTo: extractLinkTargets(body) },
+    aliases: Array.isArray(frontmatter.aliases) ? frontmatter.aliases.map(String) : [],
+    sections: splitSections(slug, body),
+  }
+}
+
+function formatMarkdown(suggestions: LinkSuggestion[], noteCount: number): string {
+  const lines = [
+    '# Link suggestions',
+    '',
+    `${suggestions.length} unlinked mention(s) across ${noteCount} notes.`,
+  ]
+
+  let currentSource = ''
+  for (const suggestion of suggestions) {
+    if (suggestion.source !== currentSource) {
+      currentSource = suggestion.source
+      lines.push('', `## ${suggestion.sourceTitle} (\`${suggestion.source}\`)`, '')
+    }
+    lines.push(`- [[${suggestion.target}]] ${suggestion.targetTitle}: "${suggestion.snippet.replace(/\s+/g, ' ')}"`)
+  }
+
+  return lines.join('\n') + '\n'
+}
+
+async function main() {
+  const startTime = Date.now()
+  const files = await findMarkdownFiles(CONTENT_DIR)
+  const notes = (await Promise.all(files.map(parseNote))).filter(note => note !== null)
+
+  const contentMap = new Map(notes.map(note => [note.slug, note.meta]))
+  const aliases = new Map(notes.map(note => [note.slug, note.aliases]))
+  const sections = notes.flatMap(note => note.sections)
+
+  const mentions = buildMentionsIndex(contentMap, sections, collectMentionPatterns(contentMap, aliases))
+  const suggestions = toLinkSuggestions(mentions, contentMap)
+
+  const report = WRITE_JSON
+    ? JSON.stringify(suggestions, null, 2) + '\n'
+    : formatMarkdown(suggestions, notes.length)
+
+  const duration = ((Date.now() - startTime) / 1000).toFixed(2)
+  console.error(`Scanned ${notes.length} notes, ${sections.length} sections in ${duration}s`)
+
+  if (!OUT_PATH) {
+    process.stdout.write(report)
+    return
+  }
+
+  await writeFile(OUT_PATH, report)
+  console.error(`Wrote ${suggestions.length} suggestion(s) to ${OUT_PATH}`)
+}
+
+main().catch(console.error)
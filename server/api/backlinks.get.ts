@@ -1,19 +1,16 @@
-import { defineEventHandler } from 'h3'
-import { queryCollection } from '@nuxt/content/server'
-import { buildBacklinksIndex, type BacklinksIndex } from '../utils/backlinks'
+import type { BacklinksIndex } from '../utils/backlinks'
+import { toBacklinksIndex } from '../utils/linkIndex'
+import { getLinkIndex } from '../utils/linkIndexStore'
+import { defineTracedEventHandler } from '../utils/tracing'
 import { tryAsync } from '#shared/utils/tryCatch'
 
-export default defineEventHandler(async (event): Promise<BacklinksIndex> => {
-  const [error, allContent] = await tryAsync(
-    queryCollection(event, 'content')
-      .select('path', 'stem', 'title', 'type', 'tags', 'summary', 'body')
-      .all(),
-  )
+export default defineTracedEventHandler(async (event): Promise<BacklinksIndex> => {
+  const [error, linkIndex] = await tryAsync(getLinkIndex(event))
 
   if (error) {
     console.error('Error building backlinks index:', error)
     return {}
   }
 
-  return buildBacklinksIndex(allContent)
+  return toBacklinksIndex(linkIndex)
 })
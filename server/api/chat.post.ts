@@ -23,6 +23,8 @@ import {
 } from '../utils/chat/search'
 import type { RawNote } from '../utils/chat/search'
 import { semanticSearch, findSimilarNotes } from '../utils/chat/semanticSearch'
+import { getKeywordIndex } from '../utils/chat/keywordIndexStore'
+import { getKeywordDocument, type KeywordIndex } from '../utils/chat/keywordIndex'
 import {
   buildInitialMessages,
   appendAssistantMessage,
@@ -30,29 +32,24 @@ import {
 } from '../utils/chat/messages'
 import { mapApiError } from '../utils/chat/errors'
 import { isServerFeatureEnabled } from '../utils/featureToggles'
+import {
+  getTraceTimings,
+  runWithTrace,
+  startRequestTrace,
+  traceSpanAsync,
+  type RequestTrace,
+} from '../utils/tracing'
 
 const log = consola.withTag('chat')
 
 type HttpEvent = Parameters<typeof queryCollection>[0]
 
 // Database queries (imperative shell)
-async function fetchAllNotes(httpEvent: HttpEvent, type?: string): Promise<RawNote[]> {
-  let queryBuilder = queryCollection(httpEvent, 'content')
-    .select('title', 'summary', 'path', 'stem', 'tags', 'type')
-    .limit(100)
-
-  if (type) {
-    queryBuilder = queryBuilder.where('type', '=', type)
-  }
-
-  return queryBuilder.all()
-}
-
 async function fetchNoteBySlug(httpEvent: HttpEvent, slug: string): Promise<RawNote | null> {
-  const note = await queryCollection(httpEvent, 'content')
+  const note = await traceSpanAsync('content.query', () => queryCollection(httpEvent, 'content')
     .select('title', 'summary', 'path', 'stem', 'tags', 'type', 'notes', 'url', 'rawbody')
     .where('stem', '=', slug)
-    .first()
+    .first())
 
   if (!note) return null
 
@@ -74,39 +71,36 @@ async function executeSearchNotes(
 ): Promise<NoteContext[]> {
   log.info(`[${requestId}] Tool: search_notes`, { query, type, limit, mode })
 
-  const allNotes = await fetchAllNotes(httpEvent)
+  const index = await getKeywordIndex(httpEvent)
 
-  const notes = await executeSearchByMode(query, allNotes, { limit, type }, mode)
+  const notes = await executeSearchByMode(query, index, { limit, type }, mode)
   log.info(`[${requestId}] ${mode} search found ${notes.length} results:`, notes.map(n => n.title))
   return notes
 }
 
 async function executeSearchByMode(
   query: string,
-  allNotes: RawNote[],
+  index: KeywordIndex,
   options: { limit: number; type?: string },
   mode: 'keyword' | 'semantic' | 'hybrid',
 ): Promise<NoteContext[]> {
   const { limit, type } = options
 
   if (mode === 'keyword') {
-    return keywordSearch(query, allNotes, { limit, type })
+    return keywordSearch(query, index, { limit, type })
   }
 
   if (mode === 'semantic') {
-    const semanticResults = await semanticSearch(query, limit * 2)
-    const filtered = type
-      ? semanticResults.filter(r => r.type === type)
-      : semanticResults
-    return filtered.slice(0, limit).map(r => ({
+    const semanticResults = await semanticSearch(query, Math.min(limit, 10), type)
+    return semanticResults.map(r => ({
       title: r.title,
-      summary: allNotes.find(n => n.stem === r.slug)?.summary ?? null,
+      summary: getKeywordDocument(index, r.slug)?.summary ?? null,
       path: `/${r.slug}`,
     }))
   }
 
   // Default: hybrid search
-  return hybridSearch(query, allNotes, { limit, type })
+  return hybridSearch(query, index, { limit, type })
 }
 
 async function executeGetNoteContent(
@@ -151,10 +145,10 @@ function parseWikiLinks(content: string | null | undefined): string[] {
  */
 async function findBacklinks(httpEvent: HttpEvent, slug: string): Promise<Array<{ title: string; path: string }>> {
   // Query all notes and check their content for wiki-links to this slug
-  const allNotes = await queryCollection(httpEvent, 'content')
+  const allNotes = await traceSpanAsync('content.query', () => queryCollection(httpEvent, 'content')
     .select('title', 'path', 'stem', 'notes')
     .limit(500)
-    .all()
+    .all())
 
   const backlinks: Array<{ title: string; path: string }> = []
 
@@ -402,7 +396,7 @@ async function handleFetchSource(httpEvent: HttpEvent, slug: string, requestId:
 }
 
 // Tool dispatcher
-async function executeTool(
+async function dispatchTool(
   httpEvent: HttpEvent,
   toolName: string,
   toolInput: unknown,
@@ -423,6 +417,17 @@ async function executeTool(
   return { result: JSON.stringify({ error: `Unknown tool: ${toolName}` }), notes: [] }
 }
 
+// One span per tool call; unknown names share a span so the model cannot grow the histograms
+function executeTool(
+  httpEvent: HttpEvent,
+  toolName: string,
+  toolInput: unknown,
+  requestId: string,
+): Promise<ToolResult> {
+  const spanName = TOOLS.some(tool => tool.name === toolName) ? `tool.${toolName}` : 'tool.unknown'
+  return traceSpanAsync(spanName, () => dispatchTool(httpEvent, toolName, toolInput, requestId))
+}
+
 // Main streaming function (imperative shell)
 async function streamChatResponse(
   httpEvent: HttpEvent,
@@ -430,6 +435,7 @@ async function streamChatResponse(
   initialMessages: Anthropic.MessageParam[],
   eventStream: ReturnType<typeof createEventStream>,
   requestId: string,
+  trace: RequestTrace | null,
 ): Promise<void> {
   const startTime = Date.now()
   const allUsedNotes: NoteContext[] = []
@@ -458,7 +464,7 @@ async function streamChatResponse(
         await eventStream.push(JSON.stringify({ type: 'text', content: text }))
       })
 
-      const response = await stream.finalMessage()
+      const response = await traceSpanAsync('anthropic.stream', () => stream.finalMessage())
 
       log.info(`[${requestId}] Response received`, {
         stopReason: response.stop_reason,
@@ -547,6 +553,11 @@ async function streamChatResponse(
     }))
   }
 
+  // Only sent while tracing is on; the chat panel ignores event types it does not know
+  if (trace) {
+    await eventStream.push(JSON.stringify({ type: 'timing', ...getTraceTimings(trace) }))
+  }
+
   await eventStream.close()
 }
 
@@ -618,7 +629,9 @@ export default defineEventHandler(async (event) => {
   const eventStream = createEventStream(event)
   const anthropic = new Anthropic({ apiKey: config.anthropicApiKey })
 
-  void streamChatResponse(event, anthropic, messages, eventStream, requestId)
+  // Headers are sent as the stream opens, so timings go out as the last SSE event
+  const trace = startRequestTrace()
+  void runWithTrace(trace, () => streamChatResponse(event, anthropic, messages, eventStream, requestId, trace))
 
   return eventStream.send()
 })
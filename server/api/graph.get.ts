@@ -1,19 +1,21 @@
-import { defineEventHandler } from 'h3'
-import { queryCollection } from '@nuxt/content/server'
-import { buildGraphFromContent, type GraphData } from '../utils/graph'
+import type { GraphData } from '../utils/graph'
+import { toGraphData } from '../utils/linkIndex'
+import { getLinkIndex } from '../utils/linkIndexStore'
+import { withSettledPositions } from '../utils/graphPositions'
+import { defineTracedEventHandler } from '../utils/tracing'
 import { tryAsync } from '#shared/utils/tryCatch'
 
-export default defineEventHandler(async (event): Promise<GraphData> => {
-  const [error, allContent] = await tryAsync(
-    queryCollection(event, 'content')
-      .select('path', 'stem', 'title', 'type', 'tags', 'authors', 'summary', 'body')
-      .all(),
-  )
+export default defineTracedEventHandler(async (event): Promise<GraphData> => {
+  const [error, linkIndex] = await tryAsync(getLinkIndex(event))
 
   if (error) {
     console.error('Error building graph data:', error)
     return { nodes: [], edges: [] }
   }
 
-  return buildGraphFromContent(allContent)
+  const graphData = toGraphData(linkIndex)
+
+  // The prerendered payload carries settled positions, so the graph page paints
+  // immediately; in dev the page lays the graph out itself
+  return import.meta.prerender ? withSettledPositions(graphData) : graphData
 })
@@ -1,21 +1,28 @@
-import { defineEventHandler, getQuery } from 'h3'
-import { queryCollection, queryCollectionSearchSections } from '@nuxt/content/server'
-import { findUnlinkedMentions, type MentionItem } from '../utils/mentions'
+import { getQuery } from 'h3'
+import { findUnlinkedMentionsInContentMap, type MentionItem } from '../utils/mentions'
+import { getMentionsSnapshot } from '../utils/mentionIndexStore'
+import { defineTracedEventHandler } from '../utils/tracing'
 import { tryCatchAsync } from '#shared/utils/tryCatch'
 
-export default defineEventHandler(async (event): Promise<MentionItem[]> => {
+export default defineTracedEventHandler(async (event): Promise<MentionItem[]> => {
   const query = getQuery(event)
   const targetSlug = String(query.slug || '')
   const targetTitle = String(query.title || '')
 
-  if (!targetSlug || !targetTitle || targetTitle.length < 3) {
+  if (!targetSlug) {
     return []
   }
 
   const [error, result] = await tryCatchAsync(async () => {
-    const allContent = await queryCollection(event, 'content').all()
-    const searchSections = await queryCollectionSearchSections(event, 'content')
-    return findUnlinkedMentions(allContent, searchSections, targetSlug, targetTitle)
+    const { mentions, contentMap, sections } = await getMentionsSnapshot(event)
+
+    // Notes in the content collection are precomputed (titles and aliases)
+    if (contentMap.has(targetSlug)) {
+      return mentions.get(targetSlug) ?? []
+    }
+
+    // Other pages (e.g. tweets) are matched on demand by title
+    return findUnlinkedMentionsInContentMap(contentMap, sections, targetSlug, targetTitle)
   })
 
   if (error) {
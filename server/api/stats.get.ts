@@ -1,6 +1,7 @@
 import type { H3Event } from 'h3'
 import { defineCachedEventHandler } from 'nitropack/runtime'
 import { queryCollection } from '@nuxt/content/server'
+import { defineTracedEventHandler, traceSpanAsync } from '../utils/tracing'
 
 interface ContentItem {
   type: string
@@ -178,18 +179,19 @@ function getStartDate(items: ContentItem[]): string | null {
 
 async function fetchGraphData(_event: H3Event): Promise<GraphData> {
   // Fetch from internal API endpoint using relative path
-  const result = await $fetch<GraphData>('/api/graph').catch((error) => {
+  const result = await traceSpanAsync('stats.graph-fetch', () => $fetch<GraphData>('/api/graph')).catch((error) => {
     console.error('Error fetching graph data:', error)
     return null
   })
   return result ?? { nodes: [], edges: [] }
 }
 
-export default defineCachedEventHandler(async (event): Promise<StatsData> => {
+// Traced outside the cache so cached responses never replay a stale Server-Timing header
+export default defineTracedEventHandler(defineCachedEventHandler(async (event): Promise<StatsData> => {
   // Query content with minimal fields needed for stats
-  const allContent: ContentItem[] = await queryCollection(event, 'content')
+  const allContent: ContentItem[] = await traceSpanAsync('content.query', () => queryCollection(event, 'content')
     .select('type', 'tags', 'authors', 'date', 'summary', 'notes')
-    .all()
+    .all())
 
   // Fetch graph data for connection metrics
   const graphData = await fetchGraphData(event)
@@ -250,4 +252,4 @@ export default defineCachedEventHandler(async (event): Promise<StatsData> => {
   maxAge: 60 * 10, // Cache for 10 minutes
   swr: true, // Stale-while-revalidate
   name: 'stats',
-})
+}))
@@ -0,0 +1,20 @@
+import { createError, defineEventHandler, setResponseHeader } from 'h3'
+import type { LatencySummary } from '../utils/latencyHistogram'
+import { getLatencyStats, isHistogramEnabled } from '../utils/tracing'
+
+interface TimingsResponse {
+  spans: Record<string, LatencySummary>
+}
+
+// Span latency percentiles since the server started (opt-in, see server/plugins/tracing.ts)
+export default defineEventHandler((event): TimingsResponse => {
+  if (!isHistogramEnabled()) {
+    throw createError({
+      statusCode: 404,
+      statusMessage: 'Not Found',
+    })
+  }
+
+  setResponseHeader(event, 'Cache-Control', 'no-store')
+  return { spans: getLatencyStats() }
+})
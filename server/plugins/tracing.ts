@@ -0,0 +1,12 @@
+import { defineNitroPlugin } from 'nitropack/runtime'
+import { useRuntimeConfig } from '#imports'
+import { configureTracing } from '../utils/tracing'
+
+/**
+ * Enable request tracing from runtime config. Off by default:
+ * - NUXT_TRACING_ENABLED=true adds Server-Timing headers and the chat `timing` event
+ * - NUXT_TRACING_HISTOGRAM=true also keeps latency histograms, served by /api/timings
+ */
+export default defineNitroPlugin(() => {
+  configureTracing(useRuntimeConfig().tracing)
+})
@@ -0,0 +1,275 @@
+/**
+ * In-memory inverted index with BM25 scoring for chat keyword search.
+ *
+ * Built once per content version over title, tags, summary and body.
+ * Per-field term frequencies are weighted and folded into one posting per
+ * (term, document) pair (BM25F-style), so a query only touches the postings
+ * of its keywords instead of scanning every note.
+ */
+
+import { createTopK } from '#shared/utils/topK'
+import { getSlug } from '../graph'
+import type { RawNote } from './search'
+
+export interface KeywordDocument {
+  slug: string
+  title: string
+  summary: string | null
+  path: string
+  type: string
+}
+
+export interface Posting {
+  docIds: Uint32Array
+  // Field-weighted term frequency per document
+  frequencies: Float32Array
+}
+
+export interface KeywordIndex {
+  documents: KeywordDocument[]
+  docIdBySlug: Map<string, number>
+  postings: Map<string, Posting>
+  // Sorted vocabulary for prefix lookups
+  terms: string[]
+  docLengths: Float32Array
+  averageDocLength: number
+  typeCounts: Map<string, number>
+}
+
+export interface KeywordHit {
+  document: KeywordDocument
+  score: number
+}
+
+export interface KeywordSearchOptions {
+  limit: number
+  type?: string
+}
+
+// Field weights (tags and titles are the strongest signals, as before)
+export const FIELD_WEIGHTS = {
+  title: 2,
+  tags: 3,
+  summary: 1,
+  body: 0.5,
+}
+
+// BM25 parameters
+const K1 = 1.2
+const B = 0.75
+
+// Prefix expansions score lower than exact term matches
+export const PREFIX_MATCH_WEIGHT = 0.5
+// Caps the postings walked per keyword, keeping query time bounded;
+// the most frequent matching terms are kept
+export const MAX_PREFIX_EXPANSIONS = 32
+// Body text beyond this length is not indexed
+const BODY_MAX_LENGTH = 20000
+
+/**
+ * Split text into lowercase terms.
+ * Uses the same normalization as extractKeywords (hyphens are kept).
+ */
+export function tokenize(text: string): string[] {
+  return text
+    .toLowerCase()
+    .replace(/[^\w\s-]/g, ' ')
+    .split(/\s+/)
+    .filter(term => term.length > 1)
+}
+
+// Helper: Drop YAML frontmatter, which duplicates the indexed metadata
+function stripFrontmatter(rawbody: string): string {
+  return rawbody.replace(/^---\r?\n[\s\S]*?\r?\n---\r?\n?/, '')
+}
+
+// Helper: Add weighted term frequencies of one field, returning its weighted length
+function addField(frequencies: Map<string, number>, text: string, weight: number): number {
+  const terms = tokenize(text)
+  for (const term of terms) {
+    frequencies.set(term, (frequencies.get(term) ?? 0) + weight)
+  }
+  return terms.length * weight
+}
+
+function toKeywordDocument(note: RawNote): KeywordDocument {
+  const slug = getSlug(note)
+  return {
+    slug,
+    title: note.title ?? note.stem ?? 'Untitled',
+    summary: note.summary ?? null,
+    path: note.path ?? `/${slug}`,
+    type: note.type ?? 'note',
+  }
+}
+
+// Helper: Weighted term frequencies and length of one note
+function analyzeNote(note: RawNote): { termFrequencies: Map<string, number>, length: number } {
+  const termFrequencies = new Map<string, number>()
+  const body = stripFrontmatter(note.rawbody ?? '').slice(0, BODY_MAX_LENGTH)
+  const length = addField(termFrequencies, note.title ?? '', FIELD_WEIGHTS.title)
+    + addField(termFrequencies, (note.tags ?? []).join(' '), FIELD_WEIGHTS.tags)
+    + addField(termFrequencies, note.summary ?? '', FIELD_WEIGHTS.summary)
+    + addField(termFrequencies, body, FIELD_WEIGHTS.body)
+  return { termFrequencies, length }
+}
+
+function countTypes(documents: KeywordDocument[]): Map<string, number> {
+  const counts = new Map<string, number>()
+  for (const { type } of documents) {
+    counts.set(type, (counts.get(type) ?? 0) + 1)
+  }
+  return counts
+}
+
+/**
+ * Build the inverted index over all notes.
+ */
+export function buildKeywordIndex(notes: RawNote[]): KeywordIndex {
+  const documents = notes.map(toKeywordDocument)
+  const docLengths = new Float32Array(notes.length)
+  const docIds = new Map<string, number[]>()
+  const frequencies = new Map<string, number[]>()
+
+  notes.forEach((note, docId) => {
+    const { termFrequencies, length } = analyzeNote(note)
+    docLengths[docId] = length
+
+    for (const [term, frequency] of termFrequencies) {
+      const ids = docIds.get(term)
+      if (ids) {
+        ids.push(docId)
+        frequencies.get(term)?.push(frequency)
+        continue
+      }
+      docIds.set(term, [docId])
+      frequencies.set(term, [frequency])
+    }
+  })
+
+  const postings = new Map<string, Posting>()
+  for (const [term, ids] of docIds) {
+    postings.set(term, {
+      docIds: Uint32Array.from(ids),
+      frequencies: Float32Array.from(frequencies.get(term) ?? []),
+    })
+  }
+
+  const totalLength = docLengths.reduce((sum, length) => sum + length, 0)
+
+  return {
+    documents,
+    docIdBySlug: new Map(documents.map((doc, docId) => [doc.slug, docId])),
+    postings,
+    terms: [...postings.keys()].sort(),
+    docLengths,
+    averageDocLength: documents.length > 0 ? totalLength / documents.length : 0,
+    typeCounts: countTypes(documents),
+  }
+}
+
+/**
+ * Look up an indexed note by slug.
+ */
+export function getKeywordDocument(index: KeywordIndex, slug: string): KeywordDocument | undefined {
+  const docId = index.docIdBySlug.get(slug)
+  return docId === undefined ? undefined : index.documents[docId]
+}
+
+// Helper: First index in a sorted array whose value is >= target
+function lowerBound(sorted: string[], target: string): number {
+  let low = 0
+  let high = sorted.length
+  while (low < high) {
+    const mid = (low + high) >> 1
+    if ((sorted[mid] ?? '') < target) {
+      low = mid + 1
+      continue
+    }
+    high = mid
+  }
+  return low
+}
+
+/**
+ * Expand a keyword to the indexed terms it matches, in term order.
+ * The exact term (if indexed) has weight 1, longer terms sharing the
+ * prefix have PREFIX_MATCH_WEIGHT. Beyond MAX_PREFIX_EXPANSIONS matches,
+ * the exact term and the prefix terms found in the most documents are kept.
+ */
+export function expandKeyword(index: KeywordIndex, keyword: string): Array<{ term: string, weight: number }> {
+  const heap = createTopK(MAX_PREFIX_EXPANSIONS, index.terms.length)
+
+  for (let i = lowerBound(index.terms, keyword); i < index.terms.length; i++) {
+    const term = index.terms[i] ?? ''
+    if (!term.startsWith(keyword)) break
+    const documentFrequency = index.postings.get(term)?.docIds.length ?? 0
+    heap.push(i, term === keyword ? Infinity : documentFrequency)
+  }
+
+  return heap.results()
+    .sort((a, b) => a.row - b.row)
+    .map(({ row }) => {
+      const term = index.terms[row] ?? ''
+      return { term, weight: term === keyword ? 1 : PREFIX_MATCH_WEIGHT }
+    })
+}
+
+// Helper: BM25 inverse document frequency
+function idf(documentCount: number, documentFrequency: number): number {
+  return Math.log(1 + (documentCount - documentFrequency + 0.5) / (documentFrequency + 0.5))
+}
+
+// Helper: Best score per document for one keyword across its expansions
+function scoreKeyword(index: KeywordIndex, keyword: string, type: string | undefined): Map<number, number> {
+  const scores = new Map<number, number>()
+  const documentCount = index.documents.length
+
+  for (const { term, weight } of expandKeyword(index, keyword)) {
+    const posting = index.postings.get(term)
+    if (!posting) continue
+    const termIdf = idf(documentCount, posting.docIds.length) * weight
+
+    posting.docIds.forEach((docId, i) => {
+      if (type && index.documents[docId]?.type !== type) return
+      const frequency = posting.frequencies[i] ?? 0
+      const lengthRatio = (index.docLengths[docId] ?? 0) / (index.averageDocLength || 1)
+      const score = termIdf * (frequency * (K1 + 1)) / (frequency + K1 * (1 - B + B * lengthRatio))
+      scores.set(docId, Math.max(scores.get(docId) ?? 0, score))
+    })
+  }
+
+  return scores
+}
+
+/**
+ * Score documents against keywords with BM25, highest score first.
+ * Documents matching no keyword are omitted.
+ */
+export function searchKeywordIndex(
+  index: KeywordIndex,
+  keywords: string[],
+  options: KeywordSearchOptions,
+): KeywordHit[] {
+  const { limit, type } = options
+  if (limit <= 0 || (type && !index.typeCounts.has(type))) {
+    return []
+  }
+
+  const totals = new Map<number, number>()
+  for (const keyword of new Set(keywords)) {
+    for (const [docId, score] of scoreKeyword(index, keyword, type)) {
+      totals.set(docId, (totals.get(docId) ?? 0) + score)
+    }
+  }
+
+  const heap = createTopK(limit, totals.size)
+  for (const [docId, score] of totals) {
+    heap.push(docId, score)
+  }
+
+  return heap.results().flatMap(({ row, score }) => {
+    const document = index.documents[row]
+    return document ? [{ document, score }] : []
+  })
+}
@@ -0,0 +1,75 @@
+/**
+ * Process-wide cache for the chat keyword index.
+ *
+ * The index is built lazily on the first search and reused for the lifetime
+ * of the content version: forever in production (the content database is
+ * immutable), and in development until the shared link index reports a new
+ * version, so edits are detected by its throttled freshness check.
+ */
+
+import type { H3Event } from 'h3'
+import { queryCollection } from '@nuxt/content/server'
+import { getLinkIndex, getLinkIndexVersion } from '../linkIndexStore'
+import { traceSpan, traceSpanAsync } from '../tracing'
+import { buildKeywordIndex, type KeywordIndex } from './keywordIndex'
+import type { RawNote } from './search'
+
+// Module-level cache (singleton pattern)
+let indexCache: KeywordIndex | null = null
+let versionCache = -1
+let loadingPromise: Promise<KeywordIndex> | null = null
+
+/**
+ * Clears the keyword index cache.
+ * Useful for testing or when content needs to be re-indexed from scratch.
+ */
+export function clearKeywordIndexCache(): void {
+  indexCache = null
+  versionCache = -1
+  loadingPromise = null
+}
+
+async function fetchSearchableNotes(event: H3Event): Promise<RawNote[]> {
+  const notes = await traceSpanAsync('content.query', () => queryCollection(event, 'content')
+    .select('title', 'summary', 'path', 'stem', 'tags', 'type', 'rawbody')
+    .all())
+
+  // Cast rawbody to string since Nuxt Content types it as unknown
+  return notes.map(note => ({
+    ...note,
+    rawbody: typeof note.rawbody === 'string' ? note.rawbody : undefined,
+  }))
+}
+
+async function loadKeywordIndex(event: H3Event): Promise<KeywordIndex> {
+  if (import.meta.dev) {
+    await getLinkIndex(event)
+    const version = getLinkIndexVersion()
+    if (indexCache && version === versionCache) {
+      return indexCache
+    }
+    versionCache = version
+  }
+
+  const notes = await fetchSearchableNotes(event)
+  indexCache = traceSpan('index.keyword.build', () => buildKeywordIndex(notes))
+  return indexCache
+}
+
+/**
+ * Get the keyword index for the current content version.
+ * Concurrent callers share a single build.
+ */
+export async function getKeywordIndex(event: H3Event): Promise<KeywordIndex> {
+  if (indexCache && !import.meta.dev) {
+    return indexCache
+  }
+
+  if (!loadingPromise) {
+    loadingPromise = loadKeywordIndex(event).finally(() => {
+      loadingPromise = null
+    })
+  }
+
+  return loadingPromise
+}
@@ -1,5 +1,6 @@
 import type { NoteContext, NoteContent } from './tools'
 import { semanticSearch } from './semanticSearch'
+import { getKeywordDocument, searchKeywordIndex, type KeywordHit, type KeywordIndex } from './keywordIndex'
 
 // Raw note type from database query
 export interface RawNote {
@@ -41,52 +42,13 @@ export function extractKeywords(message: string): string[] {
     .slice(0, 8)
 }
 
-/**
- * Check if any tag matches a keyword.
- */
-export function matchesTag(tagsLower: string[], keyword: string): boolean {
-  return tagsLower.some(tag => tag === keyword || tag.includes(keyword) || keyword.includes(tag))
-}
-
-/**
- * Calculate a relevance score for a note based on keywords.
- * Higher scores indicate better matches.
- */
-export function scoreNote(note: RawNote, keywords: string[]): number {
-  const titleLower = (note.title ?? '').toLowerCase()
-  const summaryLower = (note.summary ?? '').toLowerCase()
-  const tagsLower = (note.tags ?? []).map(t => t.toLowerCase())
-
-  return keywords.reduce((score, keyword) => {
-    let keywordScore = 0
-    if (titleLower.includes(keyword)) keywordScore += 2
-    if (summaryLower.includes(keyword)) keywordScore += 1
-    if (matchesTag(tagsLower, keyword)) keywordScore += 3
-    return score + keywordScore
-  }, 0)
-}
-
-/**
- * Filter and score notes, returning the top matches.
- * Pure function - no side effects.
- */
-export function filterAndScoreNotes(
-  notes: RawNote[],
-  keywords: string[],
-  limit: number = 5,
-): NoteContext[] {
-  const maxLimit = Math.min(limit, 10)
-
-  return notes
-    .map(note => ({ note, score: scoreNote(note, keywords) }))
-    .filter(item => item.score > 0)
-    .sort((a, b) => b.score - a.score)
-    .slice(0, maxLimit)
-    .map(item => ({
-      title: item.note.title ?? item.note.stem ?? 'Untitled',
-      summary: item.note.summary ?? null,
-      path: item.note.path ?? `/${item.note.stem}`,
-    }))
+// Helper: Strip scores from keyword hits
+function toNoteContext({ document }: KeywordHit): NoteContext {
+  return {
+    title: document.title,
+    summary: document.summary,
+    path: document.path,
+  }
 }
 
 /** Get displayable title from a note, with fallbacks */
@@ -136,6 +98,9 @@ const SEMANTIC_WEIGHT = 0.6
 // Minimum hybrid score to include in results (filters out very low-relevance matches)
 const MIN_HYBRID_SCORE = 0.15
 
+// Candidates taken from each side before merging
+const HYBRID_CANDIDATES = 50
+
 export interface HybridSearchResult extends NoteContext {
   keywordScore: number
   semanticScore: number
@@ -145,75 +110,50 @@ export interface HybridSearchResult extends NoteContext {
 /**
  * Performs hybrid search combining keyword and semantic search.
  *
- * - Keyword search: exact matches in title, summary, tags
+ * - Keyword search: BM25 over title, tags, summary and body (inverted index)
  * - Semantic search: conceptual similarity via embeddings
  * - Final score: 40% keyword + 60% semantic
  *
  * @param query - Search query text
- * @param notes - All notes from database
+ * @param index - Keyword index over all notes
  * @param options - Search options (limit, type filter)
  * @returns Hybrid-scored search results
  */
 export async function hybridSearch(
   query: string,
-  notes: RawNote[],
+  index: KeywordIndex,
   options: { limit?: number; type?: string } = {},
 ): Promise<NoteContext[]> {
   const { limit = 5, type } = options
   const maxLimit = Math.min(limit, 10)
   const keywords = extractKeywords(query)
 
-  // Filter by type if specified
-  const filteredNotes = type
-    ? notes.filter(n => n.type === type)
-    : notes
-
-  // Run keyword and semantic search in parallel
+  // Run keyword and semantic search in parallel (type filter applied before scoring)
   const [keywordResults, semanticResults] = await Promise.all([
     // Keyword search (synchronous, wrap in promise for parallel execution)
-    Promise.resolve(
-      filteredNotes
-        .map(note => ({
-          slug: note.stem ?? '',
-          title: note.title ?? note.stem ?? 'Untitled',
-          summary: note.summary ?? null,
-          path: note.path ?? `/${note.stem}`,
-          score: scoreNote(note, keywords),
-        }))
-        .filter(item => item.score > 0),
-    ),
-    // Semantic search
-    semanticSearch(query, 50),
+    Promise.resolve(searchKeywordIndex(index, keywords, { limit: HYBRID_CANDIDATES, type })),
+    semanticSearch(query, HYBRID_CANDIDATES, type),
   ])
 
   // Normalize keyword scores to 0-1 range
   const maxKeywordScore = Math.max(...keywordResults.map(r => r.score), 1)
-  const normalizedKeyword = keywordResults.map(r => ({
-    ...r,
-    score: r.score / maxKeywordScore,
-  }))
 
   // Build result map for merging
   const resultMap = new Map<string, HybridSearchResult>()
 
   // Add keyword results
-  for (const kr of normalizedKeyword) {
-    resultMap.set(kr.slug, {
-      title: kr.title,
-      summary: kr.summary,
-      path: kr.path,
-      keywordScore: kr.score,
+  for (const kr of keywordResults) {
+    const keywordScore = kr.score / maxKeywordScore
+    resultMap.set(kr.document.slug, {
+      ...toNoteContext(kr),
+      keywordScore,
       semanticScore: 0,
-      hybridScore: kr.score * KEYWORD_WEIGHT,
+      hybridScore: keywordScore * KEYWORD_WEIGHT,
     })
   }
 
-  // Merge semantic results (filter by type if needed)
-  const filteredSemantic = type
-    ? semanticResults.filter(sr => sr.type === type)
-    : semanticResults
-
-  for (const sr of filteredSemantic) {
+  // Merge semantic results
+  for (const sr of semanticResults) {
     const existing = resultMap.get(sr.slug)
     if (existing) {
       existing.semanticScore = sr.score
@@ -221,12 +161,12 @@ export async function hybridSearch(
       continue
     }
 
-    // Semantic-only result: find the note to get summary
-    const note = filteredNotes.find(n => n.stem === sr.slug)
+    // Semantic-only result: look up the note to get summary
+    const document = getKeywordDocument(index, sr.slug)
     resultMap.set(sr.slug, {
       title: sr.title,
-      summary: note?.summary ?? null,
-      path: `/${sr.slug}`,
+      summary: document?.summary ?? null,
+      path: document?.path ?? `/${sr.slug}`,
       keywordScore: 0,
       semanticScore: sr.score,
       hybridScore: sr.score * SEMANTIC_WEIGHT,
@@ -250,19 +190,15 @@ export async function hybridSearch(
 
 /**
  * Keyword-only search (for mode='keyword').
- * Wrapper around filterAndScoreNotes with consistent interface.
+ * BM25 with prefix matching over the keyword index.
  */
 export function keywordSearch(
   query: string,
-  notes: RawNote[],
+  index: KeywordIndex,
   options: { limit?: number; type?: string } = {},
 ): NoteContext[] {
   const { limit = 5, type } = options
   const keywords = extractKeywords(query)
 
-  const filteredNotes = type
-    ? notes.filter(n => n.type === type)
-    : notes
-
-  return filterAndScoreNotes(filteredNotes, keywords, limit)
+  return searchKeywordIndex(index, keywords, { limit: Math.min(limit, 10), type }).map(toNoteContext)
 }
@@ -8,36 +8,16 @@
 import { readFile } from 'node:fs/promises'
 import { join } from 'node:path'
 import type { FeatureExtractionPipeline } from '@huggingface/transformers'
-import { z } from 'zod'
 import { tryCatchAsync } from '../../../shared/utils/tryCatch'
-
-/**
- * Zod schema for runtime validation of embeddings.json.
- */
-const EmbeddingEntrySchema = z.object({
-  vector: z.array(z.number()),
-  title: z.string(),
-  type: z.string(),
-})
-
-const EmbeddingsDataSchema = z.object({
-  version: z.string(),
-  model: z.string(),
-  embeddings: z.record(z.string(), EmbeddingEntrySchema),
-})
-
-// Types matching the client-side embeddings structure
-export interface EmbeddingEntry {
-  vector: number[]
-  title: string
-  type: string
-}
-
-export interface EmbeddingsData {
-  version: string
-  model: string
-  embeddings: Record<string, EmbeddingEntry>
-}
+import {
+  EmbeddingsJsonSchema,
+  decodeEmbeddingsBinary,
+  embeddingsFromJson,
+  getRowVector,
+  type EmbeddingsMatrix,
+} from '../../../shared/utils/embeddingsBinary'
+import { createVectorIndex, searchVectors, type VectorIndex, type VectorHit } from '../../../shared/utils/vectorSearch'
+import { traceSpan, traceSpanAsync } from '../tracing'
 
 export interface SemanticSearchResult {
   slug: string
@@ -47,7 +27,8 @@ export interface SemanticSearchResult {
 }
 
 // Module-level cache (singleton pattern)
-let embeddingsCache: EmbeddingsData | null = null
+let embeddingsCache: EmbeddingsMatrix | null = null
+let vectorIndexCache: VectorIndex | null = null
 let modelCache: FeatureExtractionPipeline | null = null
 let modelLoadingPromise: Promise<FeatureExtractionPipeline | null> | null = null
 
@@ -57,61 +38,97 @@ let modelLoadingPromise: Promise<FeatureExtractionPipeline | null> | null = null
  */
 export function clearServerSemanticSearchCache(): void {
   embeddingsCache = null
+  vectorIndexCache = null
   modelCache = null
   modelLoadingPromise = null
 }
 
+function getPublicDir(): string {
+  // In development, read from public directory
+  // In production, the file is in .output/public
+  return process.env.NODE_ENV === 'production'
+    ? join(process.cwd(), '.output', 'public')
+    : join(process.cwd(), 'public')
+}
+
 /**
- * Computes dot product between two pre-normalized vectors.
- * For normalized vectors, this is equivalent to cosine similarity.
+ * Reads public/embeddings.bin. The typed arrays are views over the
+ * file buffer, so there is no per-element parsing or copying.
  */
-function dotProduct(a: number[], b: number[]): number {
-  if (a.length !== b.length) {
-    throw new Error(`Vector length mismatch: ${a.length} vs ${b.length}`)
-  }
+async function readEmbeddingsBinary(): Promise<EmbeddingsMatrix> {
+  const buffer = await readFile(join(getPublicDir(), 'embeddings.bin'))
+  return decodeEmbeddingsBinary(buffer.buffer, buffer.byteOffset, buffer.byteLength)
+}
 
-  let sum = 0
-  for (let i = 0; i < a.length; i++) {
-    const aVal = a[i]
-    const bVal = b[i]
-    if (aVal !== undefined && bVal !== undefined) {
-      sum += aVal * bVal
-    }
-  }
-  return sum
+/**
+ * Reads the legacy public/embeddings.json format.
+ */
+async function readEmbeddingsJson(): Promise<EmbeddingsMatrix> {
+  const content = await readFile(join(getPublicDir(), 'embeddings.json'), 'utf-8')
+  const data: unknown = JSON.parse(content)
+  return embeddingsFromJson(EmbeddingsJsonSchema.parse(data))
 }
 
 /**
- * Loads embeddings from public/embeddings.json.
+ * Loads embeddings, preferring the binary artifact and falling back to JSON.
  * Uses caching to avoid repeated file reads.
  */
-export async function loadEmbeddings(): Promise<EmbeddingsData | null> {
+export async function loadEmbeddings(): Promise<EmbeddingsMatrix | null> {
   if (embeddingsCache) {
     return embeddingsCache
   }
 
-  const [readError, data] = await tryCatchAsync(async () => {
-    // In development, read from public directory
-    // In production, the file is in .output/public
-    const publicDir = process.env.NODE_ENV === 'production'
-      ? join(process.cwd(), '.output', 'public')
-      : join(process.cwd(), 'public')
-
-    const filePath = join(publicDir, 'embeddings.json')
-    const content = await readFile(filePath, 'utf-8')
-    const data: unknown = JSON.parse(content)
-    return EmbeddingsDataSchema.parse(data)
-  })
+  return traceSpanAsync('embeddings.load', readEmbeddings)
+}
+
+// Cache miss: read the artifact from disk, once per process
+async function readEmbeddings(): Promise<EmbeddingsMatrix | null> {
+  const [binaryError, binary] = await tryCatchAsync(readEmbeddingsBinary)
+  if (!binaryError) {
+    embeddingsCache = binary
+    return embeddingsCache
+  }
 
-  if (readError) {
-    console.error('[semanticSearch] Failed to load embeddings:', readError)
+  const [jsonError, json] = await tryCatchAsync(readEmbeddingsJson)
+  if (jsonError) {
+    console.error('[semanticSearch] Failed to load embeddings:', binaryError, jsonError)
     return null
   }
 
-  embeddingsCache = data
+  embeddingsCache = json
   return embeddingsCache
 }
 
+/**
+ * Loads the search index over the embeddings matrix (rows grouped by
+ * type, optional IVF index for large vaults). Built once per process.
+ */
+export async function loadVectorIndex(): Promise<VectorIndex | null> {
+  if (vectorIndexCache) {
+    return vectorIndexCache
+  }
+
+  const embeddings = await loadEmbeddings()
+  if (!embeddings) {
+    return null
+  }
+
+  vectorIndexCache = traceSpan('index.vector.build', () => createVectorIndex(embeddings))
+  return vectorIndexCache
+}
+
+function toSearchResults(index: VectorIndex, hits: VectorHit[]): SemanticSearchResult[] {
+  return hits.map(({ row, score }) => {
+    const entry = index.matrix.manifest.entries[row]
+    return {
+      slug: entry?.slug ?? '',
+      title: entry?.title ?? '',
+      type: entry?.type ?? 'note',
+      score,
+    }
+  })
+}
+
 /**
  * Lazily loads the ML model for generating query embeddings.
  * Uses a loading promise to prevent duplicate model loads.
@@ -127,11 +144,11 @@ export async function loadModel(): Promise<FeatureExtractionPipeline | null> {
   }
 
   modelLoadingPromise = (async () => {
-    const [loadError, model] = await tryCatchAsync(async () => {
+    const [loadError, model] = await tryCatchAsync(() => traceSpanAsync('model.load', async () => {
       // Lazy-load Transformers.js only when needed
       const { pipeline } = await import('@huggingface/transformers')
       return pipeline('feature-extraction', 'Xenova/bge-small-en-v1.5')
-    })
+    }))
 
     if (loadError) {
       console.error('[semanticSearch] Failed to load model:', loadError)
@@ -155,9 +172,9 @@ export async function computeQueryEmbedding(query: string): Promise<number[] | n
     return null
   }
 
-  const [error, output] = await tryCatchAsync(async () => {
-    return model(query, { pooling: 'mean', normalize: true })
-  })
+  const [error, output] = await tryCatchAsync(() =>
+    traceSpanAsync('embeddings.query', () => model(query, { pooling: 'mean', normalize: true })),
+  )
 
   if (error) {
     console.error('[semanticSearch] Failed to compute query embedding:', error)
@@ -172,42 +189,30 @@ export async function computeQueryEmbedding(query: string): Promise<number[] | n
  *
  * @param query - Search query text
  * @param topN - Number of results to return (default 20)
+ * @param type - Only score notes of this content type
  * @returns Ranked search results with similarity scores
  */
 export async function semanticSearch(
   query: string,
   topN: number = 20,
+  type?: string,
 ): Promise<SemanticSearchResult[]> {
   if (!query.trim()) {
     return []
   }
 
-  // Load embeddings and compute query embedding
-  const [embeddings, queryVector] = await Promise.all([
-    loadEmbeddings(),
+  // Load the index and compute query embedding
+  const [index, queryVector] = await Promise.all([
+    loadVectorIndex(),
     computeQueryEmbedding(query),
   ])
 
-  if (!embeddings || !queryVector) {
+  if (!index || !queryVector) {
     return []
   }
 
-  // Compute similarity against all embeddings
-  const results: SemanticSearchResult[] = []
-
-  for (const [slug, entry] of Object.entries(embeddings.embeddings)) {
-    const score = dotProduct(queryVector, entry.vector)
-    results.push({
-      slug,
-      title: entry.title,
-      type: entry.type,
-      score,
-    })
-  }
-
-  // Sort by similarity score descending and return top N
-  results.sort((a, b) => b.score - a.score)
-  return results.slice(0, topN)
+  const hits = traceSpan('vector.search', () => searchVectors(index, queryVector, { topK: topN, type }))
+  return toSearchResults(index, hits)
 }
 
 /**
@@ -222,33 +227,16 @@ export async function findSimilarNotes(
   slug: string,
   topN: number = 5,
 ): Promise<SemanticSearchResult[]> {
-  const embeddings = await loadEmbeddings()
-  if (!embeddings) {
+  const index = await loadVectorIndex()
+  if (!index) {
     return []
   }
 
-  const sourceEntry = embeddings.embeddings[slug]
-  if (!sourceEntry) {
+  const sourceRow = index.rowBySlug.get(slug)
+  if (sourceRow === undefined) {
     return []
   }
 
-  const results: SemanticSearchResult[] = []
-
-  for (const [otherSlug, entry] of Object.entries(embeddings.embeddings)) {
-    // Skip the source note itself
-    if (otherSlug === slug) {
-      continue
-    }
-
-    const score = dotProduct(sourceEntry.vector, entry.vector)
-    results.push({
-      slug: otherSlug,
-      title: entry.title,
-      type: entry.type,
-      score,
-    })
-  }
-
-  results.sort((a, b) => b.score - a.score)
-  return results.slice(0, topN)
+  const sourceVector = getRowVector(index.matrix, sourceRow)
+  return toSearchResults(index, searchVectors(index, sourceVector, { topK: topN, excludeRow: sourceRow }))
 }
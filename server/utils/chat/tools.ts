@@ -55,10 +55,15 @@ export interface FetchSourceInput {
 }
 
 // Type guards for tool inputs
+function isOptionalPositiveInteger(value: unknown): boolean {
+  return value === undefined || (typeof value === 'number' && Number.isInteger(value) && value > 0)
+}
+
 export function isSearchNotesInput(input: unknown): input is SearchNotesInput {
   if (typeof input !== 'object' || input === null) return false
-  if (!('query' in input)) return false
-  return typeof input.query === 'string'
+  if (!('query' in input) || typeof input.query !== 'string') return false
+  // limit sizes the search result heaps, so it is checked before dispatch
+  return !('limit' in input) || isOptionalPositiveInteger(input.limit)
 }
 
 export function isGetNoteContentInput(input: unknown): input is GetNoteContentInput {
@@ -0,0 +1,46 @@
+/**
+ * Build-time layout for /api/graph.
+ *
+ * While prerendering, the full graph is settled once with the same forces
+ * the graph page uses (freeform, connection-based radii), centered on the
+ * origin. The page translates the positions into its viewport and paints
+ * them immediately instead of running the simulation from scratch.
+ */
+
+import { createConnectionRadiusScale, LARGE_GRAPH_CONFIG, LARGE_GRAPH_MIN_NODES, type ForceNode } from '../../shared/utils/graphForces'
+import { createLayoutSimulation, settleSimulation } from '../../shared/utils/graphLayout'
+import type { GraphData, GraphNode } from './graph'
+
+export type PositionedGraphNode = GraphNode & { x: number, y: number }
+
+// One decimal is plenty for pixels and keeps the JSON small
+function roundCoordinate(value = 0): number {
+  return Math.round(value * 10) / 10
+}
+
+/**
+ * Return the graph with settled x/y coordinates on every node.
+ */
+export function withSettledPositions(data: GraphData, maxTicks = 300): GraphData & { nodes: PositionedGraphNode[] } {
+  const layoutNodes: Array<GraphNode & ForceNode> = data.nodes.map(node => ({ ...node }))
+  const layoutEdges = data.edges.map(edge => ({ ...edge }))
+  const radius = createConnectionRadiusScale(Math.max(1, ...data.nodes.map(node => node.connections)))
+
+  const simulation = createLayoutSimulation(layoutNodes, layoutEdges, {
+    mode: 'freeform',
+    width: 0,
+    height: 0,
+    radii: data.nodes.map(node => radius(node.connections)),
+    config: data.nodes.length >= LARGE_GRAPH_MIN_NODES ? LARGE_GRAPH_CONFIG : {},
+  })
+  settleSimulation(simulation, maxTicks)
+
+  return {
+    nodes: data.nodes.map((node, i) => ({
+      ...node,
+      x: roundCoordinate(layoutNodes[i]?.x),
+      y: roundCoordinate(layoutNodes[i]?.y),
+    })),
+    edges: data.edges,
+  }
+}
@@ -0,0 +1,85 @@
+/**
+ * Log-bucketed latency histogram for the tracing layer.
+ *
+ * Bucket bounds grow by 2^(1/8) (about 9%) from 10µs, so percentiles are
+ * accurate to within one bucket while each histogram stays a fixed-size
+ * array, however many samples it records.
+ */
+
+export interface LatencyHistogram {
+  buckets: Uint32Array
+  count: number
+  sum: number
+  max: number
+}
+
+export interface LatencySummary {
+  count: number
+  mean: number
+  p50: number
+  p95: number
+  p99: number
+  max: number
+}
+
+// Smallest bucket bound in milliseconds
+const MIN_MS = 0.01
+const STEPS_PER_DOUBLING = 8
+// 23 doublings above 10µs reach ~84s, slower samples share the last bucket
+const BUCKET_COUNT = 23 * STEPS_PER_DOUBLING + 1
+
+export function createLatencyHistogram(): LatencyHistogram {
+  return { buckets: new Uint32Array(BUCKET_COUNT), count: 0, sum: 0, max: 0 }
+}
+
+/**
+ * Bucket holding a duration: bucket i covers (bound(i - 1), bound(i)].
+ */
+export function bucketIndex(ms: number): number {
+  if (!(ms > MIN_MS)) return 0
+  return Math.min(BUCKET_COUNT - 1, Math.ceil(Math.log2(ms / MIN_MS) * STEPS_PER_DOUBLING))
+}
+
+export function bucketUpperBound(index: number): number {
+  return MIN_MS * 2 ** (index / STEPS_PER_DOUBLING)
+}
+
+export function recordLatency(histogram: LatencyHistogram, ms: number): void {
+  const index = bucketIndex(ms)
+  histogram.buckets[index] = (histogram.buckets[index] ?? 0) + 1
+  histogram.count++
+  histogram.sum += Math.max(0, ms)
+  histogram.max = Math.max(histogram.max, ms)
+}
+
+/**
+ * Approximate percentile (0-1): the upper bound of the bucket holding the
+ * sample at that rank, capped at the largest recorded value.
+ */
+export function latencyPercentile(histogram: LatencyHistogram, percentile: number): number {
+  if (histogram.count === 0) return 0
+
+  const rank = Math.max(1, Math.ceil(percentile * histogram.count))
+  let seen = 0
+  for (const [index, count] of histogram.buckets.entries()) {
+    seen += count
+    if (seen >= rank) return Math.min(bucketUpperBound(index), histogram.max)
+  }
+  return histogram.max
+}
+
+// Sub-microsecond digits are noise at this resolution
+function round(ms: number): number {
+  return Math.round(ms * 1000) / 1000
+}
+
+export function summarizeLatency(histogram: LatencyHistogram): LatencySummary {
+  return {
+    count: histogram.count,
+    mean: round(histogram.count > 0 ? histogram.sum / histogram.count : 0),
+    p50: round(latencyPercentile(histogram, 0.5)),
+    p95: round(latencyPercentile(histogram, 0.95)),
+    p99: round(latencyPercentile(histogram, 0.99)),
+    max: round(histogram.max),
+  }
+}
@@ -0,0 +1,231 @@
+/**
+ * Pure functions for maintaining a shared link-graph index.
+ *
+ * The index holds node metadata plus outgoing and incoming adjacency, so the
+ * graph, backlinks, note-graph and mentions routes can answer from it without
+ * re-walking every minimark body. Documents are patched in place via
+ * upsertDocument/removeDocument instead of rebuilding the whole index.
+ */
+
+import { extractLinksFromBody } from './minimark'
+import { getSlug, type ContentItem, type GraphData, type GraphEdge, type GraphNode } from './graph'
+import type { BacklinksIndex } from './backlinks'
+import type { ContentMeta } from './mentions'
+
+export interface LinkIndexNode {
+  id: string
+  title: string
+  type: string
+  tags: string[]
+  authors: string[]
+  summary?: string
+  isMap: boolean
+}
+
+export interface LinkIndex {
+  nodes: Map<string, LinkIndexNode>
+  // source slug → unique target slugs (self-links excluded, dangling targets kept)
+  outgoing: Map<string, Set<string>>
+  // target slug → slugs of existing notes linking to it
+  incoming: Map<string, Set<string>>
+}
+
+/**
+ * Create an empty link index
+ */
+export function createEmptyLinkIndex(): LinkIndex {
+  return {
+    nodes: new Map(),
+    outgoing: new Map(),
+    incoming: new Map(),
+  }
+}
+
+/**
+ * Create index node metadata from a content item
+ */
+export function createLinkIndexNode(item: ContentItem): LinkIndexNode {
+  const slug = getSlug(item)
+  return {
+    id: slug,
+    title: item.title || slug,
+    type: item.type || 'note',
+    tags: Array.isArray(item.tags) ? item.tags : [],
+    authors: Array.isArray(item.authors) ? item.authors : [],
+    summary: item.summary,
+    isMap: item.type === 'map',
+  }
+}
+
+// Helper: Drop all outgoing edges of a source from the incoming adjacency
+function detachOutgoing(index: LinkIndex, sourceSlug: string): void {
+  for (const targetSlug of index.outgoing.get(sourceSlug) || []) {
+    const sources = index.incoming.get(targetSlug)
+    if (!sources) continue
+    sources.delete(sourceSlug)
+    if (sources.size === 0) index.incoming.delete(targetSlug)
+  }
+  index.outgoing.delete(sourceSlug)
+}
+
+/**
+ * Insert or replace a single document (mutates index).
+ * Only the adjacency of this document is touched.
+ */
+export function upsertDocument(index: LinkIndex, item: ContentItem): void {
+  const sourceSlug = getSlug(item)
+  detachOutgoing(index, sourceSlug)
+
+  const links = new Set(extractLinksFromBody(item.body))
+  links.delete(sourceSlug)
+
+  index.nodes.set(sourceSlug, createLinkIndexNode(item))
+  index.outgoing.set(sourceSlug, links)
+
+  for (const targetSlug of links) {
+    const sources = index.incoming.get(targetSlug) || new Set<string>()
+    sources.add(sourceSlug)
+    index.incoming.set(targetSlug, sources)
+  }
+}
+
+/**
+ * Remove a document and its outgoing edges (mutates index).
+ * Links pointing at the removed slug stay, they are dangling like any other.
+ */
+export function removeDocument(index: LinkIndex, slug: string): void {
+  detachOutgoing(index, slug)
+  index.nodes.delete(slug)
+}
+
+/**
+ * Build a complete link index from content items.
+ * This walks every body once; later changes should go through upsertDocument.
+ */
+export function buildLinkIndex(allContent: ContentItem[]): LinkIndex {
+  const index = createEmptyLinkIndex()
+  for (const item of allContent) {
+    upsertDocument(index, item)
+  }
+  return index
+}
+
+/**
+ * Outgoing links of a note that point at existing notes
+ */
+export function getOutgoingLinks(index: LinkIndex, slug: string): string[] {
+  const links: string[] = []
+  for (const targetSlug of index.outgoing.get(slug) || []) {
+    if (index.nodes.has(targetSlug)) links.push(targetSlug)
+  }
+  return links
+}
+
+/**
+ * Slugs of notes linking to the given slug
+ */
+export function getBacklinkSlugs(index: LinkIndex, slug: string): string[] {
+  return [...(index.incoming.get(slug) || [])]
+}
+
+/**
+ * Slugs of map notes linking to the given slug
+ */
+export function getMapSlugs(index: LinkIndex, slug: string): string[] {
+  return getBacklinkSlugs(index, slug).filter(source => index.nodes.get(source)?.isMap)
+}
+
+/**
+ * Number of graph edges touching a note (outgoing to existing notes + incoming)
+ */
+export function getConnectionCount(index: LinkIndex, slug: string): number {
+  return getOutgoingLinks(index, slug).length + (index.incoming.get(slug)?.size || 0)
+}
+
+/**
+ * Create a full graph node for a slug, with connections and map membership
+ */
+export function toGraphNode(index: LinkIndex, node: LinkIndexNode): GraphNode {
+  return {
+    id: node.id,
+    title: node.title,
+    type: node.type,
+    tags: node.tags,
+    authors: node.authors,
+    summary: node.summary,
+    connections: getConnectionCount(index, node.id),
+    maps: getMapSlugs(index, node.id),
+    isMap: node.isMap,
+  }
+}
+
+/**
+ * Produce the same shape as buildGraphFromContent from the index
+ */
+export function toGraphData(index: LinkIndex): GraphData {
+  const nodes: GraphNode[] = []
+  const edges: GraphEdge[] = []
+
+  for (const node of index.nodes.values()) {
+    nodes.push(toGraphNode(index, node))
+    for (const target of getOutgoingLinks(index, node.id)) {
+      edges.push({ source: node.id, target })
+    }
+  }
+
+  return { nodes, edges }
+}
+
+/**
+ * Produce the same shape as buildBacklinksIndex from the index
+ */
+export function toBacklinksIndex(index: LinkIndex): BacklinksIndex {
+  const backlinksIndex: BacklinksIndex = {}
+
+  for (const node of index.nodes.values()) {
+    for (const targetSlug of index.outgoing.get(node.id) || []) {
+      if (!backlinksIndex[targetSlug]) {
+        backlinksIndex[targetSlug] = []
+      }
+      backlinksIndex[targetSlug].push({ slug: node.id, title: node.title, type: node.type })
+    }
+  }
+
+  return backlinksIndex
+}
+
+/**
+ * Produce the same shape as buildContentMapWithLinks from the index
+ */
+export function toContentMetaMap(index: LinkIndex): Map<string, ContentMeta> {
+  const contentMap = new Map<string, ContentMeta>()
+  for (const node of index.nodes.values()) {
+    contentMap.set(node.id, {
+      title: node.title,
+      type: node.type,
+      linksTo: index.outgoing.get(node.id) || new Set(),
+    })
+  }
+  return contentMap
+}
+
+/**
+ * Compare per-document fingerprints from two content versions.
+ * Returns slugs that are new or changed, and slugs that disappeared.
+ */
+export function diffFingerprints(
+  previous: Map<string, string>,
+  next: Map<string, string>,
+): { changed: string[], removed: string[] } {
+  const changed: string[] = []
+  const removed: string[] = []
+
+  for (const [slug, fingerprint] of next) {
+    if (previous.get(slug) !== fingerprint) changed.push(slug)
+  }
+  for (const slug of previous.keys()) {
+    if (!next.has(slug)) removed.push(slug)
+  }
+
+  return { changed, removed }
+}
@@ -0,0 +1,135 @@
+/**
+ * Process-wide cache for the shared link index.
+ *
+ * In production the content database is immutable for the lifetime of the
+ * server, so the index is built once. In development, accesses probe a
+ * per-document fingerprint (hash of the raw markdown) at most once per
+ * FRESHNESS_TTL_MS, and only the documents whose fingerprint changed are
+ * re-fetched and patched in.
+ */
+
+import type { H3Event } from 'h3'
+import { queryCollection } from '@nuxt/content/server'
+import { getSlug } from './graph'
+import { hashString } from './text'
+import { traceSpan, traceSpanAsync } from './tracing'
+import {
+  buildLinkIndex,
+  diffFingerprints,
+  removeDocument,
+  upsertDocument,
+  type LinkIndex,
+} from './linkIndex'
+
+// Dev only: a freshness probe reads and hashes every note's raw markdown,
+// which costs more than serving the index on large vaults. Bursts of
+// requests (a page load hits graph, backlinks and mentions) share one probe;
+// edits show up at most this long after saving.
+const FRESHNESS_TTL_MS = 2000
+
+// Module-level cache (singleton pattern)
+let indexCache: LinkIndex | null = null
+let fingerprintCache = new Map<string, string>()
+let loadingPromise: Promise<LinkIndex> | null = null
+// When the index was last built or checked against the content
+let checkedAt = 0
+// Bumped whenever the index is rebuilt or patched, so derived caches can tell
+let contentVersion = 0
+
+/**
+ * Clears the link index cache.
+ * Useful for testing or when content needs to be re-indexed from scratch.
+ */
+export function clearLinkIndexCache(): void {
+  indexCache = null
+  fingerprintCache = new Map()
+  loadingPromise = null
+  checkedAt = 0
+  contentVersion++
+}
+
+/**
+ * Version of the content the link index currently reflects.
+ */
+export function getLinkIndexVersion(): number {
+  return contentVersion
+}
+
+async function fetchDocuments(event: H3Event, slugs?: string[]) {
+  const query = queryCollection(event, 'content')
+    .select('path', 'stem', 'title', 'type', 'tags', 'authors', 'summary', 'body')
+
+  return traceSpanAsync('content.query', () => slugs
+    ? query.where('path', 'IN', slugs.map(slug => `/${slug}`)).all()
+    : query.all())
+}
+
+async function fetchFingerprints(event: H3Event): Promise<Map<string, string>> {
+  const rows = await traceSpanAsync('content.query', () => queryCollection(event, 'content')
+    .select('path', 'stem', 'rawbody')
+    .all())
+
+  return new Map(rows.map(row => [
+    getSlug(row),
+    hashString(typeof row.rawbody === 'string' ? row.rawbody : ''),
+  ]))
+}
+
+async function patchLinkIndex(event: H3Event, index: LinkIndex): Promise<LinkIndex> {
+  const fingerprints = await fetchFingerprints(event)
+  const { changed, removed } = diffFingerprints(fingerprintCache, fingerprints)
+
+  for (const slug of removed) {
+    removeDocument(index, slug)
+  }
+
+  if (changed.length > 0) {
+    for (const item of await fetchDocuments(event, changed)) {
+      upsertDocument(index, item)
+    }
+  }
+
+  if (changed.length > 0 || removed.length > 0) {
+    contentVersion++
+  }
+
+  fingerprintCache = fingerprints
+  checkedAt = Date.now()
+  return index
+}
+
+async function loadLinkIndex(event: H3Event): Promise<LinkIndex> {
+  if (indexCache) {
+    const index = indexCache
+    return traceSpanAsync('index.link.patch', () => patchLinkIndex(event, index))
+  }
+
+  // Fingerprints first: an edit landing in between is picked up on the next access
+  if (import.meta.dev) {
+    fingerprintCache = await fetchFingerprints(event)
+  }
+
+  const documents = await fetchDocuments(event)
+  indexCache = traceSpan('index.link.build', () => buildLinkIndex(documents))
+  checkedAt = Date.now()
+  contentVersion++
+  return indexCache
+}
+
+/**
+ * Get the shared link index for the current content version.
+ * Concurrent callers share a single build or patch.
+ */
+export async function getLinkIndex(event: H3Event): Promise<LinkIndex> {
+  if (indexCache && (!import.meta.dev || Date.now() - checkedAt < FRESHNESS_TTL_MS)) {
+    return indexCache
+  }
+
+  if (!loadingPromise) {
+    loadingPromise = loadLinkIndex(event).finally(() => {
+      loadingPromise = null
+    })
+  }
+
+  return loadingPromise
+}
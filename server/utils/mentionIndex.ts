@@ -0,0 +1,264 @@
+/**
+ * Vault-wide unlinked-mention detection.
+ *
+ * All note titles (and aliases) are compiled into one Aho-Corasick automaton
+ * over word tokens, so a single pass over the search sections finds every
+ * mention of every note, instead of one regex scan of the corpus per note.
+ * Matching on whole tokens gives the same word-boundary behaviour as the
+ * previous `\b title \b` regex, case-insensitively.
+ */
+
+import { getSnippet, highlightMatch } from './text'
+import { extractSlugFromSectionId, type ContentMeta, type MentionItem, type SearchSection } from './mentions'
+
+// Titles with fewer word characters than this produce too many false positives
+export const MIN_MENTION_TITLE_LENGTH = 3
+
+export interface MentionPattern {
+  slug: string
+  text: string
+}
+
+export interface Token {
+  value: string
+  start: number
+  end: number
+}
+
+export interface MentionAutomaton {
+  // Token text → token id (only tokens that occur in some pattern)
+  vocabulary: Map<string, number>
+  // Per state: token id → next state (state 0 is the root)
+  transitions: Map<number, number>[]
+  fail: Int32Array
+  // Pattern ids recognized at each state, including via failure links
+  outputs: number[][]
+  patterns: Array<{ slug: string, tokenCount: number }>
+}
+
+export interface AutomatonMatch {
+  pattern: number
+  startToken: number
+  endToken: number
+}
+
+// Slug → unlinked mentions of that note, in section order
+export type MentionsIndex = Map<string, MentionItem[]>
+
+export interface LinkSuggestion {
+  source: string
+  sourceTitle: string
+  target: string
+  targetTitle: string
+  snippet: string
+}
+
+/**
+ * Split text into lowercase word tokens with their character offsets.
+ */
+export function tokenizeWithOffsets(text: string): Token[] {
+  const tokens: Token[] = []
+  for (const match of text.matchAll(/[\p{L}\p{N}_]+/gu)) {
+    tokens.push({ value: match[0].toLowerCase(), start: match.index, end: match.index + match[0].length })
+  }
+  return tokens
+}
+
+// Helper: State reached from the failure chain of `state` on `tokenId`
+function followFailure(transitions: Map<number, number>[], fail: Int32Array, state: number, tokenId: number): number {
+  let fallback = fail[state] ?? 0
+  while (fallback !== 0 && !transitions[fallback]?.has(tokenId)) {
+    fallback = fail[fallback] ?? 0
+  }
+  return transitions[fallback]?.get(tokenId) ?? 0
+}
+
+// Helper: Breadth-first failure links, merging outputs along them
+function linkFailures(transitions: Map<number, number>[], outputs: number[][]): Int32Array {
+  const fail = new Int32Array(transitions.length)
+  const queue = [...(transitions[0]?.values() ?? [])]
+
+  for (let head = 0; head < queue.length; head++) {
+    const state = queue[head] ?? 0
+    for (const [tokenId, next] of transitions[state] ?? []) {
+      const target = followFailure(transitions, fail, state, tokenId)
+      fail[next] = target === next ? 0 : target
+      outputs[next]?.push(...(outputs[fail[next] ?? 0] ?? []))
+      queue.push(next)
+    }
+  }
+
+  return fail
+}
+
+/**
+ * Compile patterns into a token-level Aho-Corasick automaton.
+ * Patterns without any word token are ignored.
+ */
+export function buildMentionAutomaton(patterns: MentionPattern[]): MentionAutomaton {
+  const vocabulary = new Map<string, number>()
+  const transitions: Map<number, number>[] = [new Map()]
+  const outputs: number[][] = [[]]
+  const compiled: MentionAutomaton['patterns'] = []
+
+  for (const { slug, text } of patterns) {
+    const tokens = tokenizeWithOffsets(text)
+    if (tokens.length === 0) continue
+
+    let state = 0
+    for (const { value } of tokens) {
+      const tokenId = vocabulary.get(value) ?? vocabulary.size
+      vocabulary.set(value, tokenId)
+
+      let next = transitions[state]?.get(tokenId)
+      if (next === undefined) {
+        next = transitions.length
+        transitions.push(new Map())
+        outputs.push([])
+        transitions[state]?.set(tokenId, next)
+      }
+      state = next
+    }
+
+    outputs[state]?.push(compiled.length)
+    compiled.push({ slug, tokenCount: tokens.length })
+  }
+
+  return { vocabulary, transitions, fail: linkFailures(transitions, outputs), outputs, patterns: compiled }
+}
+
+/**
+ * Run the automaton over a token stream and report every pattern occurrence.
+ */
+export function scanTokens(automaton: MentionAutomaton, tokens: Token[]): AutomatonMatch[] {
+  const { vocabulary, transitions, fail, outputs, patterns } = automaton
+  const matches: AutomatonMatch[] = []
+  let state = 0
+
+  tokens.forEach(({ value }, position) => {
+    const tokenId = vocabulary.get(value)
+    if (tokenId === undefined) {
+      state = 0
+      return
+    }
+
+    while (state !== 0 && !transitions[state]?.has(tokenId)) {
+      state = fail[state] ?? 0
+    }
+    state = transitions[state]?.get(tokenId) ?? 0
+
+    for (const pattern of outputs[state] ?? []) {
+      const tokenCount = patterns[pattern]?.tokenCount ?? 1
+      matches.push({ pattern, startToken: position - tokenCount + 1, endToken: position })
+    }
+  })
+
+  return matches
+}
+
+// Helper: Word characters the automaton actually matches on ("C++" → 1)
+function matchedLength(text: string): number {
+  return tokenizeWithOffsets(text).reduce((length, token) => length + token.value.length, 0)
+}
+
+/**
+ * Collect title (and alias) patterns for every note in the content map.
+ * Length is measured on the tokens, so punctuation-heavy titles like "C++"
+ * or "R&D" do not turn into one-letter patterns.
+ */
+export function collectMentionPatterns(
+  contentMap: Map<string, ContentMeta>,
+  aliases: Map<string, string[]> = new Map(),
+): MentionPattern[] {
+  const patterns: MentionPattern[] = []
+  for (const [slug, { title }] of contentMap) {
+    for (const text of [title, ...(aliases.get(slug) ?? [])]) {
+      if (matchedLength(text) >= MIN_MENTION_TITLE_LENGTH) {
+        patterns.push({ slug, text })
+      }
+    }
+  }
+  return patterns
+}
+
+// Helper: Mention item for the matched span of a section
+function toMentionItem(source: string, meta: ContentMeta, content: string, tokens: Token[], match: AutomatonMatch): MentionItem {
+  const matchedText = content.slice(tokens[match.startToken]?.start, tokens[match.endToken]?.end)
+  const snippet = getSnippet(content, matchedText)
+  return {
+    slug: source,
+    title: meta.title,
+    type: meta.type,
+    snippet,
+    highlightedSnippet: highlightMatch(snippet, matchedText),
+  }
+}
+
+// Helper: Record the first mention of each target in one section
+function collectSectionMentions(
+  automaton: MentionAutomaton,
+  index: MentionsIndex,
+  seen: Set<string>,
+  source: { slug: string, meta: ContentMeta },
+  content: string,
+): void {
+  const tokens = tokenizeWithOffsets(content)
+
+  for (const match of scanTokens(automaton, tokens)) {
+    const target = automaton.patterns[match.pattern]?.slug ?? ''
+    const key = `${target}\n${source.slug}`
+    if (target === source.slug || source.meta.linksTo.has(target) || seen.has(key)) continue
+    seen.add(key)
+
+    const mentions = index.get(target) ?? []
+    mentions.push(toMentionItem(source.slug, source.meta, content, tokens, match))
+    index.set(target, mentions)
+  }
+}
+
+/**
+ * Find unlinked mentions for all patterns in one pass over the sections.
+ *
+ * Per target note, each source note contributes its first matching section.
+ * Self-mentions, sources that already link to the target and sections of
+ * unknown notes are skipped.
+ */
+export function buildMentionsIndex(
+  contentMap: Map<string, ContentMeta>,
+  sections: SearchSection[],
+  patterns: MentionPattern[] = collectMentionPatterns(contentMap),
+): MentionsIndex {
+  const automaton = buildMentionAutomaton(patterns)
+  const index: MentionsIndex = new Map()
+  const seen = new Set<string>()
+
+  for (const section of sections) {
+    const slug = extractSlugFromSectionId(section.id)
+    const meta = contentMap.get(slug)
+    if (!meta || !section.content) continue
+    collectSectionMentions(automaton, index, seen, { slug, meta }, section.content)
+  }
+
+  return index
+}
+
+/**
+ * Invert the mentions index into "link target from source" suggestions,
+ * sorted by source then target.
+ */
+export function toLinkSuggestions(index: MentionsIndex, contentMap: Map<string, ContentMeta>): LinkSuggestion[] {
+  const suggestions: LinkSuggestion[] = []
+  for (const [target, mentions] of index) {
+    const targetTitle = contentMap.get(target)?.title ?? target
+    for (const mention of mentions) {
+      suggestions.push({
+        source: mention.slug,
+        sourceTitle: mention.title,
+        target,
+        targetTitle,
+        snippet: mention.snippet,
+      })
+    }
+  }
+  return suggestions.sort((a, b) => a.source.localeCompare(b.source) || a.target.localeCompare(b.target))
+}
@@ -0,0 +1,87 @@
+/**
+ * Process-wide cache for the precomputed unlinked-mentions index.
+ *
+ * Built in one pass over the search sections from the shared link index, and
+ * rebuilt only when the link index reports a new content version (never in
+ * production, on edits in development).
+ */
+
+import type { H3Event } from 'h3'
+import { queryCollection, queryCollectionSearchSections } from '@nuxt/content/server'
+import { getSlug } from './graph'
+import { toContentMetaMap } from './linkIndex'
+import { getLinkIndex, getLinkIndexVersion } from './linkIndexStore'
+import { buildMentionsIndex, collectMentionPatterns, type MentionsIndex } from './mentionIndex'
+import type { ContentMeta, SearchSection } from './mentions'
+import { traceSpan, traceSpanAsync } from './tracing'
+
+export interface MentionsSnapshot {
+  mentions: MentionsIndex
+  contentMap: Map<string, ContentMeta>
+  // Kept for on-demand lookups of targets outside the content collection
+  sections: SearchSection[]
+}
+
+// Module-level cache (singleton pattern)
+let snapshotCache: MentionsSnapshot | null = null
+let versionCache = -1
+let loadingPromise: Promise<MentionsSnapshot> | null = null
+
+/**
+ * Clears the mentions index cache.
+ * Useful for testing or when content needs to be re-indexed from scratch.
+ */
+export function clearMentionsIndexCache(): void {
+  snapshotCache = null
+  versionCache = -1
+  loadingPromise = null
+}
+
+async function fetchAliases(event: H3Event): Promise<Map<string, string[]>> {
+  const rows = await traceSpanAsync('content.query', () => queryCollection(event, 'content')
+    .select('path', 'stem', 'aliases')
+    .all())
+
+  return new Map(rows.map(row => [getSlug(row), row.aliases ?? []]))
+}
+
+async function loadMentionsSnapshot(event: H3Event): Promise<MentionsSnapshot> {
+  const linkIndex = await getLinkIndex(event)
+  const version = getLinkIndexVersion()
+  if (snapshotCache && version === versionCache) {
+    return snapshotCache
+  }
+
+  const [sections, aliases] = await Promise.all([
+    traceSpanAsync('content.query', () => queryCollectionSearchSections(event, 'content')),
+    fetchAliases(event),
+  ])
+  const contentMap = toContentMetaMap(linkIndex)
+
+  snapshotCache = {
+    mentions: traceSpan('index.mentions.build', () =>
+      buildMentionsIndex(contentMap, sections, collectMentionPatterns(contentMap, aliases))),
+    contentMap,
+    sections,
+  }
+  versionCache = version
+  return snapshotCache
+}
+
+/**
+ * Get the mentions index for the current content version.
+ * Concurrent callers share a single build.
+ */
+export async function getMentionsSnapshot(event: H3Event): Promise<MentionsSnapshot> {
+  if (snapshotCache && !import.meta.dev) {
+    return snapshotCache
+  }
+
+  if (!loadingPromise) {
+    loadingPromise = loadMentionsSnapshot(event).finally(() => {
+      loadingPromise = null
+    })
+  }
+
+  return loadingPromise
+}
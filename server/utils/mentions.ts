@@ -138,7 +138,23 @@ export function findUnlinkedMentions(
     return []
   }
 
-  const contentMap = buildContentMapWithLinks(allContent)
+  return findUnlinkedMentionsInContentMap(buildContentMapWithLinks(allContent), searchSections, targetSlug, targetTitle)
+}
+
+/**
+ * Find unlinked mentions using a prebuilt content map
+ * (e.g. from the shared link index), skipping link extraction.
+ */
+export function findUnlinkedMentionsInContentMap(
+  contentMap: Map<string, ContentMeta>,
+  searchSections: SearchSection[],
+  targetSlug: string,
+  targetTitle: string,
+): MentionItem[] {
+  if (!targetSlug || !targetTitle || targetTitle.length < 3) {
+    return []
+  }
+
   const titleRegex = new RegExp(`\\b${escapeRegex(targetTitle)}\\b`, 'i')
   const mentionsByPath = buildMentionsMap(searchSections, targetSlug, contentMap, titleRegex)
 
@@ -0,0 +1,113 @@
+/**
+ * Pure functions for building the local (L1/L2) graph around a single note.
+ * Extracted from server/api/note-graph/[slug].get.ts for testability.
+ *
+ * All lookups go through the shared link index, so the cost is proportional
+ * to the degree of the center note and its neighbours, not the vault size.
+ */
+
+import { getBacklinkSlugs, getOutgoingLinks, type LinkIndex } from './linkIndex'
+
+export interface NoteGraphNode {
+  id: string
+  title: string
+  type: string
+  isCenter?: boolean
+  level?: 0 | 1 | 2 // 0=center, 1=direct connection, 2=second-degree
+}
+
+export interface NoteGraphEdge {
+  source: string
+  target: string
+  level?: 1 | 2 // 1=center↔L1, 2=L1↔L2
+}
+
+export interface NoteGraphData {
+  center: NoteGraphNode
+  connected: NoteGraphNode[]
+  edges: NoteGraphEdge[]
+}
+
+// Max L2 nodes to prevent clutter
+export const MAX_LEVEL2_NODES = 20
+
+// Helper: Create a graph node for an indexed slug
+function toNoteGraphNode(index: LinkIndex, slug: string, level: 1 | 2): NoteGraphNode {
+  const node = index.nodes.get(slug)
+  return { id: slug, title: node?.title || slug, type: node?.type || 'note', level }
+}
+
+/**
+ * Build L1 edges from outgoing links and backlinks of the center note
+ */
+export function buildL1Edges(centerSlug: string, outgoingLinks: string[], backlinks: string[]): NoteGraphEdge[] {
+  return [
+    ...outgoingLinks.map((target): NoteGraphEdge => ({ source: centerSlug, target, level: 1 })),
+    ...backlinks.map((source): NoteGraphEdge => ({ source, target: centerSlug, level: 1 })),
+  ]
+}
+
+/**
+ * Check if slug is a valid L2 candidate
+ */
+export function isValidL2Slug(slug: string, centerSlug: string, l1Slug: string, level1Set: Set<string>): boolean {
+  return slug !== centerSlug && slug !== l1Slug && !level1Set.has(slug)
+}
+
+/**
+ * Collect L2 connections from L1 nodes, capped at MAX_LEVEL2_NODES
+ */
+export function collectLevel2Edges(
+  index: LinkIndex,
+  level1Slugs: string[],
+  centerSlug: string,
+): { level2Slugs: Set<string>, level2Edges: NoteGraphEdge[] } {
+  const level1Set = new Set(level1Slugs)
+  const level2Slugs = new Set<string>()
+  const level2Edges: NoteGraphEdge[] = []
+
+  for (const l1Slug of level1Slugs) {
+    for (const target of getOutgoingLinks(index, l1Slug)) {
+      if (!isValidL2Slug(target, centerSlug, l1Slug, level1Set)) continue
+      level2Slugs.add(target)
+      level2Edges.push({ source: l1Slug, target, level: 2 })
+    }
+    for (const source of getBacklinkSlugs(index, l1Slug)) {
+      if (!isValidL2Slug(source, centerSlug, l1Slug, level1Set)) continue
+      level2Slugs.add(source)
+      level2Edges.push({ source, target: l1Slug, level: 2 })
+    }
+  }
+
+  // Limit L2 nodes and filter edges
+  const limitedL2Set = new Set([...level2Slugs].slice(0, MAX_LEVEL2_NODES))
+  const filteredEdges = level2Edges.filter(e => limitedL2Set.has(e.source) || limitedL2Set.has(e.target))
+
+  return { level2Slugs: limitedL2Set, level2Edges: filteredEdges }
+}
+
+/**
+ * Build the note graph for a center slug.
+ * Returns null when the slug is not in the index.
+ */
+export function buildNoteGraph(index: LinkIndex, centerSlug: string): NoteGraphData | null {
+  const centerNode = index.nodes.get(centerSlug)
+  if (!centerNode) return null
+
+  // L1: Direct connections
+  const outgoingLinks = getOutgoingLinks(index, centerSlug)
+  const backlinks = getBacklinkSlugs(index, centerSlug)
+  const level1Slugs = [...new Set([...outgoingLinks, ...backlinks])]
+  const level1Nodes = level1Slugs.map(slug => toNoteGraphNode(index, slug, 1))
+  const level1Edges = buildL1Edges(centerSlug, outgoingLinks, backlinks)
+
+  // L2: Second-degree connections
+  const { level2Slugs, level2Edges } = collectLevel2Edges(index, level1Slugs, centerSlug)
+  const level2Nodes = [...level2Slugs].map(slug => toNoteGraphNode(index, slug, 2))
+
+  return {
+    center: { id: centerSlug, title: centerNode.title, type: centerNode.type, isCenter: true, level: 0 },
+    connected: [...level1Nodes, ...level2Nodes],
+    edges: [...level1Edges, ...level2Edges],
+  }
+}
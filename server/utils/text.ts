@@ -60,3 +60,16 @@ export function highlightMatch(text: string, term: string): string {
     '<mark class="bg-[var(--ui-primary)]/20 text-[var(--ui-primary)] rounded px-0.5">$1</mark>',
   )
 }
+
+/**
+ * Fast, non-cryptographic 32-bit FNV-1a hash of a string, as hex.
+ * Used for change detection, never for security.
+ */
+export function hashString(text: string): string {
+  let hash = 0x811c9dc5
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i)
+    hash = Math.imul(hash, 0x01000193)
+  }
+  return (hash >>> 0).toString(16).padStart(8, '0')
+}
@@ -0,0 +1,212 @@
+/**
+ * Lightweight request tracing for Nitro handlers.
+ *
+ * Off by default; server/plugins/tracing.ts enables it from runtime config.
+ * A traced request keeps its spans in AsyncLocalStorage, so spans around
+ * content queries, index builds, embedding work and chat tools attach to
+ * the request that triggered them without threading the event through.
+ * Spans are summed per name into a Server-Timing header (and a `timing`
+ * SSE event for chat). With histograms on, every span also lands in an
+ * in-process latency histogram served by /api/timings.
+ *
+ * Disabled, a span is a boolean check and a direct call: no clock reads,
+ * no allocations, no async context.
+ */
+
+import { AsyncLocalStorage } from 'node:async_hooks'
+import {
+  defineEventHandler,
+  setResponseHeader,
+  type EventHandler,
+  type EventHandlerRequest,
+  type H3Event,
+} from 'h3'
+import { tryCatch } from '../../shared/utils/tryCatch'
+import {
+  createLatencyHistogram,
+  recordLatency,
+  summarizeLatency,
+  type LatencyHistogram,
+  type LatencySummary,
+} from './latencyHistogram'
+
+export interface TracingOptions {
+  enabled?: boolean
+  // Keep per-span-name latency histograms (implies enabled)
+  histogram?: boolean
+}
+
+export interface TraceSpan {
+  name: string
+  duration: number
+}
+
+export interface RequestTrace {
+  start: number
+  spans: TraceSpan[]
+}
+
+export interface SpanSummary {
+  name: string
+  // Summed over every span with this name, in milliseconds
+  duration: number
+  count: number
+}
+
+export interface TraceTimings {
+  totalMs: number
+  spans: SpanSummary[]
+}
+
+const traceStorage = new AsyncLocalStorage<RequestTrace>()
+const histograms = new Map<string, LatencyHistogram>()
+const state = { enabled: false, histogram: false }
+
+export function configureTracing(options: TracingOptions): void {
+  state.histogram = options.histogram ?? false
+  state.enabled = (options.enabled ?? false) || state.histogram
+}
+
+export function isTracingEnabled(): boolean {
+  return state.enabled
+}
+
+export function isHistogramEnabled(): boolean {
+  return state.histogram
+}
+
+/**
+ * Disable tracing and drop recorded histograms.
+ * Useful for testing.
+ */
+export function resetTracing(): void {
+  configureTracing({})
+  histograms.clear()
+}
+
+/**
+ * Start a trace for the current request, or null when tracing is off.
+ */
+export function startRequestTrace(): RequestTrace | null {
+  return state.enabled ? { start: performance.now(), spans: [] } : null
+}
+
+/**
+ * Run `fn` with `trace` as the active trace. Without a trace, `fn` runs as is.
+ */
+export function runWithTrace<T>(trace: RequestTrace | null, fn: () => T): T {
+  return trace ? traceStorage.run(trace, fn) : fn()
+}
+
+/**
+ * Record a finished span on the active trace and in its histogram.
+ */
+export function recordSpan(name: string, duration: number): void {
+  traceStorage.getStore()?.spans.push({ name, duration })
+  if (!state.histogram) return
+
+  let histogram = histograms.get(name)
+  if (!histogram) {
+    histogram = createLatencyHistogram()
+    histograms.set(name, histogram)
+  }
+  recordLatency(histogram, duration)
+}
+
+/**
+ * Time a synchronous step. Failed steps are recorded too.
+ *
+ * @example
+ * const index = traceSpan('index.link.build', () => buildLinkIndex(documents))
+ */
+export function traceSpan<T>(name: string, fn: () => T): T {
+  if (!state.enabled) return fn()
+
+  const start = performance.now()
+  const [error, result] = tryCatch(fn)
+  recordSpan(name, performance.now() - start)
+  if (error) throw error
+  return result
+}
+
+/**
+ * Time an async step, until its promise settles.
+ *
+ * @example
+ * const rows = await traceSpanAsync('content.query', () => query.all())
+ */
+export function traceSpanAsync<T>(name: string, fn: () => Promise<T>): Promise<T> {
+  if (!state.enabled) return fn()
+
+  const start = performance.now()
+  return fn().finally(() => recordSpan(name, performance.now() - start))
+}
+
+/**
+ * Sum spans per name, in first-seen order, rounded to 0.1ms.
+ */
+export function summarizeSpans(spans: TraceSpan[]): SpanSummary[] {
+  const byName = new Map<string, SpanSummary>()
+  for (const span of spans) {
+    const summary = byName.get(span.name) ?? { name: span.name, duration: 0, count: 0 }
+    summary.duration += span.duration
+    summary.count++
+    byName.set(span.name, summary)
+  }
+  return [...byName.values()].map(summary => ({ ...summary, duration: roundMs(summary.duration) }))
+}
+
+function roundMs(ms: number): number {
+  return Math.round(ms * 10) / 10
+}
+
+/**
+ * Timings of a trace so far: total elapsed time and per-name span sums.
+ */
+export function getTraceTimings(trace: RequestTrace): TraceTimings {
+  return {
+    totalMs: roundMs(performance.now() - trace.start),
+    spans: summarizeSpans(trace.spans),
+  }
+}
+
+/**
+ * Format timings as a Server-Timing header value.
+ *
+ * @example
+ * formatServerTiming({ totalMs: 12.5, spans: [{ name: 'content.query', duration: 4, count: 2 }] })
+ * // 'content.query;dur=4;desc="2x", total;dur=12.5'
+ */
+export function formatServerTiming(timings: TraceTimings): string {
+  const metrics = timings.spans.map(({ name, duration, count }) =>
+    count > 1 ? `${name};dur=${duration};desc="${count}x"` : `${name};dur=${duration}`,
+  )
+  return [...metrics, `total;dur=${timings.totalMs}`].join(', ')
+}
+
+/**
+ * Latency percentiles per span name, sorted by name.
+ */
+export function getLatencyStats(): Record<string, LatencySummary> {
+  const entries = [...histograms].sort(([a], [b]) => a.localeCompare(b))
+  return Object.fromEntries(entries.map(([name, histogram]) => [name, summarizeLatency(histogram)]))
+}
+
+/**
+ * defineEventHandler that traces the request and reports its spans in a
+ * Server-Timing header. Without tracing it only adds an async hop.
+ * Streaming handlers send headers before they finish, so chat reports
+ * its timings as an SSE event instead.
+ */
+export function defineTracedEventHandler<Request extends EventHandlerRequest = EventHandlerRequest, Response = unknown>(
+  handler: (event: H3Event<Request>) => Response | Promise<Response>,
+): EventHandler<Request, Promise<Response>> {
+  return defineEventHandler<Request, Promise<Response>>(async (event) => {
+    const trace = startRequestTrace()
+    if (!trace) return handler(event)
+
+    const result = await runWithTrace(trace, () => handler(event))
+    setResponseHeader(event, 'Server-Timing', formatServerTiming(getTraceTimings(trace)))
+    return result
+  })
+}
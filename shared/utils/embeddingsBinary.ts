@@ -0,0 +1,257 @@
+/**
+ * Binary embeddings artifact (public/embeddings.bin), shared by the
+ * generator script, the server and the browser.
+ *
+ * Layout (little-endian):
+ *
+ *   0   u32  magic 'SBEM'
+ *   4   u32  format version
+ *   8   u32  dtype (0 = float32, 1 = int8)
+ *   12  u32  dimensions
+ *   16  u32  row count
+ *   20  u32  manifest byte length
+ *   24  ...  manifest JSON (UTF-8), zero-padded to a 4-byte boundary
+ *   ..  f32  per-row scale × row count (1 for float32 rows)
+ *   ..  ...  row-major matrix, float32 or int8
+ *
+ * Decoding returns typed-array views over the input buffer, so loading is a
+ * single read/fetch with no per-element parsing. The legacy embeddings.json
+ * format is still accepted via embeddingsFromJson.
+ */
+
+import { z } from 'zod'
+
+export const EMBEDDINGS_MAGIC = 0x4d454253 // 'SBEM'
+export const EMBEDDINGS_FORMAT_VERSION = 1
+const HEADER_BYTES = 24
+
+export type EmbeddingsDtype = 'float32' | 'int8'
+
+const DTYPE_CODES: Record<EmbeddingsDtype, number> = { float32: 0, int8: 1 }
+
+const ManifestEntrySchema = z.object({
+  slug: z.string(),
+  title: z.string(),
+  type: z.string(),
+  hash: z.string().optional(),
+})
+
+const ManifestSchema = z.object({
+  version: z.string(),
+  model: z.string(),
+  generatedAt: z.string().optional(),
+  textMaxLength: z.number().optional(),
+  entries: z.array(ManifestEntrySchema),
+})
+
+/**
+ * Zod schema for the legacy embeddings.json format.
+ */
+export const EmbeddingsJsonSchema = z.object({
+  version: z.string(),
+  model: z.string(),
+  generatedAt: z.string().optional(),
+  textMaxLength: z.number().optional(),
+  embeddings: z.record(z.string(), z.object({
+    vector: z.array(z.number()),
+    title: z.string(),
+    type: z.string(),
+    hash: z.string().optional(),
+  })),
+})
+
+export type EmbeddingsManifestEntry = z.infer<typeof ManifestEntrySchema>
+export type EmbeddingsManifest = z.infer<typeof ManifestSchema>
+export type EmbeddingsJson = z.infer<typeof EmbeddingsJsonSchema>
+
+export interface EmbeddingsMatrix {
+  manifest: EmbeddingsManifest
+  dtype: EmbeddingsDtype
+  dimensions: number
+  count: number
+  // Per-row dequantization factor
+  scales: Float32Array
+  // Row-major, count × dimensions
+  data: Float32Array | Int8Array
+}
+
+// Helper: Round up to the next multiple of 4 bytes
+function align4(length: number): number {
+  return Math.ceil(length / 4) * 4
+}
+
+// Helper: View or (if misaligned) copy a Float32Array out of a buffer
+function float32View(buffer: ArrayBufferLike, byteOffset: number, length: number): Float32Array {
+  if (byteOffset % Float32Array.BYTES_PER_ELEMENT === 0) {
+    return new Float32Array(buffer, byteOffset, length)
+  }
+  return new Float32Array(buffer.slice(byteOffset, byteOffset + length * Float32Array.BYTES_PER_ELEMENT))
+}
+
+/**
+ * Symmetric per-row int8 quantization.
+ * Returns the quantized row and the scale that maps it back to floats.
+ */
+export function quantizeRow(vector: ArrayLike<number>): { values: Int8Array, scale: number } {
+  let maxAbs = 0
+  for (let i = 0; i < vector.length; i++) {
+    maxAbs = Math.max(maxAbs, Math.abs(vector[i] ?? 0))
+  }
+
+  const scale = maxAbs > 0 ? maxAbs / 127 : 1
+  const values = new Int8Array(vector.length)
+  for (let i = 0; i < vector.length; i++) {
+    values[i] = Math.round((vector[i] ?? 0) / scale)
+  }
+
+  return { values, scale }
+}
+
+/**
+ * Encode vectors and their manifest into the binary artifact.
+ * Row i of the matrix belongs to manifest.entries[i].
+ */
+export function encodeEmbeddingsBinary(
+  manifest: EmbeddingsManifest,
+  vectors: ArrayLike<number>[],
+  dtype: EmbeddingsDtype = 'int8',
+): Uint8Array {
+  if (vectors.length !== manifest.entries.length) {
+    throw new Error(`Manifest has ${manifest.entries.length} entries but got ${vectors.length} vectors`)
+  }
+
+  const dimensions = vectors[0]?.length ?? 0
+  const count = vectors.length
+  const manifestBytes = new TextEncoder().encode(JSON.stringify(manifest))
+  const scalesOffset = HEADER_BYTES + align4(manifestBytes.length)
+  const dataOffset = scalesOffset + count * Float32Array.BYTES_PER_ELEMENT
+  const bytesPerValue = dtype === 'int8' ? 1 : Float32Array.BYTES_PER_ELEMENT
+
+  const output = new Uint8Array(dataOffset + count * dimensions * bytesPerValue)
+  const header = new DataView(output.buffer)
+  header.setUint32(0, EMBEDDINGS_MAGIC, true)
+  header.setUint32(4, EMBEDDINGS_FORMAT_VERSION, true)
+  header.setUint32(8, DTYPE_CODES[dtype], true)
+  header.setUint32(12, dimensions, true)
+  header.setUint32(16, count, true)
+  header.setUint32(20, manifestBytes.length, true)
+  output.set(manifestBytes, HEADER_BYTES)
+
+  const scales = new Float32Array(output.buffer, scalesOffset, count)
+  const data = dtype === 'int8'
+    ? new Int8Array(output.buffer, dataOffset, count * dimensions)
+    : new Float32Array(output.buffer, dataOffset, count * dimensions)
+
+  vectors.forEach((vector, row) => {
+    if (vector.length !== dimensions) {
+      throw new Error(`Vector length mismatch: ${vector.length} vs ${dimensions}`)
+    }
+    const { values, scale } = dtype === 'int8' ? quantizeRow(vector) : { values: vector, scale: 1 }
+    data.set(values, row * dimensions)
+    scales[row] = scale
+  })
+
+  return output
+}
+
+/**
+ * Decode the binary artifact.
+ * The returned typed arrays are views over `buffer` whenever alignment allows.
+ */
+export function decodeEmbeddingsBinary(
+  buffer: ArrayBufferLike,
+  byteOffset = 0,
+  byteLength = buffer.byteLength - byteOffset,
+): EmbeddingsMatrix {
+  if (byteLength < HEADER_BYTES) {
+    throw new Error('Invalid embeddings binary: truncated header')
+  }
+
+  const header = new DataView(buffer, byteOffset, HEADER_BYTES)
+  if (header.getUint32(0, true) !== EMBEDDINGS_MAGIC) {
+    throw new Error('Invalid embeddings binary: bad magic')
+  }
+  const formatVersion = header.getUint32(4, true)
+  if (formatVersion !== EMBEDDINGS_FORMAT_VERSION) {
+    throw new Error(`Unsupported embeddings binary version: ${formatVersion}`)
+  }
+
+  const dtype: EmbeddingsDtype = header.getUint32(8, true) === DTYPE_CODES.int8 ? 'int8' : 'float32'
+  const dimensions = header.getUint32(12, true)
+  const count = header.getUint32(16, true)
+  const manifestLength = header.getUint32(20, true)
+
+  const scalesOffset = HEADER_BYTES + align4(manifestLength)
+  const dataOffset = scalesOffset + count * Float32Array.BYTES_PER_ELEMENT
+  const bytesPerValue = dtype === 'int8' ? 1 : Float32Array.BYTES_PER_ELEMENT
+  if (byteLength < dataOffset + count * dimensions * bytesPerValue) {
+    throw new Error('Invalid embeddings binary: truncated matrix')
+  }
+
+  const manifestJson = new TextDecoder().decode(new Uint8Array(buffer, byteOffset + HEADER_BYTES, manifestLength))
+  const manifest = ManifestSchema.parse(JSON.parse(manifestJson))
+  if (manifest.entries.length !== count) {
+    throw new Error(`Invalid embeddings binary: ${manifest.entries.length} entries for ${count} rows`)
+  }
+
+  const data = dtype === 'int8'
+    ? new Int8Array(buffer, byteOffset + dataOffset, count * dimensions)
+    : float32View(buffer, byteOffset + dataOffset, count * dimensions)
+
+  return {
+    manifest,
+    dtype,
+    dimensions,
+    count,
+    scales: float32View(buffer, byteOffset + scalesOffset, count),
+    data,
+  }
+}
+
+/**
+ * Pack the legacy JSON format into the same in-memory matrix shape.
+ */
+export function embeddingsFromJson(json: EmbeddingsJson): EmbeddingsMatrix {
+  const slugs = Object.keys(json.embeddings)
+  const dimensions = json.embeddings[slugs[0] ?? '']?.vector.length ?? 0
+  const data = new Float32Array(slugs.length * dimensions)
+  const entries: EmbeddingsManifestEntry[] = []
+
+  slugs.forEach((slug, row) => {
+    const { vector, title, type, hash } = json.embeddings[slug] ?? { vector: [], title: slug, type: 'note' }
+    if (vector.length !== dimensions) {
+      throw new Error(`Vector length mismatch: ${vector.length} vs ${dimensions}`)
+    }
+    data.set(vector, row * dimensions)
+    entries.push({ slug, title, type, hash })
+  })
+
+  return {
+    manifest: {
+      version: json.version,
+      model: json.model,
+      generatedAt: json.generatedAt,
+      textMaxLength: json.textMaxLength,
+      entries,
+    },
+    dtype: 'float32',
+    dimensions,
+    count: slugs.length,
+    scales: new Float32Array(slugs.length).fill(1),
+    data,
+  }
+}
+
+/**
+ * Dequantized copy of a single row.
+ */
+export function getRowVector(matrix: EmbeddingsMatrix, row: number): Float32Array {
+  const { dimensions, data } = matrix
+  const scale = matrix.scales[row] ?? 1
+  const vector = new Float32Array(dimensions)
+  const offset = row * dimensions
+  for (let i = 0; i < dimensions; i++) {
+    vector[i] = (data[offset + i] ?? 0) * scale
+  }
+  return vector
+}
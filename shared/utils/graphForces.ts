@@ -0,0 +1,181 @@
+import { forceSimulation, forceLink, forceManyBody, forceCenter, forceRadial, forceY, forceCollide } from 'd3-force'
+import type { Simulation, SimulationNodeDatum, SimulationLinkDatum } from 'd3-force'
+import { scalePow } from 'd3-scale'
+
+/**
+ * Node fields the force layout reads. Satisfied by the app's
+ * UnifiedGraphNode and by the server's GraphNode, so the same forces run in
+ * the component, in the layout worker and at build time.
+ */
+export interface ForceNode extends SimulationNodeDatum {
+  id: string
+  isCenter?: boolean
+  level?: 0 | 1 | 2
+  isMap?: boolean
+  maps?: string[]
+  connections?: number
+}
+
+export type ForceEdge<N extends ForceNode> = SimulationLinkDatum<N>
+
+export interface ForceConfig {
+  linkDistance: number
+  chargeStrength: number
+  collisionPadding: number
+  // Barnes-Hut approximation of the many-body force (higher is faster and coarser)
+  theta: number
+  // Radial-specific
+  radialStrength?: number
+  radialRadius?: number
+  level2RadialRadius?: number
+  level2ChargeMultiplier?: number
+  // Freeform-specific
+  centerStrength?: number
+  yStrength?: number
+}
+
+export const RADIAL_DEFAULTS: ForceConfig = {
+  linkDistance: 70,
+  chargeStrength: -200,
+  collisionPadding: 8,
+  theta: 0.9,
+  radialStrength: 0.4,
+  radialRadius: 90,
+  level2RadialRadius: 144, // 90 * 1.6
+  level2ChargeMultiplier: 0.4,
+}
+
+export const FREEFORM_DEFAULTS: ForceConfig = {
+  linkDistance: 150,
+  chargeStrength: -500,
+  collisionPadding: 6,
+  theta: 0.9,
+  centerStrength: 0.05,
+  yStrength: 0.02,
+}
+
+// Coarser Barnes-Hut for graphs with thousands of nodes
+export const LARGE_GRAPH_CONFIG: Partial<ForceConfig> = {
+  theta: 1.2,
+}
+
+export const LARGE_GRAPH_MIN_NODES = 1000
+
+// Node radius range for connection-based sizing
+export const FREEFORM_SIZE_RANGE: [number, number] = [8, 40]
+
+/**
+ * Radius by number of connections, relative to the best-connected node
+ */
+export function createConnectionRadiusScale(maxConnections: number): (connections: number) => number {
+  const scale = scalePow()
+    .exponent(0.7)
+    .domain([0, Math.max(1, maxConnections)])
+    .range(FREEFORM_SIZE_RANGE)
+  return connections => scale(connections)
+}
+
+export function createRadialSimulation<N extends ForceNode, E extends ForceEdge<N>>(
+  nodes: N[],
+  edges: E[],
+  width: number,
+  height: number,
+  config: Partial<ForceConfig> = {},
+  radiusScale: (node: N) => number,
+): Simulation<N, E> {
+  const c = { ...RADIAL_DEFAULTS, ...config }
+  const radialRadius = c.radialRadius ?? 90
+  const level2RadialRadius = c.level2RadialRadius ?? 144
+  const radialStrength = c.radialStrength ?? 0.4
+
+  return forceSimulation<N>(nodes)
+    .force('link', forceLink<N, E>(edges)
+      .id(d => d.id)
+      .distance(c.linkDistance))
+    .force('charge', forceManyBody<N>()
+      .theta(c.theta)
+      .strength((d) => {
+        if (d.isCenter) return c.chargeStrength
+        if (d.level === 2) return c.chargeStrength * (c.level2ChargeMultiplier ?? 0.4)
+        return c.chargeStrength
+      }))
+    .force('center', forceCenter(width / 2, height / 2))
+    .force('radial', forceRadial<N>(
+      (d): number => {
+        if (d.isCenter) return 0
+        if (d.level === 2) return level2RadialRadius
+        return radialRadius
+      },
+      width / 2,
+      height / 2,
+    ).strength((d): number => d.isCenter ? 0 : radialStrength))
+    .force('collision', forceCollide<N>()
+      .radius(d => radiusScale(d) + c.collisionPadding))
+    .alphaDecay(0.05)
+}
+
+export function createFreeformSimulation<N extends ForceNode, E extends ForceEdge<N>>(
+  nodes: N[],
+  edges: E[],
+  width: number,
+  height: number,
+  config: Partial<ForceConfig> = {},
+  radiusScale: (node: N) => number,
+  clusteringForce?: (alpha: number) => void,
+): Simulation<N, E> {
+  const c = { ...FREEFORM_DEFAULTS, ...config }
+  const yStrength = c.yStrength ?? 0.02
+
+  const simulation = forceSimulation<N>(nodes)
+    .force('link', forceLink<N, E>(edges)
+      .id(d => d.id)
+      .distance(c.linkDistance))
+    .force('charge', forceManyBody<N>().theta(c.theta).strength(c.chargeStrength))
+    .force('center', forceCenter(width / 2, height / 2))
+    .force('y', forceY<N>(height / 2).strength(yStrength))
+    .force('collision', forceCollide<N>()
+      .radius(d => radiusScale(d) + c.collisionPadding))
+
+  if (clusteringForce) {
+    simulation.force('cluster', clusteringForce)
+  }
+
+  return simulation
+}
+
+// Clustering force helpers
+function buildMapPositions(nodes: ForceNode[]) {
+  const positions = new Map<string, { x: number, y: number }>()
+  for (const node of nodes) {
+    if (node.isMap) positions.set(node.id, { x: node.x ?? 0, y: node.y ?? 0 })
+  }
+  return positions
+}
+
+function calculateMapCentroid(maps: string[], mapPositions: Map<string, { x: number, y: number }>) {
+  let x = 0, y = 0, count = 0
+  for (const mapId of maps) {
+    const pos = mapPositions.get(mapId)
+    if (pos) { x += pos.x; y += pos.y; count++ }
+  }
+  return count > 0 ? { x: x / count, y: y / count } : null
+}
+
+function applyClusterForce(node: ForceNode, mapPositions: Map<string, { x: number, y: number }>, alpha: number) {
+  if (!node.maps || node.maps.length === 0 || node.isMap) return
+  const centroid = calculateMapCentroid(node.maps, mapPositions)
+  if (!centroid) return
+  const strength = 0.15 * alpha
+  node.vx = (node.vx ?? 0) + (centroid.x - (node.x ?? 0)) * strength
+  node.vy = (node.vy ?? 0) + (centroid.y - (node.y ?? 0)) * strength
+}
+
+/**
+ * Pull notes towards the centroid of the maps (MOCs) they belong to
+ */
+export function createClusteringForce(nodes: ForceNode[]) {
+  return (alpha: number) => {
+    const mapPositions = buildMapPositions(nodes)
+    for (const node of nodes) applyClusterForce(node, mapPositions, alpha)
+  }
+}
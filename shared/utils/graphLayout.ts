@@ -0,0 +1,173 @@
+/**
+ * Force layout outside the graph component.
+ *
+ * - The browser steps large layouts in a Web Worker
+ *   (app/workers/graphLayout.worker.ts) and streams positions back.
+ * - /api/graph settles the full graph once while prerendering, so the graph
+ *   page can paint final positions immediately.
+ *
+ * Positions travel as one interleaved Float32Array [x0, y0, x1, y1, ...]
+ * in node order, which can be transferred between threads without copying.
+ */
+
+import type { Simulation } from 'd3-force'
+import {
+  createClusteringForce,
+  createFreeformSimulation,
+  createRadialSimulation,
+  type ForceConfig,
+  type ForceEdge,
+  type ForceNode,
+} from './graphForces'
+
+export type LayoutMode = 'radial' | 'freeform'
+
+export interface LayoutOptions {
+  mode: LayoutMode
+  width: number
+  height: number
+  // Collision radius per node, in node order
+  radii: ArrayLike<number>
+  config?: Partial<ForceConfig>
+}
+
+// Serializable edge sent to the worker
+export interface LayoutEdge {
+  source: string
+  target: string
+  level?: 1 | 2
+}
+
+export type LayoutWorkerRequest =
+  | { type: 'start', nodes: ForceNode[], edges: LayoutEdge[], options: LayoutOptions, alpha: number }
+  | { type: 'reheat', alpha: number }
+  | { type: 'target', alphaTarget: number }
+  | { type: 'fix', index: number, x: number, y: number }
+  | { type: 'release', index: number }
+  | { type: 'stop' }
+
+export interface LayoutWorkerResponse {
+  // 'end' is sent once the simulation cools down, like d3's end event
+  type: 'tick' | 'end'
+  positions: Float32Array
+}
+
+/**
+ * Create the radial or freeform simulation with per-node radii.
+ */
+export function createLayoutSimulation<N extends ForceNode, E extends ForceEdge<N>>(
+  nodes: N[],
+  edges: E[],
+  options: LayoutOptions,
+): Simulation<N, E> {
+  const radiusScale = (node: N) => options.radii[node.index ?? 0] ?? 0
+
+  if (options.mode === 'radial') {
+    return createRadialSimulation(nodes, edges, options.width, options.height, options.config, radiusScale)
+  }
+
+  return createFreeformSimulation(
+    nodes,
+    edges,
+    options.width,
+    options.height,
+    options.config,
+    radiusScale,
+    createClusteringForce(nodes),
+  )
+}
+
+/**
+ * Tick a stopped simulation until it cools down or the time budget runs out.
+ * Returns whether the simulation is still active.
+ */
+export function stepSimulation<N extends ForceNode, E extends ForceEdge<N>>(
+  simulation: Simulation<N, E>,
+  budgetMs: number,
+  now: () => number = () => performance.now(),
+): boolean {
+  const start = now()
+  do {
+    simulation.tick()
+  } while (simulation.alpha() >= simulation.alphaMin() && now() - start < budgetMs)
+
+  return simulation.alpha() >= simulation.alphaMin()
+}
+
+/**
+ * Run a simulation to rest synchronously (at most `maxTicks` ticks).
+ */
+export function settleSimulation<N extends ForceNode, E extends ForceEdge<N>>(
+  simulation: Simulation<N, E>,
+  maxTicks = 300,
+): void {
+  simulation.stop()
+  for (let i = 0; i < maxTicks && simulation.alpha() >= simulation.alphaMin(); i++) {
+    simulation.tick()
+  }
+}
+
+/**
+ * Write node positions into an interleaved buffer.
+ */
+export function packPositions(nodes: ForceNode[], out = new Float32Array(nodes.length * 2)): Float32Array {
+  nodes.forEach((node, i) => {
+    out[i * 2] = node.x ?? 0
+    out[i * 2 + 1] = node.y ?? 0
+  })
+  return out
+}
+
+/**
+ * Copy positions from an interleaved buffer onto the nodes.
+ */
+export function applyPositions(nodes: ForceNode[], positions: ArrayLike<number>): void {
+  nodes.forEach((node, i) => {
+    node.x = positions[i * 2] ?? node.x
+    node.y = positions[i * 2 + 1] ?? node.y
+  })
+}
+
+/**
+ * Whether every node already has a position (e.g. precomputed at build time).
+ */
+export function hasLayout(nodes: ForceNode[]): boolean {
+  return nodes.length > 0 && nodes.every(node => Number.isFinite(node.x) && Number.isFinite(node.y))
+}
+
+/**
+ * Shift all nodes, e.g. to move a layout centered on the origin into a viewport.
+ */
+export function translateNodes(nodes: ForceNode[], dx: number, dy: number): void {
+  for (const node of nodes) {
+    node.x = (node.x ?? 0) + dx
+    node.y = (node.y ?? 0) + dy
+  }
+}
+
+/**
+ * Strip a node down to the fields the forces read (cheaper to post to a worker).
+ */
+export function toForceNode(node: ForceNode): ForceNode {
+  return {
+    id: node.id,
+    isCenter: node.isCenter,
+    level: node.level,
+    isMap: node.isMap,
+    maps: node.maps,
+    connections: node.connections,
+    x: node.x,
+    y: node.y,
+  }
+}
+
+/**
+ * Serialize an edge whose endpoints may already be resolved to nodes.
+ */
+export function toLayoutEdge(edge: { source: string | ForceNode, target: string | ForceNode, level?: 1 | 2 }): LayoutEdge {
+  return {
+    source: typeof edge.source === 'string' ? edge.source : edge.source.id,
+    target: typeof edge.target === 'string' ? edge.target : edge.target.id,
+    level: edge.level,
+  }
+}
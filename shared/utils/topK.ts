@@ -0,0 +1,84 @@
+/**
+ * Bounded top-K selection, shared by vector search and the chat keyword
+ * index. Keeps a min-heap of K entries, so selecting from N scores costs
+ * O(N log K) instead of sorting all of them.
+ */
+
+export interface TopKEntry {
+  row: number
+  score: number
+}
+
+/**
+ * Bounded min-heap keeping the K highest-scoring rows.
+ * K is floored and clamped to [0, capacity], the number of candidate rows,
+ * so untrusted limits never size the heap beyond what can be pushed.
+ */
+export function createTopK(requested: number, capacity: number) {
+  // `|| 0` also maps a NaN request to an empty heap
+  const k = Math.max(0, Math.min(Math.floor(requested), capacity)) || 0
+  const scores = new Float64Array(k)
+  const rows = new Int32Array(k)
+  let size = 0
+
+  function swap(a: number, b: number): void {
+    const score = scores[a] ?? 0
+    const row = rows[a] ?? 0
+    scores[a] = scores[b] ?? 0
+    rows[a] = rows[b] ?? 0
+    scores[b] = score
+    rows[b] = row
+  }
+
+  function less(a: number, b: number): boolean {
+    return (scores[a] ?? 0) < (scores[b] ?? 0)
+  }
+
+  function siftUp(index: number): void {
+    let child = index
+    while (child > 0) {
+      const parent = (child - 1) >> 1
+      if (!less(child, parent)) return
+      swap(parent, child)
+      child = parent
+    }
+  }
+
+  function siftDown(index: number): void {
+    let parent = index
+    while (true) {
+      const left = parent * 2 + 1
+      const right = left + 1
+      let smallest = parent
+      if (left < size && less(left, smallest)) smallest = left
+      if (right < size && less(right, smallest)) smallest = right
+      if (smallest === parent) return
+      swap(parent, smallest)
+      parent = smallest
+    }
+  }
+
+  function push(row: number, score: number): void {
+    if (k === 0) return
+    if (size < k) {
+      scores[size] = score
+      rows[size] = row
+      siftUp(size++)
+      return
+    }
+    if (score <= (scores[0] ?? 0)) return
+    scores[0] = score
+    rows[0] = row
+    siftDown(0)
+  }
+
+  function results(): TopKEntry[] {
+    const hits: TopKEntry[] = []
+    for (let i = 0; i < size; i++) {
+      hits.push({ row: rows[i] ?? 0, score: scores[i] ?? 0 })
+    }
+    return hits.sort((a, b) => b.score - a.score || a.row - b.row)
+  }
+
+  return { push, results }
+}
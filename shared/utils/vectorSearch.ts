@@ -0,0 +1,335 @@
+/**
+ * Top-K vector search over a packed embeddings matrix, shared by the
+ * server (chat tools) and the browser (semantic search page).
+ *
+ * - Rows are grouped by content type, so a type filter only scores its
+ *   contiguous row range instead of filtering after the fact.
+ * - Dot products use four independent accumulators over the packed
+ *   row-major matrix (int8 or float32) with the per-row scale applied once.
+ * - Top-K selection keeps a bounded min-heap instead of sorting every score.
+ * - Large vaults can opt into an IVF (inverted file) index: rows are
+ *   clustered by spherical k-means and a query only scans the closest lists.
+ */
+
+import { getRowVector, type EmbeddingsMatrix } from './embeddingsBinary'
+import { createTopK } from './topK'
+
+export interface RowRange {
+  start: number
+  end: number
+}
+
+export interface IvfIndex {
+  // nlist × dimensions, row-major, normalized
+  centroids: Float32Array
+  lists: Uint32Array[]
+  probes: number
+}
+
+export interface VectorIndex {
+  matrix: EmbeddingsMatrix
+  rowBySlug: Map<string, number>
+  typeRanges: Map<string, RowRange>
+  ivf: IvfIndex | null
+}
+
+export interface VectorIndexOptions {
+  // Build an IVF index when the matrix has at least this many rows
+  annThreshold?: number
+  // Number of IVF lists (defaults to √rows)
+  ivfLists?: number
+  // Number of closest lists scanned per query
+  ivfProbes?: number
+}
+
+export interface VectorSearchOptions {
+  topK: number
+  type?: string
+  excludeRow?: number
+  // Bypass the IVF index even when one exists
+  exact?: boolean
+}
+
+export interface VectorHit {
+  row: number
+  score: number
+}
+
+export const DEFAULT_ANN_THRESHOLD = 100_000
+const DEFAULT_IVF_PROBES = 8
+const KMEANS_ITERATIONS = 6
+const KMEANS_SAMPLES_PER_LIST = 32
+
+/**
+ * Check whether rows of the same type are stored contiguously.
+ */
+export function isGroupedByType(matrix: EmbeddingsMatrix): boolean {
+  const seen = new Set<string>()
+  let previous: string | null = null
+  for (const { type } of matrix.manifest.entries) {
+    if (type === previous) continue
+    if (seen.has(type)) return false
+    seen.add(type)
+    previous = type
+  }
+  return true
+}
+
+/**
+ * Return a matrix whose rows are grouped by type.
+ * The input is returned untouched when it already is (the generator writes
+ * grouped rows), otherwise rows are copied into a new packed matrix.
+ */
+export function groupRowsByType(matrix: EmbeddingsMatrix): EmbeddingsMatrix {
+  if (isGroupedByType(matrix)) return matrix
+
+  const { dimensions, manifest } = matrix
+  const order = manifest.entries
+    .map((entry, row) => ({ type: entry.type, row }))
+    .sort((a, b) => a.type.localeCompare(b.type) || a.row - b.row)
+    .map(({ row }) => row)
+
+  const data = matrix.dtype === 'int8'
+    ? new Int8Array(matrix.data.length)
+    : new Float32Array(matrix.data.length)
+  const scales = new Float32Array(matrix.count)
+
+  order.forEach((sourceRow, targetRow) => {
+    data.set(matrix.data.subarray(sourceRow * dimensions, (sourceRow + 1) * dimensions), targetRow * dimensions)
+    scales[targetRow] = matrix.scales[sourceRow] ?? 1
+  })
+
+  return {
+    ...matrix,
+    manifest: { ...manifest, entries: order.map(row => manifest.entries[row]).filter(entry => entry !== undefined) },
+    scales,
+    data,
+  }
+}
+
+/**
+ * Compute contiguous row ranges per type (rows must be grouped).
+ */
+export function buildTypeRanges(matrix: EmbeddingsMatrix): Map<string, RowRange> {
+  const ranges = new Map<string, RowRange>()
+  matrix.manifest.entries.forEach(({ type }, row) => {
+    const range = ranges.get(type)
+    if (range) {
+      range.end = row + 1
+      return
+    }
+    ranges.set(type, { start: row, end: row + 1 })
+  })
+  return ranges
+}
+
+/**
+ * Dot product of one matrix row with a query, 4-way unrolled.
+ */
+// eslint-disable-next-line complexity -- `?? 0` per typed-array read (noUncheckedIndexedAccess), not real branching
+export function scoreRow(matrix: EmbeddingsMatrix, row: number, query: Float32Array): number {
+  const { dimensions, data } = matrix
+  const offset = row * dimensions
+  let s0 = 0
+  let s1 = 0
+  let s2 = 0
+  let s3 = 0
+  let i = 0
+
+  for (; i + 3 < dimensions; i += 4) {
+    s0 += (data[offset + i] ?? 0) * (query[i] ?? 0)
+    s1 += (data[offset + i + 1] ?? 0) * (query[i + 1] ?? 0)
+    s2 += (data[offset + i + 2] ?? 0) * (query[i + 2] ?? 0)
+    s3 += (data[offset + i + 3] ?? 0) * (query[i + 3] ?? 0)
+  }
+  for (; i < dimensions; i++) {
+    s0 += (data[offset + i] ?? 0) * (query[i] ?? 0)
+  }
+
+  return (s0 + s1 + s2 + s3) * (matrix.scales[row] ?? 1)
+}
+
+// Helper: Index of the highest-scoring centroid for a vector
+function nearestCentroid(centroids: Float32Array, dimensions: number, vector: Float32Array): number {
+  let best = 0
+  let bestScore = -Infinity
+  for (let c = 0; c * dimensions < centroids.length; c++) {
+    let score = 0
+    for (let i = 0; i < dimensions; i++) {
+      score += (centroids[c * dimensions + i] ?? 0) * (vector[i] ?? 0)
+    }
+    if (score > bestScore) {
+      bestScore = score
+      best = c
+    }
+  }
+  return best
+}
+
+// Helper: Normalize each centroid in place (spherical k-means)
+function normalizeCentroids(centroids: Float32Array, dimensions: number): void {
+  for (let offset = 0; offset < centroids.length; offset += dimensions) {
+    let norm = 0
+    for (let i = 0; i < dimensions; i++) norm += (centroids[offset + i] ?? 0) ** 2
+    const inverse = norm > 0 ? 1 / Math.sqrt(norm) : 0
+    for (let i = 0; i < dimensions; i++) centroids[offset + i] = (centroids[offset + i] ?? 0) * inverse
+  }
+}
+
+// Helper: Refine centroids on an evenly spaced sample of rows
+function trainCentroids(matrix: EmbeddingsMatrix, centroids: Float32Array): void {
+  const { dimensions, count } = matrix
+  const nlist = centroids.length / dimensions
+  const sampleStep = Math.max(1, Math.floor(count / (nlist * KMEANS_SAMPLES_PER_LIST)))
+
+  for (let iteration = 0; iteration < KMEANS_ITERATIONS; iteration++) {
+    const sums = new Float32Array(centroids.length)
+    for (let row = 0; row < count; row += sampleStep) {
+      const vector = getRowVector(matrix, row)
+      const offset = nearestCentroid(centroids, dimensions, vector) * dimensions
+      for (let i = 0; i < dimensions; i++) sums[offset + i] = (sums[offset + i] ?? 0) + (vector[i] ?? 0)
+    }
+    // Keep the previous centroid for empty clusters
+    for (let offset = 0; offset < sums.length; offset += dimensions) {
+      const sum = sums.subarray(offset, offset + dimensions)
+      if (sum.some(value => value !== 0)) centroids.set(sum, offset)
+    }
+    normalizeCentroids(centroids, dimensions)
+  }
+}
+
+/**
+ * Build an IVF index with spherical k-means.
+ * Centroids are trained on an evenly spaced sample, then every row is
+ * assigned to its nearest centroid.
+ */
+export function buildIvfIndex(
+  matrix: EmbeddingsMatrix,
+  lists = Math.max(1, Math.round(Math.sqrt(matrix.count))),
+  probes = DEFAULT_IVF_PROBES,
+): IvfIndex {
+  const { dimensions, count } = matrix
+  const nlist = Math.max(1, Math.min(lists, count))
+  const centroids = new Float32Array(nlist * dimensions)
+  for (let c = 0; c < nlist; c++) {
+    centroids.set(getRowVector(matrix, Math.floor((c * count) / nlist)), c * dimensions)
+  }
+  normalizeCentroids(centroids, dimensions)
+  trainCentroids(matrix, centroids)
+
+  const members: number[][] = Array.from({ length: nlist }, () => [])
+  for (let row = 0; row < count; row++) {
+    members[nearestCentroid(centroids, dimensions, getRowVector(matrix, row))]?.push(row)
+  }
+
+  return { centroids, lists: members.map(rows => Uint32Array.from(rows)), probes: Math.min(probes, nlist) }
+}
+
+/**
+ * Prepare a matrix for searching: group rows by type, index slugs and
+ * optionally build an IVF index for large vaults.
+ */
+export function createVectorIndex(matrix: EmbeddingsMatrix, options: VectorIndexOptions = {}): VectorIndex {
+  const { annThreshold = DEFAULT_ANN_THRESHOLD, ivfLists, ivfProbes } = options
+  const grouped = groupRowsByType(matrix)
+
+  return {
+    matrix: grouped,
+    rowBySlug: new Map(grouped.manifest.entries.map((entry, row) => [entry.slug, row])),
+    typeRanges: buildTypeRanges(grouped),
+    ivf: grouped.count >= annThreshold ? buildIvfIndex(grouped, ivfLists, ivfProbes) : null,
+  }
+}
+
+// Helper: First position in a sorted row list holding a row >= `row`
+function lowerBound(rows: Uint32Array, row: number): number {
+  let low = 0
+  let high = rows.length
+  while (low < high) {
+    const mid = (low + high) >> 1
+    if ((rows[mid] ?? row) < row) {
+      low = mid + 1
+      continue
+    }
+    high = mid
+  }
+  return low
+}
+
+// Helper: Whether a sorted IVF list holds any row of the range
+function listIntersects(rows: Uint32Array, range: RowRange): boolean {
+  return (rows[lowerBound(rows, range.start)] ?? range.end) < range.end
+}
+
+// Helper: Centroid similarity of one IVF list
+function centroidScore(ivf: IvfIndex, list: number, query: Float32Array): number {
+  const dimensions = query.length
+  let score = 0
+  for (let i = 0; i < dimensions; i++) score += (ivf.centroids[list * dimensions + i] ?? 0) * (query[i] ?? 0)
+  return score
+}
+
+// Helper: Number of rows a search over the range can return
+function rangeCandidates(range: RowRange, excludeRow: number): number {
+  const excluded = excludeRow >= range.start && excludeRow < range.end ? 1 : 0
+  return range.end - range.start - excluded
+}
+
+// Helper: Score the IVF lists closest to the query, restricted to a row range.
+// Only lists holding rows of the range are probed, so a type filter never
+// lands on lists without any matching row; when the probed lists still hold
+// fewer than topK matching rows, the range is scanned exactly instead.
+function searchIvf(index: VectorIndex, ivf: IvfIndex, query: Float32Array, range: RowRange, excludeRow: number, topK: number): VectorHit[] {
+  const listHeap = createTopK(ivf.probes, ivf.lists.length)
+  ivf.lists.forEach((rows, list) => {
+    if (listIntersects(rows, range)) listHeap.push(list, centroidScore(ivf, list, query))
+  })
+
+  const heap = createTopK(topK, range.end - range.start)
+  for (const { row: list } of listHeap.results()) {
+    const rows = ivf.lists[list] ?? new Uint32Array(0)
+    // Lists are sorted by row, so only the slice inside the range is scored
+    for (const row of rows.subarray(lowerBound(rows, range.start))) {
+      if (row >= range.end) break
+      if (row !== excludeRow) heap.push(row, scoreRow(index.matrix, row, query))
+    }
+  }
+
+  const hits = heap.results()
+  return hits.length < Math.min(topK, rangeCandidates(range, excludeRow))
+    ? scanRange(index.matrix, query, range, excludeRow, topK)
+    : hits
+}
+
+// Helper: Exhaustively score a row range
+function scanRange(matrix: EmbeddingsMatrix, query: Float32Array, range: RowRange, excludeRow: number, topK: number): VectorHit[] {
+  const heap = createTopK(topK, range.end - range.start)
+  for (let row = range.start; row < range.end; row++) {
+    if (row === excludeRow) continue
+    heap.push(row, scoreRow(matrix, row, query))
+  }
+  return heap.results()
+}
+
+/**
+ * Find the top-K rows for a query vector, highest score first.
+ */
+export function searchVectors(
+  index: VectorIndex,
+  query: ArrayLike<number>,
+  options: VectorSearchOptions,
+): VectorHit[] {
+  const { topK, type, excludeRow = -1, exact = false } = options
+  const { matrix } = index
+  if (query.length !== matrix.dimensions) {
+    throw new Error(`Vector length mismatch: ${query.length} vs ${matrix.dimensions}`)
+  }
+
+  const range = type ? index.typeRanges.get(type) : { start: 0, end: matrix.count }
+  if (!range || topK <= 0) return []
+
+  const queryVector = Float32Array.from(query)
+  return index.ivf && !exact
+    ? searchIvf(index, index.ivf, queryVector, range, excludeRow, topK)
+    : scanRange(matrix, queryVector, range, excludeRow, topK)
+}
@@ -0,0 +1,70 @@
+import { mkdtempSync, writeFileSync } from 'node:fs'
+import { readFile, rm } from 'node:fs/promises'
+import { tmpdir } from 'node:os'
+import { join } from 'node:path'
+import { afterAll, bench } from 'vitest'
+import {
+  EmbeddingsJsonSchema,
+  decodeEmbeddingsBinary,
+  embeddingsFromJson,
+  getRowVector,
+  type EmbeddingsMatrix,
+} from '../../shared/utils/embeddingsBinary'
+import { createVectorIndex, searchVectors } from '../../shared/utils/vectorSearch'
+import { createSyntheticEmbeddings, hashEmbedding } from '../factories/vaultFactory'
+import { BUILD_OPTIONS, describeVaults } from './vaults'
+
+// The legacy JSON artifact gets unwieldy beyond this (hundreds of MB of text)
+const MAX_JSON_ROWS = 10_000
+
+function decode(bytes: Uint8Array): EmbeddingsMatrix {
+  return decodeEmbeddingsBinary(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+}
+
+function toLegacyJson(matrix: EmbeddingsMatrix): string {
+  const embeddings = Object.fromEntries(matrix.manifest.entries.map((entry, row) => [
+    entry.slug,
+    { vector: Array.from(getRowVector(matrix, row)), title: entry.title, type: entry.type },
+  ]))
+  return JSON.stringify({ version: matrix.manifest.version, model: matrix.manifest.model, embeddings })
+}
+
+describeVaults((vault) => {
+  const int8 = createSyntheticEmbeddings(vault, 'int8')
+  const float32 = createSyntheticEmbeddings(vault, 'float32')
+  const dir = mkdtempSync(join(tmpdir(), 'second-brain-bench-'))
+  const path = join(dir, 'embeddings.bin')
+  writeFileSync(path, int8)
+  afterAll(() => rm(dir, { recursive: true, force: true }))
+  const index = createVectorIndex(decode(int8))
+  const query = hashEmbedding('deep work and atomic habits for better focus', index.matrix.dimensions)
+
+  // What loadEmbeddings does on a cold server
+  bench('load embeddings.bin from disk (int8)', async () => {
+    const buffer = await readFile(path)
+    decodeEmbeddingsBinary(buffer.buffer, buffer.byteOffset, buffer.byteLength)
+  })
+
+  bench('decodeEmbeddingsBinary (int8)', () => {
+    decode(int8)
+  })
+
+  bench('decodeEmbeddingsBinary (float32)', () => {
+    decode(float32)
+  })
+
+  if (vault.notes.length <= MAX_JSON_ROWS) {
+    const json = toLegacyJson(decode(float32))
+    bench('embeddingsFromJson (legacy)', () => {
+      embeddingsFromJson(EmbeddingsJsonSchema.parse(JSON.parse(json)))
+    }, BUILD_OPTIONS)
+  }
+
+  bench('createVectorIndex', () => {
+    createVectorIndex(decode(int8))
+  }, BUILD_OPTIONS)
+
+  bench('searchVectors (top 50)', () => {
+    searchVectors(index, query, { topK: 50 })
+  })
+})
@@ -0,0 +1,33 @@
+import { bench } from 'vitest'
+import { buildGraphFromContent } from '../../server/utils/graph'
+import { buildBacklinksIndex } from '../../server/utils/backlinks'
+import { buildLinkIndex } from '../../server/utils/linkIndex'
+import { buildNoteGraph } from '../../server/utils/noteGraph'
+import { BUILD_OPTIONS, describeVaults } from './vaults'
+
+describeVaults((vault) => {
+  bench('buildGraphFromContent', () => {
+    buildGraphFromContent(vault.notes)
+  }, BUILD_OPTIONS)
+
+  bench('buildBacklinksIndex', () => {
+    buildBacklinksIndex(vault.notes)
+  }, BUILD_OPTIONS)
+
+  bench('buildLinkIndex', () => {
+    buildLinkIndex(vault.notes)
+  }, BUILD_OPTIONS)
+
+  const index = buildLinkIndex(vault.notes)
+  // Link targets are skewed towards the start of the vault, so the first note is a hub
+  const hub = vault.notes[0]?.stem ?? ''
+  const typical = vault.notes[Math.floor(vault.notes.length / 2)]?.stem ?? ''
+
+  bench('buildNoteGraph (hub)', () => {
+    buildNoteGraph(index, hub)
+  })
+
+  bench('buildNoteGraph (typical note)', () => {
+    buildNoteGraph(index, typical)
+  })
+})
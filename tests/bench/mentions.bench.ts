@@ -0,0 +1,23 @@
+import { bench } from 'vitest'
+import { buildContentMapWithLinks, findUnlinkedMentions, findUnlinkedMentionsInContentMap } from '../../server/utils/mentions'
+import { buildMentionsIndex } from '../../server/utils/mentionIndex'
+import { BUILD_OPTIONS, describeVaults } from './vaults'
+
+describeVaults((vault) => {
+  const target = vault.notes[0] ?? { stem: '', title: '' }
+  const contentMap = buildContentMapWithLinks(vault.notes)
+
+  // Per-request path: rebuilds the content map and runs one regex over every section
+  bench('findUnlinkedMentions', () => {
+    findUnlinkedMentions(vault.notes, vault.sections, target.stem, target.title)
+  }, BUILD_OPTIONS)
+
+  bench('findUnlinkedMentionsInContentMap', () => {
+    findUnlinkedMentionsInContentMap(contentMap, vault.sections, target.stem, target.title)
+  }, BUILD_OPTIONS)
+
+  // Precomputed path: every title at once with the Aho-Corasick automaton
+  bench('buildMentionsIndex', () => {
+    buildMentionsIndex(contentMap, vault.sections)
+  }, BUILD_OPTIONS)
+})
@@ -0,0 +1,63 @@
+import { bench, vi } from 'vitest'
+import { buildKeywordIndex } from '../../server/utils/chat/keywordIndex'
+import { hybridSearch, keywordSearch } from '../../server/utils/chat/search'
+import { decodeEmbeddingsBinary } from '../../shared/utils/embeddingsBinary'
+import { createVectorIndex, type VectorIndex } from '../../shared/utils/vectorSearch'
+import { createSyntheticEmbeddings } from '../factories/vaultFactory'
+import { BUILD_OPTIONS, describeVaults } from './vaults'
+
+// Vector index of the vault being benchmarked, read by the semanticSearch stub
+const semantic = vi.hoisted(() => {
+  const state: { index?: VectorIndex } = {}
+  return state
+})
+
+// Skip the ML model: embed queries with the same hashing trick as the synthetic embeddings
+vi.mock('../../server/utils/chat/semanticSearch', async () => {
+  const { searchVectors } = await import('../../shared/utils/vectorSearch')
+  const { hashEmbedding } = await import('../factories/vaultFactory')
+  return {
+    semanticSearch: async (query: string, topN = 20, type?: string) => {
+      const index = semantic.index
+      if (!index) return []
+      const hits = searchVectors(index, hashEmbedding(query, index.matrix.dimensions), { topK: topN, type })
+      return hits.map(({ row, score }) => {
+        const entry = index.matrix.manifest.entries[row]
+        return { slug: entry?.slug ?? '', title: entry?.title ?? '', type: entry?.type ?? 'note', score }
+      })
+    },
+  }
+})
+
+const QUERIES = [
+  'atomic habits and focus',
+  'how do teams give better feedback',
+  'testing software architecture',
+  'memory',
+  'deep work productivity systems',
+]
+
+describeVaults((vault) => {
+  const keywordIndex = buildKeywordIndex(vault.notes)
+  const embeddings = createSyntheticEmbeddings(vault)
+  const vectorIndex = createVectorIndex(decodeEmbeddingsBinary(embeddings.buffer, embeddings.byteOffset, embeddings.byteLength))
+  let next = 0
+  const nextQuery = () => QUERIES[next++ % QUERIES.length] ?? ''
+
+  bench('buildKeywordIndex', () => {
+    buildKeywordIndex(vault.notes)
+  }, BUILD_OPTIONS)
+
+  bench('keywordSearch', () => {
+    keywordSearch(nextQuery(), keywordIndex, { limit: 10 })
+  })
+
+  bench('keywordSearch (type filter)', () => {
+    keywordSearch(nextQuery(), keywordIndex, { limit: 10, type: 'book' })
+  })
+
+  bench('hybridSearch', async () => {
+    semantic.index = vectorIndex
+    await hybridSearch(nextQuery(), keywordIndex, { limit: 10 })
+  })
+})
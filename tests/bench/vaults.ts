@@ -0,0 +1,22 @@
+/**
+ * Shared setup for the benchmark suite: one describe block per vault size.
+ *
+ * Sizes default to 1k/10k/50k notes and can be narrowed with
+ * BENCH_VAULT_SIZES=1000,10000 for a quicker local run.
+ */
+import { describe } from 'vitest'
+import { createSyntheticVault, getBenchVaultSizes, type SyntheticVault } from '../factories/vaultFactory'
+
+// Whole-vault builds take hundreds of ms at 50k notes, a few samples are enough
+export const BUILD_OPTIONS = { time: 0, iterations: 5, warmupTime: 0, warmupIterations: 1 }
+
+/**
+ * Register benchmarks against a synthetic vault of each configured size.
+ */
+export function describeVaults(register: (vault: SyntheticVault) => void): void {
+  for (const size of getBenchVaultSizes()) {
+    describe(`${size} notes`, () => {
+      register(createSyntheticVault(size))
+    })
+  }
+}
@@ -0,0 +1,364 @@
+/**
+ * Synthetic vault generator for benchmarks
+ *
+ * Produces deterministic vaults of any size in the shape the server
+ * utilities consume: minimark bodies with internal links, raw markdown,
+ * tags, authors, maps and search sections. Link targets are skewed
+ * towards early notes so the vault has hubs like a real one, and bodies
+ * mention other notes' titles in plain text so unlinked-mention
+ * detection has work to do.
+ *
+ * Usage:
+ * ```typescript
+ * import { createSyntheticVault } from '../factories/vaultFactory'
+ *
+ * const vault = createSyntheticVault(10_000)
+ * buildGraphFromContent(vault.notes)
+ * ```
+ */
+import type { ContentType } from '../../app/constants/contentTypes'
+import type { SearchSection } from '../../server/utils/mentions'
+import type { MinimarkNode } from '../../server/utils/minimark'
+import { encodeEmbeddingsBinary, type EmbeddingsDtype } from '../../shared/utils/embeddingsBinary'
+
+export interface SyntheticNote {
+  path: string
+  stem: string
+  title: string
+  type: ContentType
+  tags: string[]
+  authors: string[]
+  summary: string
+  body: { type: 'minimark', value: MinimarkNode[] }
+  rawbody: string
+  date?: string
+  rating?: number
+}
+
+export interface SyntheticAuthor {
+  slug: string
+  name: string
+}
+
+export interface SyntheticVault {
+  notes: SyntheticNote[]
+  sections: SearchSection[]
+  authors: SyntheticAuthor[]
+}
+
+export interface VaultOptions {
+  seed?: number
+  // Average internal links per (non-map) note
+  linksPerNote?: number
+  // Average plain-text mentions of other titles per note
+  mentionsPerNote?: number
+  // Share of notes that are maps
+  mapRatio?: number
+}
+
+export const VAULT_SIZES = [1_000, 10_000, 50_000]
+
+// Titles are unique up to ADJECTIVES × NOUNS × NOUNS notes
+const ADJECTIVES = [
+  'atomic', 'deep', 'lean', 'slow', 'clean', 'agile', 'quiet', 'modern', 'open', 'simple',
+  'applied', 'hidden', 'better', 'stable', 'rapid', 'mindful', 'digital', 'second', 'shared', 'visual',
+  'remote', 'early', 'small', 'daily', 'radical', 'public', 'private', 'elastic', 'reactive', 'durable',
+  'fast', 'plain', 'honest', 'useful', 'curious', 'gentle', 'robust', 'careful', 'creative', 'strategic',
+]
+
+const NOUNS = [
+  'habits', 'work', 'focus', 'systems', 'design', 'memory', 'notes', 'thinking', 'writing', 'learning',
+  'teams', 'software', 'testing', 'feedback', 'models', 'attention', 'leadership', 'decisions', 'knowledge', 'practice',
+  'architecture', 'refactoring', 'delivery', 'product', 'research', 'reading', 'productivity', 'communication', 'planning', 'review',
+  'patterns', 'components', 'state', 'performance', 'caching', 'search', 'graphs', 'indexes', 'compilers', 'types',
+  'motivation', 'health', 'sleep', 'creativity', 'strategy', 'markets', 'history', 'culture', 'ethics', 'language',
+  'debugging', 'interfaces', 'workflows', 'storytelling', 'mentoring', 'hiring', 'metrics', 'experiments', 'documentation', 'craft',
+]
+
+const TAGS = [
+  'productivity', 'software-engineering', 'ai', 'vue', 'nuxt', 'typescript', 'testing', 'architecture', 'psychology', 'habits',
+  'learning', 'writing', 'leadership', 'career', 'health', 'books', 'philosophy', 'design', 'performance', 'databases',
+  'javascript', 'css', 'devops', 'security', 'economics', 'history', 'science', 'management', 'startups', 'knowledge-management',
+]
+
+const FIRST_NAMES = ['Ada', 'Alan', 'Grace', 'Linus', 'Barbara', 'Donald', 'Margaret', 'Ken', 'Radia', 'Edsger', 'Frances', 'John', 'Sophie', 'Tim', 'Hedy', 'Dennis', 'Karen', 'Martin', 'Niklaus', 'Shafi']
+
+const LAST_NAMES = ['Lovelace', 'Turing', 'Hopper', 'Torvalds', 'Liskov', 'Knuth', 'Hamilton', 'Thompson', 'Perlman', 'Dijkstra', 'Allen', 'McCarthy', 'Wilson', 'Berners', 'Lamarr', 'Ritchie', 'Jones', 'Fowler', 'Wirth', 'Goldwasser', 'Kay', 'Lamport', 'Hoare', 'Backus', 'Milner', 'Stroustrup', 'Pike', 'Cerf', 'Kahn', 'Shannon']
+
+const WORDS = [
+  'the', 'a', 'of', 'and', 'to', 'in', 'is', 'that', 'for', 'it', 'with', 'as', 'on', 'this', 'by', 'we', 'be', 'are', 'or', 'not',
+  'idea', 'system', 'change', 'small', 'process', 'time', 'people', 'problem', 'result', 'simple', 'question', 'practice', 'value',
+  'context', 'example', 'feedback', 'pattern', 'model', 'goal', 'habit', 'focus', 'code', 'team', 'design', 'test', 'data', 'user',
+  'build', 'learn', 'improve', 'measure', 'write', 'read', 'connect', 'review', 'explain', 'compare', 'reduce', 'grow', 'ship',
+  'because', 'however', 'often', 'usually', 'quickly', 'slowly', 'clearly', 'rarely', 'together', 'instead', 'later', 'first',
+  'important', 'useful', 'hard', 'easy', 'better', 'worse', 'complex', 'clear', 'common', 'specific', 'long', 'short', 'shared',
+  'memory', 'attention', 'energy', 'structure', 'interface', 'boundary', 'state', 'signal', 'noise', 'cost', 'risk', 'trust',
+]
+
+const EXTERNAL_TYPES: readonly ContentType[] = ['book', 'article', 'podcast', 'youtube']
+
+// Rough mix of a personal knowledge base, maps are decided separately
+const TYPE_WEIGHTS: ReadonlyArray<[ContentType, number]> = [
+  ['note', 0.45],
+  ['evergreen', 0.1],
+  ['quote', 0.05],
+  ['book', 0.1],
+  ['article', 0.12],
+  ['podcast', 0.08],
+  ['youtube', 0.1],
+]
+
+const DAY_MS = 24 * 60 * 60 * 1000
+const DATE_EPOCH = Date.UTC(2019, 0, 1)
+const DATE_SPAN_DAYS = 6 * 365
+
+/**
+ * Seeded PRNG (mulberry32), so every run benchmarks the same vault.
+ */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0
+    let t = state
+    t = Math.imul(t ^ (t >>> 15), t | 1)
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61)
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296
+  }
+}
+
+type Random = () => number
+
+function pick<T>(random: Random, items: readonly T[]): T {
+  const item = items[Math.floor(random() * items.length)]
+  if (item === undefined) throw new Error('Cannot pick from an empty list')
+  return item
+}
+
+// Squaring skews picks towards the start of the list (hubs, common tags)
+function pickSkewed<T>(random: Random, items: readonly T[]): T {
+  return pick(() => random() ** 2, items)
+}
+
+function capitalize(word: string): string {
+  return word.charAt(0).toUpperCase() + word.slice(1)
+}
+
+function slugify(text: string): string {
+  return text.toLowerCase().replace(/[^a-z0-9]+/g, '-')
+}
+
+// Spreads consecutive indices over the whole title space
+function titleFor(index: number): string {
+  const space = ADJECTIVES.length * NOUNS.length * NOUNS.length
+  const scrambled = (index * 7919) % space
+  const adjective = ADJECTIVES[scrambled % ADJECTIVES.length] ?? ''
+  const noun = NOUNS[Math.floor(scrambled / ADJECTIVES.length) % NOUNS.length] ?? ''
+  const topic = NOUNS[Math.floor(scrambled / (ADJECTIVES.length * NOUNS.length))] ?? ''
+  return `${capitalize(adjective)} ${capitalize(noun)} of ${capitalize(topic)}`
+}
+
+function pickType(random: Random, mapRatio: number): ContentType {
+  if (random() < mapRatio) return 'map'
+  let roll = random()
+  for (const [type, weight] of TYPE_WEIGHTS) {
+    roll -= weight
+    if (roll < 0) return type
+  }
+  return 'note'
+}
+
+function sentence(random: Random, length: number): string {
+  const words = Array.from({ length }, () => pickSkewed(random, WORDS))
+  return `${capitalize(words.join(' '))}.`
+}
+
+function uniqueSample<T>(count: number, draw: () => T): T[] {
+  const values = new Set<T>()
+  for (let attempt = 0; values.size < count && attempt < count * 4; attempt++) {
+    values.add(draw())
+  }
+  return [...values]
+}
+
+interface NoteSeed {
+  slug: string
+  title: string
+  type: ContentType
+}
+
+interface Reference {
+  target: NoteSeed
+  linked: boolean
+}
+
+// Links and plain mentions of other notes, in body order
+function drawReferences(random: Random, seeds: NoteSeed[], self: number, options: Required<VaultOptions>): Reference[] {
+  const isMap = seeds[self]?.type === 'map'
+  const linkCount = isMap ? 20 + Math.floor(random() * 40) : Math.round(options.linksPerNote * (0.5 + random()))
+  const mentionCount = Math.round(options.mentionsPerNote * 2 * random())
+  const draw = isMap ? () => pick(random, seeds) : () => pickSkewed(random, seeds)
+  const others = (count: number) => uniqueSample(count, draw).filter(seed => seed !== seeds[self])
+
+  const references = [
+    ...others(linkCount).map(target => ({ target, linked: true })),
+    ...others(mentionCount).map(target => ({ target, linked: false })),
+  ]
+  return references.sort(() => random() - 0.5)
+}
+
+interface Paragraph {
+  heading?: string
+  nodes: Array<string | MinimarkNode>
+  text: string
+  markdown: string
+}
+
+function buildParagraph(random: Random, references: Reference[], heading?: string): Paragraph {
+  const opening = sentence(random, 8 + Math.floor(random() * 12))
+  const nodes: Array<string | MinimarkNode> = [opening]
+  const text = [opening]
+  const markdown = [opening]
+
+  for (const { target, linked } of references) {
+    const filler = ` ${sentence(random, 6 + Math.floor(random() * 10))}`
+    nodes.push(' ', linked ? ['a', { href: `/${target.slug}` }, target.title] : target.title, filler)
+    text.push(` ${target.title}${filler}`)
+    markdown.push(linked ? ` [[${target.slug}|${target.title}]]${filler}` : ` ${target.title}${filler}`)
+  }
+
+  return { heading, nodes, text: text.join(''), markdown: markdown.join('') }
+}
+
+function buildParagraphs(random: Random, references: Reference[]): Paragraph[] {
+  const count = 2 + Math.floor(random() * 3)
+  const perParagraph = Math.ceil(references.length / count)
+  return Array.from({ length: count }, (_, i) => buildParagraph(
+    random,
+    references.slice(i * perParagraph, (i + 1) * perParagraph),
+    i === 0 ? undefined : capitalize(`${pick(random, WORDS)} ${pick(random, NOUNS)}`),
+  ))
+}
+
+function toMinimark(paragraphs: Paragraph[]): MinimarkNode[] {
+  return paragraphs.flatMap((paragraph, i): MinimarkNode[] => {
+    const p: MinimarkNode = ['p', {}, ...paragraph.nodes]
+    return paragraph.heading ? [['h2', { id: `section-${i}` }, paragraph.heading], p] : [p]
+  })
+}
+
+function toMarkdown(seed: NoteSeed, tags: string[], paragraphs: Paragraph[]): string {
+  const frontmatter = `---\ntitle: ${seed.title}\ntype: ${seed.type}\ntags: [${tags.join(', ')}]\n---\n`
+  const body = paragraphs.map(p => (p.heading ? `## ${p.heading}\n\n${p.markdown}` : p.markdown))
+  return `${frontmatter}\n${body.join('\n\n')}\n`
+}
+
+function toSections(seed: NoteSeed, paragraphs: Paragraph[]): SearchSection[] {
+  return paragraphs.map((paragraph, i) => ({
+    id: paragraph.heading ? `/${seed.slug}#section-${i}` : `/${seed.slug}`,
+    title: paragraph.heading ?? seed.title,
+    titles: paragraph.heading ? [seed.title] : [],
+    content: paragraph.text,
+  }))
+}
+
+function consumptionFields(random: Random, type: ContentType): Pick<SyntheticNote, 'date' | 'rating'> {
+  if (!EXTERNAL_TYPES.includes(type)) return {}
+  const day = Math.floor(random() * DATE_SPAN_DAYS)
+  return {
+    date: new Date(DATE_EPOCH + day * DAY_MS).toISOString().slice(0, 10),
+    rating: random() < 0.8 ? 1 + Math.floor(random() * 10) : undefined,
+  }
+}
+
+function createAuthors(size: number): SyntheticAuthor[] {
+  const count = Math.min(FIRST_NAMES.length * LAST_NAMES.length, Math.max(20, Math.ceil(size / 20)))
+  return Array.from({ length: count }, (_, i) => {
+    const name = `${FIRST_NAMES[i % FIRST_NAMES.length]} ${LAST_NAMES[Math.floor(i / FIRST_NAMES.length)]}`
+    return { slug: slugify(name), name }
+  })
+}
+
+/**
+ * Generate a vault of `size` notes. The same size and options always
+ * produce the same vault.
+ */
+export function createSyntheticVault(size: number, options: VaultOptions = {}): SyntheticVault {
+  const resolved: Required<VaultOptions> = {
+    seed: 42,
+    linksPerNote: 6,
+    mentionsPerNote: 2,
+    mapRatio: 0.01,
+    ...options,
+  }
+  const random = createRandom(resolved.seed)
+  const authors = createAuthors(size)
+  const seeds: NoteSeed[] = Array.from({ length: size }, (_, i) => {
+    const title = titleFor(i)
+    return { slug: slugify(title), title, type: pickType(random, resolved.mapRatio) }
+  })
+
+  const sections: SearchSection[] = []
+  const notes = seeds.map((seed, i): SyntheticNote => {
+    const tags = uniqueSample(1 + Math.floor(random() * 4), () => pickSkewed(random, TAGS))
+    const noteAuthors = EXTERNAL_TYPES.includes(seed.type)
+      ? uniqueSample(1 + Math.floor(random() * 2), () => pickSkewed(random, authors).slug)
+      : []
+    const paragraphs = buildParagraphs(random, drawReferences(random, seeds, i, resolved))
+    sections.push(...toSections(seed, paragraphs))
+
+    return {
+      path: `/${seed.slug}`,
+      stem: seed.slug,
+      title: seed.title,
+      type: seed.type,
+      tags,
+      authors: noteAuthors,
+      summary: sentence(random, 10 + Math.floor(random() * 8)),
+      body: { type: 'minimark', value: toMinimark(paragraphs) },
+      rawbody: toMarkdown(seed, tags, paragraphs),
+      ...consumptionFields(random, seed.type),
+    }
+  })
+
+  return { notes, sections, authors }
+}
+
+/**
+ * Bag-of-words embedding via feature hashing. Texts that share words get
+ * similar vectors, which is enough to exercise vector search without
+ * loading the real model.
+ */
+export function hashEmbedding(text: string, dimensions = 384): Float32Array {
+  const vector = new Float32Array(dimensions)
+  for (const word of text.toLowerCase().split(/\W+/)) {
+    if (!word) continue
+    let hash = 2166136261
+    for (let i = 0; i < word.length; i++) hash = Math.imul(hash ^ word.charCodeAt(i), 16777619)
+    const slot = (hash >>> 1) % dimensions
+    vector[slot] = (vector[slot] ?? 0) + (hash & 1 ? 1 : -1)
+  }
+
+  const norm = Math.hypot(...vector) || 1
+  return vector.map(value => value / norm)
+}
+
+/**
+ * Encode the vault as an embeddings.bin artifact, one row per note.
+ */
+export function createSyntheticEmbeddings(vault: SyntheticVault, dtype: EmbeddingsDtype = 'int8', dimensions = 384): Uint8Array {
+  const manifest = {
+    version: '1.0.0',
+    model: 'synthetic-hash',
+    entries: vault.notes.map(({ stem, title, type }) => ({ slug: stem, title, type })),
+  }
+  const vectors = vault.notes.map(note => hashEmbedding(`${note.title} ${note.summary} ${note.tags.join(' ')}`, dimensions))
+  return encodeEmbeddingsBinary(manifest, vectors, dtype)
+}
+
+/**
+ * Vault sizes to benchmark, overridable with BENCH_VAULT_SIZES=1000,10000.
+ */
+export function getBenchVaultSizes(env: string | undefined = process.env.BENCH_VAULT_SIZES): number[] {
+  const sizes = (env ?? '').split(',').map(Number).filter(size => Number.isInteger(size) && size > 0)
+  return sizes.length ? sizes : VAULT_SIZES
+}
@@ -19,6 +19,8 @@ import {
   sortItems,
   paginateItems,
   calculateTotalPages,
+  parsePageSize,
+  DEFAULT_PAGE_SIZE,
   isValidColumn,
   isValidDirection,
   toStringArray,
@@ -978,6 +980,19 @@ describe('useContentTable', () => {
     })
   })
 
+  describe('parsePageSize', () => {
+    it('accepts the offered page sizes', () => {
+      expect(parsePageSize('100')).toBe(100)
+      expect(parsePageSize('500')).toBe(500)
+    })
+
+    it('falls back to the default for missing or unknown sizes', () => {
+      expect(parsePageSize(null)).toBe(DEFAULT_PAGE_SIZE)
+      expect(parsePageSize('42')).toBe(DEFAULT_PAGE_SIZE)
+      expect(parsePageSize('abc')).toBe(DEFAULT_PAGE_SIZE)
+    })
+  })
+
   describe('isValidColumn', () => {
     it('returns true for valid column "title"', () => {
       expect(isValidColumn('title')).toBe(true)
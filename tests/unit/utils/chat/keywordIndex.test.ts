@@ -0,0 +1,127 @@
+import { describe, expect, it } from 'vitest'
+import {
+  MAX_PREFIX_EXPANSIONS,
+  PREFIX_MATCH_WEIGHT,
+  buildKeywordIndex,
+  expandKeyword,
+  getKeywordDocument,
+  searchKeywordIndex,
+  tokenize,
+} from '../../../../server/utils/chat/keywordIndex'
+import type { RawNote } from '../../../../server/utils/chat/search'
+
+const notes: RawNote[] = [
+  { title: 'Vue Reactivity', stem: 'vue-reactivity', path: '/vue-reactivity', tags: ['vue'], type: 'note' },
+  { title: 'Composables', stem: 'composables', path: '/composables', summary: 'Reusable Vue logic', type: 'note' },
+  { title: 'Vitest Guide', stem: 'vitest-guide', path: '/vitest-guide', tags: ['testing'], type: 'book' },
+  {
+    title: 'Signals',
+    stem: 'signals',
+    path: '/signals',
+    type: 'article',
+    rawbody: '---\ntitle: Signals\ntags: [vue]\n---\nFine-grained reactivity beyond the vue virtual DOM.',
+  },
+]
+
+const slugsOf = (hits: Array<{ document: { slug: string } }>) => hits.map(hit => hit.document.slug)
+
+describe('server/utils/chat/keywordIndex', () => {
+  describe('tokenize', () => {
+    it('lowercases, strips punctuation and keeps hyphens', () => {
+      expect(tokenize('Server-Side Rendering, in Vue.js!')).toEqual(['server-side', 'rendering', 'in', 'vue', 'js'])
+    })
+  })
+
+  describe('buildKeywordIndex', () => {
+    const index = buildKeywordIndex(notes)
+
+    it('indexes every note with metadata', () => {
+      expect(index.documents).toHaveLength(4)
+      expect(getKeywordDocument(index, 'composables')).toEqual({
+        slug: 'composables',
+        title: 'Composables',
+        summary: 'Reusable Vue logic',
+        path: '/composables',
+        type: 'note',
+      })
+      expect(getKeywordDocument(index, 'nope')).toBeUndefined()
+    })
+
+    it('keeps a sorted vocabulary', () => {
+      expect(index.terms).toEqual([...index.terms].sort())
+    })
+
+    it('counts documents per type', () => {
+      expect(Object.fromEntries(index.typeCounts)).toEqual({ note: 2, book: 1, article: 1 })
+    })
+
+    it('does not index frontmatter', () => {
+      expect(index.postings.has('title')).toBe(false)
+    })
+  })
+
+  describe('expandKeyword', () => {
+    const index = buildKeywordIndex(notes)
+
+    it('returns the exact term first, then prefix matches', () => {
+      expect(expandKeyword(index, 'vue')).toEqual([{ term: 'vue', weight: 1 }])
+      expect(expandKeyword(index, 'vi')).toEqual([
+        { term: 'virtual', weight: PREFIX_MATCH_WEIGHT },
+        { term: 'vitest', weight: PREFIX_MATCH_WEIGHT },
+      ])
+    })
+
+    it(`caps expansions at ${MAX_PREFIX_EXPANSIONS}`, () => {
+      const many = buildKeywordIndex([{ stem: 'many', title: Array.from({ length: 50 }, (_, i) => `term${i}`).join(' ') }])
+
+      expect(expandKeyword(many, 'term')).toHaveLength(MAX_PREFIX_EXPANSIONS)
+    })
+
+    it('keeps the most frequent terms when capping, not the first ones', () => {
+      const filler = Array.from({ length: 40 }, (_, i) => `term${String(i).padStart(2, '0')}`).join(' ')
+      const frequent = Array.from({ length: 3 }, (_, i) => ({ stem: `frequent-${i}`, title: 'termz' }))
+      const capped = buildKeywordIndex([{ stem: 'filler', title: filler }, ...frequent, { stem: 'exact', title: 'term' }])
+      const terms = expandKeyword(capped, 'term').map(match => match.term)
+
+      expect(terms).toHaveLength(MAX_PREFIX_EXPANSIONS)
+      expect(terms[0]).toBe('term')
+      expect(terms).toContain('termz')
+    })
+  })
+
+  describe('searchKeywordIndex', () => {
+    const index = buildKeywordIndex(notes)
+
+    it('ranks tag and title matches above summary and body matches', () => {
+      expect(slugsOf(searchKeywordIndex(index, ['vue'], { limit: 10 }))).toEqual(['vue-reactivity', 'composables', 'signals'])
+    })
+
+    it('matches prefixes', () => {
+      expect(slugsOf(searchKeywordIndex(index, ['composa'], { limit: 10 }))).toEqual(['composables'])
+    })
+
+    it('sums scores across keywords', () => {
+      const [first] = searchKeywordIndex(index, ['reactivity', 'fine-grained'], { limit: 10 })
+
+      expect(first?.document.slug).toBe('signals')
+    })
+
+    it('filters by type before scoring', () => {
+      expect(slugsOf(searchKeywordIndex(index, ['vue'], { limit: 10, type: 'article' }))).toEqual(['signals'])
+      expect(searchKeywordIndex(index, ['vue'], { limit: 10, type: 'podcast' })).toEqual([])
+    })
+
+    it('respects the limit', () => {
+      expect(searchKeywordIndex(index, ['vue'], { limit: 1 })).toHaveLength(1)
+      expect(searchKeywordIndex(index, ['vue'], { limit: 0 })).toEqual([])
+    })
+
+    it('ignores duplicate keywords', () => {
+      expect(searchKeywordIndex(index, ['vue', 'vue'], { limit: 10 })).toEqual(searchKeywordIndex(index, ['vue'], { limit: 10 }))
+    })
+
+    it('returns nothing for unmatched keywords', () => {
+      expect(searchKeywordIndex(index, ['python'], { limit: 10 })).toEqual([])
+    })
+  })
+})
@@ -1,12 +1,11 @@
 import { describe, expect, it } from 'vitest'
 import {
   extractKeywords,
-  matchesTag,
-  scoreNote,
-  filterAndScoreNotes,
   formatNoteContent,
   formatSearchResults,
+  keywordSearch,
 } from '../../../../server/utils/chat/search'
+import { buildKeywordIndex } from '../../../../server/utils/chat/keywordIndex'
 import type { RawNote } from '../../../../server/utils/chat/search'
 
 describe('extractKeywords', () => {
@@ -48,93 +47,26 @@ describe('extractKeywords', () => {
   })
 })
 
-describe('matchesTag', () => {
-  it('matches exact tag', () => {
-    expect(matchesTag(['vue', 'typescript'], 'vue')).toBe(true)
-  })
-
-  it('matches partial tag (keyword in tag)', () => {
-    expect(matchesTag(['typescript', 'javascript'], 'script')).toBe(true)
-  })
-
-  it('matches partial tag (tag in keyword)', () => {
-    // 'type' is a substring of 'typescript'
-    expect(matchesTag(['vue', 'type'], 'typescript')).toBe(true)
-  })
-
-  it('returns false when no match', () => {
-    expect(matchesTag(['vue', 'typescript'], 'react')).toBe(false)
-  })
-
-  it('handles empty tags array', () => {
-    expect(matchesTag([], 'vue')).toBe(false)
-  })
-})
-
-describe('scoreNote', () => {
-  it('scores title matches with weight 2', () => {
-    const note: RawNote = { title: 'Vue Reactivity Guide', tags: [] }
-    expect(scoreNote(note, ['vue'])).toBe(2)
-  })
-
-  it('scores summary matches with weight 1', () => {
-    const note: RawNote = { title: 'Other', summary: 'Learn about vue', tags: [] }
-    expect(scoreNote(note, ['vue'])).toBe(1)
-  })
-
-  it('scores tag matches with weight 3', () => {
-    const note: RawNote = { title: 'Other', tags: ['vue'] }
-    expect(scoreNote(note, ['vue'])).toBe(3)
-  })
-
-  it('accumulates scores across fields', () => {
-    const note: RawNote = {
-      title: 'Vue Patterns',
-      summary: 'Vue reactivity',
-      tags: ['vue'],
-    }
-    expect(scoreNote(note, ['vue'])).toBe(2 + 1 + 3) // title + summary + tag
-  })
-
-  it('accumulates scores across multiple keywords', () => {
-    const note: RawNote = { title: 'Vue TypeScript Guide', tags: [] }
-    expect(scoreNote(note, ['vue', 'typescript'])).toBe(4) // 2 + 2
-  })
-
-  it('returns 0 for no matches', () => {
-    const note: RawNote = { title: 'React Guide', tags: ['react'] }
-    expect(scoreNote(note, ['vue'])).toBe(0)
-  })
-
-  it('handles missing fields gracefully', () => {
-    const note: RawNote = {}
-    expect(scoreNote(note, ['vue'])).toBe(0)
-  })
-})
-
-describe('filterAndScoreNotes', () => {
-  const sampleNotes: RawNote[] = [
-    { title: 'Vue Basics', stem: 'vue-basics', path: '/vue-basics', tags: ['vue'] },
-    { title: 'React Intro', stem: 'react-intro', path: '/react-intro', tags: ['react'] },
-    { title: 'TypeScript Guide', stem: 'typescript-guide', path: '/typescript-guide', tags: ['typescript', 'vue'] },
-    { title: 'Angular Tips', stem: 'angular-tips', path: '/angular-tips', tags: ['angular'] },
-  ]
+describe('keywordSearch', () => {
+  const index = buildKeywordIndex([
+    { title: 'Vue Basics', stem: 'vue-basics', path: '/vue-basics', tags: ['vue'], type: 'note' },
+    { title: 'React Intro', stem: 'react-intro', path: '/react-intro', tags: ['react'], type: 'note' },
+    { title: 'TypeScript Guide', stem: 'typescript-guide', path: '/typescript-guide', tags: ['typescript', 'vue'], type: 'book' },
+    { title: 'Angular Tips', stem: 'angular-tips', path: '/angular-tips', tags: ['angular'], type: 'note' },
+  ])
 
   it('filters and returns matching notes', () => {
-    const result = filterAndScoreNotes(sampleNotes, ['vue'], 10)
-    expect(result.length).toBe(2)
-    expect(result.map(n => n.title)).toContain('Vue Basics')
-    expect(result.map(n => n.title)).toContain('TypeScript Guide')
+    const result = keywordSearch('vue', index, { limit: 10 })
+    expect(result.map(n => n.title)).toEqual(['Vue Basics', 'TypeScript Guide'])
   })
 
-  it('sorts by score descending', () => {
-    const result = filterAndScoreNotes(sampleNotes, ['vue'], 10)
-    // Vue Basics has title + tag match, TypeScript Guide has only tag match
-    expect(result[0].title).toBe('Vue Basics')
+  it('filters by type', () => {
+    const result = keywordSearch('vue', index, { limit: 10, type: 'book' })
+    expect(result.map(n => n.title)).toEqual(['TypeScript Guide'])
   })
 
   it('respects limit parameter', () => {
-    const result = filterAndScoreNotes(sampleNotes, ['vue'], 1)
+    const result = keywordSearch('vue', index, { limit: 1 })
     expect(result.length).toBe(1)
   })
 
@@ -145,28 +77,22 @@ describe('filterAndScoreNotes', () => {
       path: `/vue-note-${i}`,
       tags: ['vue'],
     }))
-    const result = filterAndScoreNotes(manyNotes, ['vue'], 100)
+    const result = keywordSearch('vue', buildKeywordIndex(manyNotes), { limit: 100 })
     expect(result.length).toBe(10)
   })
 
-  it('excludes notes with score 0', () => {
-    const result = filterAndScoreNotes(sampleNotes, ['python'], 10)
-    expect(result.length).toBe(0)
+  it('returns nothing when no keyword matches', () => {
+    expect(keywordSearch('python', index, { limit: 10 })).toEqual([])
   })
 
   it('returns correct NoteContext shape', () => {
-    const result = filterAndScoreNotes(sampleNotes, ['vue'], 1)
-    expect(result[0]).toHaveProperty('title')
-    expect(result[0]).toHaveProperty('summary')
-    expect(result[0]).toHaveProperty('path')
+    const result = keywordSearch('react', index)
+    expect(result).toEqual([{ title: 'React Intro', summary: null, path: '/react-intro' }])
   })
 
   it('uses stem as fallback for title', () => {
-    const notesWithoutTitle: RawNote[] = [
-      { stem: 'my-note', path: '/my-note', tags: ['vue'] },
-    ]
-    const result = filterAndScoreNotes(notesWithoutTitle, ['vue'], 10)
-    expect(result[0].title).toBe('my-note')
+    const result = keywordSearch('vue', buildKeywordIndex([{ stem: 'my-note', path: '/my-note', tags: ['vue'] }]))
+    expect(result[0]?.title).toBe('my-note')
   })
 })
 
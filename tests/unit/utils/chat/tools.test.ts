@@ -0,0 +1,23 @@
+import { describe, expect, it } from 'vitest'
+import { isSearchNotesInput } from '../../../../server/utils/chat/tools'
+
+describe('isSearchNotesInput', () => {
+  it('accepts a query with or without a limit', () => {
+    expect(isSearchNotesInput({ query: 'rust' })).toBe(true)
+    expect(isSearchNotesInput({ query: 'rust', limit: 5, mode: 'semantic' })).toBe(true)
+    expect(isSearchNotesInput({ query: 'rust', limit: undefined })).toBe(true)
+  })
+
+  it('rejects inputs without a string query', () => {
+    expect(isSearchNotesInput(null)).toBe(false)
+    expect(isSearchNotesInput('rust')).toBe(false)
+    expect(isSearchNotesInput({ limit: 5 })).toBe(false)
+    expect(isSearchNotesInput({ query: 42 })).toBe(false)
+  })
+
+  it('rejects limits that are not positive integers', () => {
+    for (const limit of [2.5, 0, -1, Number.NaN, Infinity, '5', null]) {
+      expect(isSearchNotesInput({ query: 'rust', limit })).toBe(false)
+    }
+  })
+})
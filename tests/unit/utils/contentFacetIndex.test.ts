@@ -0,0 +1,142 @@
+import { describe, it, expect } from 'vitest'
+import {
+  buildContentFacetIndex,
+  countBits,
+  countFacetValues,
+  countIntersection,
+  createBitset,
+  getSortOrder,
+  hasBit,
+  matchFacets,
+  matchFilters,
+  selectRows,
+  setBit,
+} from '../../../app/utils/contentFacetIndex'
+import { applyAllFilters, applyFiltersExcept, sortItems } from '../../../app/utils/contentTableLogic'
+import type { FilterState, SortState, TableContentItem } from '../../../app/types/table'
+
+const items: TableContentItem[] = [
+  { slug: 'a', title: 'Book A', type: 'book', authors: [{ slug: 'a1', name: 'Author 1' }], tags: ['tech', 'ai'], date: '2024-06-15', rating: 8 },
+  { slug: 'b', title: 'Podcast B', type: 'podcast', authors: [{ slug: 'a2', name: 'Author 2' }], tags: ['business'], date: '2024-03-15', rating: 6 },
+  { slug: 'c', title: 'Article C', type: 'article', authors: [{ slug: 'a1', name: 'Author 1' }], tags: ['tech'], date: '2024-09-15', rating: 9 },
+  { slug: 'd', title: 'Book D', type: 'book', authors: [], tags: [], date: undefined, rating: undefined },
+  { slug: 'e', title: 'Book A', type: 'book', authors: [{ slug: 'a2', name: 'Author 2' }, { slug: 'a3', name: 'Author 3' }], tags: ['ai'], date: '2024-06-15', rating: 8 },
+]
+
+function rowsFor(filters: FilterState, column: SortState['column'], direction: SortState['direction']): TableContentItem[] {
+  const index = buildContentFacetIndex(items)
+  return selectRows(index, matchFilters(index, filters), getSortOrder(index, column, direction), 0, items.length)
+}
+
+describe('app/utils/contentFacetIndex', () => {
+  describe('bitsets', () => {
+    it('sets, reads and counts bits across words', () => {
+      const bits = createBitset(70)
+      setBit(bits, 0)
+      setBit(bits, 31)
+      setBit(bits, 69)
+
+      expect(bits).toHaveLength(3)
+      expect([hasBit(bits, 0), hasBit(bits, 1), hasBit(bits, 31), hasBit(bits, 69)]).toEqual([true, false, true, true])
+      expect(countBits(bits)).toBe(3)
+    })
+
+    it('fills only the requested number of bits', () => {
+      expect(countBits(createBitset(70, true))).toBe(70)
+      expect(countBits(createBitset(64, true))).toBe(64)
+      expect(countBits(createBitset(0, true))).toBe(0)
+    })
+
+    it('counts an intersection', () => {
+      const a = createBitset(40)
+      const b = createBitset(40)
+      for (const i of [1, 5, 33]) setBit(a, i)
+      for (const i of [5, 33, 39]) setBit(b, i)
+
+      expect(countIntersection(a, b)).toBe(2)
+    })
+  })
+
+  describe('matchFilters', () => {
+    const cases: FilterState[] = [
+      {},
+      { type: ['book'] },
+      { type: ['book', 'podcast'] },
+      { type: ['tweet'] },
+      { tags: ['ai', 'business'] },
+      { tags: ['unknown'] },
+      { authors: ['a2'] },
+      { type: ['book'], tags: ['ai'], authors: ['a1', 'a3'] },
+      { dateConsumedRange: ['2024-06-01', '2024-12-31'] },
+      { ratingRange: [7, 10] },
+      { type: ['book'], dateConsumedRange: ['2024-01-01', '2024-12-31'], ratingRange: [1, 8] },
+    ]
+
+    it.each(cases)('matches applyAllFilters for %o', (filters) => {
+      const index = buildContentFacetIndex(items)
+      const matches = matchFilters(index, filters)
+      const expected = applyAllFilters(items, filters)
+
+      expect(items.filter((_, i) => hasBit(matches, i))).toEqual(expected)
+      expect(countBits(matches)).toBe(expected.length)
+    })
+
+    it('matches applyFiltersExcept when ignoring a facet', () => {
+      const index = buildContentFacetIndex(items)
+      const filters: FilterState = { type: ['book'], tags: ['tech'], authors: ['a1'] }
+
+      for (const facet of ['type', 'tags', 'authors'] as const) {
+        const matches = matchFacets(index, filters, facet)
+        expect(items.filter((_, i) => hasBit(matches, i))).toEqual(applyFiltersExcept(items, filters, facet))
+      }
+    })
+  })
+
+  describe('countFacetValues', () => {
+    it('counts values that still have rows under the other facets', () => {
+      const index = buildContentFacetIndex(items)
+      const filters: FilterState = { type: ['book'], tags: ['tech'] }
+
+      expect(countFacetValues(index, filters, 'tags')).toEqual(new Map([['tech', 1], ['ai', 2]]))
+      expect(countFacetValues(index, filters, 'type')).toEqual(new Map([['book', 1], ['article', 1]]))
+      expect(countFacetValues(index, filters, 'authors')).toEqual(new Map([['a1', 1]]))
+    })
+
+    it('keeps the first author object per slug', () => {
+      const index = buildContentFacetIndex(items)
+
+      expect(index.authors.get('a2')).toBe(items[1]?.authors[0])
+      expect([...index.authors.keys()]).toEqual(['a1', 'a2', 'a3'])
+    })
+  })
+
+  describe('getSortOrder', () => {
+    const columns: Array<SortState['column']> = ['title', 'type', 'dateConsumed', 'rating']
+
+    it.each(columns)('matches sortItems for %s in both directions', (column) => {
+      for (const direction of ['asc', 'desc'] as const) {
+        expect(rowsFor({}, column, direction)).toEqual(sortItems(items, column, direction))
+      }
+    })
+
+    it('caches orders per column and direction', () => {
+      const index = buildContentFacetIndex(items)
+
+      expect(getSortOrder(index, 'rating', 'asc')).toBe(getSortOrder(index, 'rating', 'asc'))
+      expect(getSortOrder(index, 'rating', 'desc')).not.toBe(getSortOrder(index, 'rating', 'asc'))
+    })
+  })
+
+  describe('selectRows', () => {
+    it('returns one page of matching rows in sort order', () => {
+      const index = buildContentFacetIndex(items)
+      const matches = matchFilters(index, { type: ['book'] })
+      const order = getSortOrder(index, 'title', 'asc')
+      const sorted = sortItems(applyAllFilters(items, { type: ['book'] }), 'title', 'asc')
+
+      expect(selectRows(index, matches, order, 0, 2)).toEqual(sorted.slice(0, 2))
+      expect(selectRows(index, matches, order, 2, 2)).toEqual(sorted.slice(2, 4))
+      expect(selectRows(index, matches, order, 10, 2)).toEqual([])
+    })
+  })
+})
@@ -0,0 +1,139 @@
+import { describe, expect, it } from 'vitest'
+import {
+  EMBEDDINGS_MAGIC,
+  decodeEmbeddingsBinary,
+  embeddingsFromJson,
+  encodeEmbeddingsBinary,
+  getRowVector,
+  quantizeRow,
+  type EmbeddingsManifest,
+} from '../../../shared/utils/embeddingsBinary'
+
+const manifest: EmbeddingsManifest = {
+  version: '1.1.0',
+  model: 'test-model',
+  entries: [
+    { slug: 'a', title: 'Note A', type: 'note', hash: 'h1' },
+    { slug: 'b', title: 'Note B', type: 'book' },
+  ],
+}
+
+const vectors = [
+  [0.6, 0.8, 0],
+  [0, -0.6, 0.8],
+]
+
+describe('shared/utils/embeddingsBinary', () => {
+  describe('quantizeRow', () => {
+    it('maps the largest magnitude to ±127', () => {
+      const { values, scale } = quantizeRow([0.5, -1, 0.25])
+
+      expect(Array.from(values)).toEqual([64, -127, 32])
+      expect(scale).toBeCloseTo(1 / 127)
+    })
+
+    it('handles zero vectors', () => {
+      const { values, scale } = quantizeRow([0, 0])
+
+      expect(Array.from(values)).toEqual([0, 0])
+      expect(scale).toBe(1)
+    })
+  })
+
+  describe('encode/decode', () => {
+    it('round-trips float32 matrices exactly', () => {
+      const decoded = decodeEmbeddingsBinary(encodeEmbeddingsBinary(manifest, vectors, 'float32').buffer)
+
+      expect(decoded.dtype).toBe('float32')
+      expect(decoded.count).toBe(2)
+      expect(decoded.dimensions).toBe(3)
+      expect(decoded.manifest).toEqual(manifest)
+      expect(Array.from(getRowVector(decoded, 1))).toEqual(Array.from(new Float32Array(vectors[1] ?? [])))
+    })
+
+    it('round-trips int8 matrices within quantization error', () => {
+      const decoded = decodeEmbeddingsBinary(encodeEmbeddingsBinary(manifest, vectors).buffer)
+
+      expect(decoded.dtype).toBe('int8')
+      expect(decoded.data).toBeInstanceOf(Int8Array)
+      getRowVector(decoded, 0).forEach((value, i) => {
+        expect(value).toBeCloseTo(vectors[0]?.[i] ?? 0, 2)
+      })
+    })
+
+    it('views the input buffer without copying when aligned', () => {
+      const encoded = encodeEmbeddingsBinary(manifest, vectors, 'float32')
+      const decoded = decodeEmbeddingsBinary(encoded.buffer)
+
+      expect(decoded.data.buffer).toBe(encoded.buffer)
+    })
+
+    it('copies when the matrix is not 4-byte aligned', () => {
+      const encoded = encodeEmbeddingsBinary(manifest, vectors, 'float32')
+      const shifted = new Uint8Array(encoded.byteLength + 1)
+      shifted.set(encoded, 1)
+
+      const decoded = decodeEmbeddingsBinary(shifted.buffer, 1)
+
+      expect(decoded.data.buffer).not.toBe(shifted.buffer)
+      expect(Array.from(getRowVector(decoded, 0))).toEqual([0.6, 0.8, 0].map(Math.fround))
+    })
+
+    it('rejects mismatched vector counts', () => {
+      expect(() => encodeEmbeddingsBinary(manifest, [[1, 0, 0]])).toThrow('Manifest has 2 entries')
+    })
+
+    it('rejects ragged vectors', () => {
+      expect(() => encodeEmbeddingsBinary(manifest, [[1, 0, 0], [1, 0]])).toThrow('Vector length mismatch')
+    })
+
+    it('rejects truncated or foreign buffers', () => {
+      const encoded = encodeEmbeddingsBinary(manifest, vectors)
+
+      expect(() => decodeEmbeddingsBinary(new ArrayBuffer(8))).toThrow('truncated header')
+      expect(() => decodeEmbeddingsBinary(encoded.buffer.slice(0, encoded.byteLength - 1))).toThrow('truncated matrix')
+      expect(() => decodeEmbeddingsBinary(new TextEncoder().encode('{"version":"1","model":"m","embeddings":{}}').buffer)).toThrow('bad magic')
+    })
+
+    it('rejects unknown format versions', () => {
+      const encoded = encodeEmbeddingsBinary(manifest, vectors)
+      new DataView(encoded.buffer).setUint32(4, 99, true)
+
+      expect(() => decodeEmbeddingsBinary(encoded.buffer)).toThrow('version: 99')
+    })
+
+    it('writes the magic number first', () => {
+      const encoded = encodeEmbeddingsBinary(manifest, vectors)
+
+      expect(new DataView(encoded.buffer).getUint32(0, true)).toBe(EMBEDDINGS_MAGIC)
+    })
+  })
+
+  describe('embeddingsFromJson', () => {
+    it('packs the legacy format into a float32 matrix', () => {
+      const matrix = embeddingsFromJson({
+        version: '1.0.0',
+        model: 'test-model',
+        embeddings: {
+          a: { vector: [1, 0], title: 'A', type: 'note' },
+          b: { vector: [0, 1], title: 'B', type: 'book', hash: 'x' },
+        },
+      })
+
+      expect(matrix.count).toBe(2)
+      expect(matrix.manifest.entries.map(e => e.slug)).toEqual(['a', 'b'])
+      expect(Array.from(getRowVector(matrix, 1))).toEqual([0, 1])
+    })
+
+    it('rejects ragged vectors', () => {
+      expect(() => embeddingsFromJson({
+        version: '1.0.0',
+        model: 'test-model',
+        embeddings: {
+          a: { vector: [1, 0], title: 'A', type: 'note' },
+          b: { vector: [1], title: 'B', type: 'note' },
+        },
+      })).toThrow('Vector length mismatch')
+    })
+  })
+})
@@ -0,0 +1,178 @@
+import { describe, it, expect } from 'vitest'
+import { createConnectionRadiusScale, createClusteringForce, FREEFORM_SIZE_RANGE, type ForceNode } from '../../../shared/utils/graphForces'
+import {
+  applyPositions,
+  createLayoutSimulation,
+  hasLayout,
+  packPositions,
+  settleSimulation,
+  stepSimulation,
+  toForceNode,
+  toLayoutEdge,
+  translateNodes,
+} from '../../../shared/utils/graphLayout'
+import { withSettledPositions } from '../../../server/utils/graphPositions'
+import type { GraphData } from '../../../server/utils/graph'
+
+function createNodes(): ForceNode[] {
+  return [
+    { id: 'map', isMap: true, connections: 2 },
+    { id: 'a', maps: ['map'], connections: 1 },
+    { id: 'b', maps: ['map'], connections: 1 },
+  ]
+}
+
+const edges = [
+  { source: 'map', target: 'a' },
+  { source: 'map', target: 'b' },
+]
+
+const graphData: GraphData = {
+  nodes: [
+    { id: 'map', title: 'Map', type: 'map', tags: [], authors: [], connections: 2, maps: [], isMap: true },
+    { id: 'a', title: 'A', type: 'note', tags: [], authors: [], connections: 1, maps: ['map'], isMap: false },
+    { id: 'b', title: 'B', type: 'note', tags: [], authors: [], connections: 1, maps: ['map'], isMap: false },
+  ],
+  edges: [{ source: 'map', target: 'a' }, { source: 'map', target: 'b' }],
+}
+
+describe('shared/utils/graphForces', () => {
+  it('scales radii by connections within the freeform range', () => {
+    const radius = createConnectionRadiusScale(10)
+
+    expect(radius(0)).toBe(FREEFORM_SIZE_RANGE[0])
+    expect(radius(10)).toBe(FREEFORM_SIZE_RANGE[1])
+    expect(createConnectionRadiusScale(0)(1)).toBe(FREEFORM_SIZE_RANGE[1])
+  })
+
+  it('pulls map members towards their map', () => {
+    const nodes: ForceNode[] = [
+      { id: 'map', isMap: true, x: 100, y: 0 },
+      { id: 'a', maps: ['map', 'missing'], x: 0, y: 0 },
+      { id: 'b', maps: ['missing'], x: 0, y: 0 },
+      { id: 'c', x: 0, y: 0 },
+    ]
+
+    createClusteringForce(nodes)(1)
+
+    expect(nodes[1]?.vx).toBeCloseTo(15)
+    expect(nodes[2]?.vx).toBeUndefined()
+    expect(nodes[3]?.vx).toBeUndefined()
+  })
+})
+
+describe('shared/utils/graphLayout', () => {
+  it('creates radial and freeform simulations with per-node radii', () => {
+    const options = { width: 200, height: 100, radii: [10, 8, 8] }
+    const radial = createLayoutSimulation(createNodes(), edges.map(e => ({ ...e })), { ...options, mode: 'radial' })
+    const freeform = createLayoutSimulation(createNodes(), edges.map(e => ({ ...e })), { ...options, mode: 'freeform' })
+    radial.stop()
+    freeform.stop()
+
+    expect(radial.force('radial')).toBeTruthy()
+    expect(freeform.force('cluster')).toBeTruthy()
+    expect(freeform.force('radial')).toBeFalsy()
+  })
+
+  it('steps a simulation within a time budget', () => {
+    const simulation = createLayoutSimulation(createNodes(), edges.map(e => ({ ...e })), {
+      mode: 'freeform',
+      width: 0,
+      height: 0,
+      radii: [],
+    }).stop()
+    let clock = 0
+
+    expect(stepSimulation(simulation, 5, () => clock++)).toBe(true)
+    expect(stepSimulation(simulation, Infinity)).toBe(false)
+  })
+
+  it('settles a simulation synchronously', () => {
+    const simulation = createLayoutSimulation(createNodes(), edges.map(e => ({ ...e })), {
+      mode: 'freeform',
+      width: 0,
+      height: 0,
+      radii: [10, 8, 8],
+    })
+
+    settleSimulation(simulation)
+
+    expect(simulation.alpha()).toBeLessThan(simulation.alphaMin())
+  })
+
+  it('round-trips positions through an interleaved buffer', () => {
+    const nodes: ForceNode[] = [{ id: 'a', x: 1, y: 2 }, { id: 'b' }]
+    const positions = packPositions(nodes)
+
+    expect(Array.from(positions)).toEqual([1, 2, 0, 0])
+
+    const target: ForceNode[] = [{ id: 'a' }, { id: 'b', x: 5, y: 6 }]
+    applyPositions(target, new Float32Array([3, 4]))
+
+    expect(target).toEqual([{ id: 'a', x: 3, y: 4 }, { id: 'b', x: 5, y: 6 }])
+  })
+
+  it('detects complete layouts and translates them', () => {
+    const nodes: ForceNode[] = [{ id: 'a', x: 1, y: 2 }, { id: 'b', x: -1, y: 0 }]
+
+    expect(hasLayout(nodes)).toBe(true)
+    expect(hasLayout([])).toBe(false)
+    expect(hasLayout([{ id: 'a', x: 1 }])).toBe(false)
+
+    translateNodes([...nodes, { id: 'c' }], 10, 20)
+
+    expect(nodes.map(n => [n.x, n.y])).toEqual([[11, 22], [9, 20]])
+  })
+
+  it('serializes nodes and edges for the worker', () => {
+    const node = { id: 'a', title: 'A', isMap: false, maps: ['m'], connections: 2, x: 1, y: 2, vx: 3 }
+
+    expect(toForceNode(node)).toEqual({
+      id: 'a',
+      isCenter: undefined,
+      level: undefined,
+      isMap: false,
+      maps: ['m'],
+      connections: 2,
+      x: 1,
+      y: 2,
+    })
+    expect(toLayoutEdge({ source: { id: 'a' }, target: 'b', level: 2 })).toEqual({ source: 'a', target: 'b', level: 2 })
+    expect(toLayoutEdge({ source: 'a', target: { id: 'b' } })).toEqual({ source: 'a', target: 'b', level: undefined })
+  })
+})
+
+describe('server/utils/graphPositions', () => {
+  it('adds settled, rounded positions without touching the input', () => {
+    const positioned = withSettledPositions(graphData)
+
+    expect(positioned.nodes.map(n => n.id)).toEqual(['map', 'a', 'b'])
+    expect(positioned.edges).toBe(graphData.edges)
+    expect(hasLayout(positioned.nodes)).toBe(true)
+    for (const node of positioned.nodes) {
+      expect(Math.round(node.x * 10) / 10).toBe(node.x)
+    }
+    expect(graphData.nodes[0]).not.toHaveProperty('x')
+  })
+
+  it('is deterministic', () => {
+    expect(withSettledPositions(graphData, 50)).toEqual(withSettledPositions(graphData, 50))
+  })
+
+  it('uses the coarser large-graph config for big graphs', () => {
+    const nodes = Array.from({ length: 1000 }, (_, i) => ({
+      id: `n${i}`,
+      title: `N${i}`,
+      type: 'note',
+      tags: [],
+      authors: [],
+      connections: 0,
+      maps: [],
+      isMap: false,
+    }))
+
+    const positioned = withSettledPositions({ nodes, edges: [] }, 1)
+
+    expect(hasLayout(positioned.nodes)).toBe(true)
+  })
+})
@@ -0,0 +1,203 @@
+import { describe, it, expect, vi } from 'vitest'
+import {
+  createInlineLayout,
+  createWorkerLayout,
+  resolveEdgeEndpoints,
+  startGraphLayout,
+  WORKER_LAYOUT_MIN_NODES,
+  type LayoutWorkerLike,
+} from '../../../app/utils/graphLayoutClient'
+import type { LayoutOptions, LayoutWorkerRequest, LayoutWorkerResponse } from '../../../shared/utils/graphLayout'
+import type { UnifiedGraphEdge, UnifiedGraphNode } from '../../../app/types/graph'
+
+function createGraph(count = 3): { nodes: UnifiedGraphNode[], edges: UnifiedGraphEdge[] } {
+  const nodes = Array.from({ length: count }, (_, i) => ({ id: `n${i}`, title: `N${i}`, type: 'note' }))
+  const edges = nodes.slice(1).map(node => ({ source: 'n0', target: node.id }))
+  return { nodes, edges }
+}
+
+function createFakeWorker() {
+  const requests: LayoutWorkerRequest[] = []
+  const worker: LayoutWorkerLike = {
+    postMessage: request => requests.push(request),
+    terminate: vi.fn(),
+    onmessage: null,
+    onerror: null,
+    onmessageerror: null,
+  }
+  const respond = (response: LayoutWorkerResponse) => worker.onmessage?.(new MessageEvent('message', { data: response }))
+  return { worker, requests, respond }
+}
+
+const options: LayoutOptions = { mode: 'freeform', width: 100, height: 100, radii: [10, 10, 10] }
+
+describe('app/utils/graphLayoutClient', () => {
+  describe('createInlineLayout', () => {
+    it('runs the simulation on the main thread and reports ticks and the end', async () => {
+      const { nodes, edges } = createGraph()
+      const onTick = vi.fn()
+      const onEnd = vi.fn()
+
+      const layout = createInlineLayout(nodes, edges, options, 0, { onTick, onEnd })
+      await vi.waitFor(() => expect(onEnd).toHaveBeenCalled())
+
+      expect(onTick).toHaveBeenCalled()
+      expect(typeof edges[0]?.source).toBe('object')
+
+      layout.reheat(0.02)
+      layout.setAlphaTarget(0)
+      layout.stop()
+      layout.dispose()
+    })
+
+    it('pins and releases nodes', () => {
+      const { nodes, edges } = createGraph()
+      const layout = createInlineLayout(nodes, edges, options, 1, { onTick: vi.fn(), onEnd: vi.fn() })
+      const [node] = nodes
+      assertDefined(node)
+
+      layout.fix(node, 5, 6)
+      expect([node.fx, node.fy]).toEqual([5, 6])
+
+      layout.release(node)
+      expect([node.fx, node.fy]).toEqual([null, null])
+      layout.dispose()
+    })
+  })
+
+  describe('resolveEdgeEndpoints', () => {
+    it('replaces known ids with node objects', () => {
+      const { nodes } = createGraph(2)
+      const edges: UnifiedGraphEdge[] = [{ source: 'n0', target: 'missing' }, { source: nodes[1] ?? 'n1', target: 'n1' }]
+
+      resolveEdgeEndpoints(nodes, edges)
+
+      expect(edges[0]?.source).toBe(nodes[0])
+      expect(edges[0]?.target).toBe('missing')
+      expect(edges[1]?.source).toBe(nodes[1])
+      expect(edges[1]?.target).toBe(nodes[1])
+    })
+  })
+
+  describe('createWorkerLayout', () => {
+    it('posts a serializable start request', () => {
+      const { nodes, edges } = createGraph()
+      const { worker, requests } = createFakeWorker()
+
+      createWorkerLayout(worker, nodes, edges, options, 1, { onTick: vi.fn(), onEnd: vi.fn() })
+
+      expect(requests).toEqual([{
+        type: 'start',
+        nodes: nodes.map(({ id }) => expect.objectContaining({ id })),
+        edges: [{ source: 'n0', target: 'n1', level: undefined }, { source: 'n0', target: 'n2', level: undefined }],
+        options: { ...options, radii: new Float32Array([10, 10, 10]) },
+        alpha: 1,
+      }])
+      expect(nodes.map(n => n.index)).toEqual([0, 1, 2])
+      expect(edges[0]?.source).toBe(nodes[0])
+    })
+
+    it('applies streamed positions', () => {
+      const { nodes, edges } = createGraph()
+      const { worker, respond } = createFakeWorker()
+      const onTick = vi.fn()
+      const onEnd = vi.fn()
+      createWorkerLayout(worker, nodes, edges, options, 1, { onTick, onEnd })
+
+      respond({ type: 'tick', positions: new Float32Array([1, 2, 3, 4, 5, 6]) })
+      expect(nodes.map(n => [n.x, n.y])).toEqual([[1, 2], [3, 4], [5, 6]])
+      expect(onTick).toHaveBeenCalledTimes(1)
+      expect(onEnd).not.toHaveBeenCalled()
+
+      respond({ type: 'end', positions: new Float32Array([0, 0, 0, 0, 0, 0]) })
+      expect(onTick).toHaveBeenCalledTimes(2)
+      expect(onEnd).toHaveBeenCalledTimes(1)
+    })
+
+    it('forwards control messages', () => {
+      const { nodes, edges } = createGraph()
+      const { worker, requests } = createFakeWorker()
+      const layout = createWorkerLayout(worker, nodes, edges, options, 1, { onTick: vi.fn(), onEnd: vi.fn() })
+      const node = nodes[2]
+      assertDefined(node)
+
+      layout.reheat(0.3)
+      layout.setAlphaTarget(0.3)
+      layout.fix(node, 7, 8)
+      layout.release(node)
+      layout.fix({ id: 'unindexed' }, 0, 0)
+      layout.release({ id: 'unindexed' })
+      layout.stop()
+      layout.dispose()
+
+      expect(requests.slice(1)).toEqual([
+        { type: 'reheat', alpha: 0.3 },
+        { type: 'target', alphaTarget: 0.3 },
+        { type: 'fix', index: 2, x: 7, y: 8 },
+        { type: 'release', index: 2 },
+        { type: 'fix', index: 0, x: 0, y: 0 },
+        { type: 'release', index: 0 },
+        { type: 'stop' },
+      ])
+      expect([node.x, node.y]).toEqual([7, 8])
+      expect(worker.terminate).toHaveBeenCalled()
+    })
+
+    it('continues on the main thread when the worker fails', async () => {
+      const { nodes, edges } = createGraph()
+      const { worker, requests } = createFakeWorker()
+      const onEnd = vi.fn()
+      const layout = createWorkerLayout(worker, nodes, edges, options, 0, { onTick: vi.fn(), onEnd })
+
+      expect(worker.onerror).toBe(worker.onmessageerror)
+      worker.onmessageerror?.(new MessageEvent('messageerror'))
+      worker.onmessageerror?.(new MessageEvent('messageerror'))
+      await vi.waitFor(() => expect(onEnd).toHaveBeenCalled())
+
+      layout.reheat(0.02)
+      layout.setAlphaTarget(0)
+      layout.dispose()
+      expect(worker.terminate).toHaveBeenCalledTimes(1)
+      expect(requests).toHaveLength(1)
+    })
+  })
+
+  describe('startGraphLayout', () => {
+    const callbacks = { onTick: vi.fn(), onEnd: vi.fn() }
+
+    it('stays on the main thread without a worker or for small graphs', () => {
+      const createWorker = vi.fn(() => createFakeWorker().worker)
+      const { nodes, edges } = createGraph()
+
+      startGraphLayout(nodes, edges, options, 0, callbacks).dispose()
+      startGraphLayout(nodes, edges, options, 0, callbacks, createWorker).dispose()
+
+      expect(createWorker).not.toHaveBeenCalled()
+    })
+
+    it('uses a worker for large graphs', () => {
+      const fake = createFakeWorker()
+      const { nodes, edges } = createGraph(WORKER_LAYOUT_MIN_NODES)
+
+      startGraphLayout(nodes, edges, options, 1, callbacks, () => fake.worker)
+
+      expect(fake.requests[0]?.type).toBe('start')
+    })
+
+    it('stays on the main thread when the worker cannot be created', async () => {
+      const onEnd = vi.fn()
+      const { nodes, edges } = createGraph(WORKER_LAYOUT_MIN_NODES)
+
+      const layout = startGraphLayout(nodes, edges, options, 0, { onTick: vi.fn(), onEnd }, () => {
+        throw new Error('Workers are not supported')
+      })
+
+      await vi.waitFor(() => expect(onEnd).toHaveBeenCalled())
+      layout.dispose()
+    })
+  })
+})
+
+function assertDefined<T>(value: T | undefined): asserts value is T {
+  expect(value).toBeDefined()
+}
@@ -0,0 +1,82 @@
+import { describe, expect, it } from 'vitest'
+import {
+  bucketIndex,
+  bucketUpperBound,
+  createLatencyHistogram,
+  latencyPercentile,
+  recordLatency,
+  summarizeLatency,
+} from '../../../server/utils/latencyHistogram'
+
+describe('bucketIndex', () => {
+  it('puts tiny, zero and invalid durations in the first bucket', () => {
+    expect(bucketIndex(0.005)).toBe(0)
+    expect(bucketIndex(0)).toBe(0)
+    expect(bucketIndex(-1)).toBe(0)
+    expect(bucketIndex(Number.NaN)).toBe(0)
+  })
+
+  it('places a duration in the bucket whose upper bound covers it', () => {
+    for (const ms of [0.02, 0.5, 1, 3.7, 42, 999]) {
+      const index = bucketIndex(ms)
+      expect(bucketUpperBound(index)).toBeGreaterThanOrEqual(ms * 0.999_999)
+      expect(bucketUpperBound(index - 1)).toBeLessThan(ms)
+    }
+  })
+
+  it('clamps very slow durations to the last bucket', () => {
+    const last = createLatencyHistogram().buckets.length - 1
+    expect(bucketIndex(10 * 60_000)).toBe(last)
+  })
+})
+
+describe('latencyPercentile', () => {
+  it('returns 0 for an empty histogram', () => {
+    expect(latencyPercentile(createLatencyHistogram(), 0.5)).toBe(0)
+  })
+
+  it('stays within one bucket (~9%) of the exact percentile', () => {
+    const histogram = createLatencyHistogram()
+    for (let ms = 1; ms <= 100; ms++) recordLatency(histogram, ms)
+
+    const p50 = latencyPercentile(histogram, 0.5)
+    const p95 = latencyPercentile(histogram, 0.95)
+    expect(p50).toBeGreaterThanOrEqual(50)
+    expect(p50).toBeLessThan(50 * 1.1)
+    expect(p95).toBeGreaterThanOrEqual(95)
+    expect(p95).toBeLessThanOrEqual(100)
+  })
+
+  it('never reports more than the largest sample', () => {
+    const histogram = createLatencyHistogram()
+    recordLatency(histogram, 3)
+
+    expect(latencyPercentile(histogram, 0.99)).toBe(3)
+  })
+
+  it('falls back to the maximum for percentiles above 1', () => {
+    const histogram = createLatencyHistogram()
+    recordLatency(histogram, 3)
+
+    expect(latencyPercentile(histogram, 2)).toBe(3)
+  })
+})
+
+describe('summarizeLatency', () => {
+  it('reports count, mean, percentiles and max', () => {
+    const histogram = createLatencyHistogram()
+    for (const ms of [1, 2, 3, 4, 90]) recordLatency(histogram, ms)
+
+    const summary = summarizeLatency(histogram)
+    expect(summary.count).toBe(5)
+    expect(summary.mean).toBe(20)
+    expect(summary.max).toBe(90)
+    expect(summary.p50).toBeGreaterThanOrEqual(3)
+    expect(summary.p50).toBeLessThan(3.3)
+    expect(summary.p99).toBe(90)
+  })
+
+  it('reports zeros for an empty histogram', () => {
+    expect(summarizeLatency(createLatencyHistogram())).toEqual({ count: 0, mean: 0, p50: 0, p95: 0, p99: 0, max: 0 })
+  })
+})
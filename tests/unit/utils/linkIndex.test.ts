@@ -0,0 +1,189 @@
+import { describe, it, expect } from 'vitest'
+import {
+  buildLinkIndex,
+  createEmptyLinkIndex,
+  createLinkIndexNode,
+  diffFingerprints,
+  getBacklinkSlugs,
+  getConnectionCount,
+  getMapSlugs,
+  getOutgoingLinks,
+  removeDocument,
+  toBacklinksIndex,
+  toContentMetaMap,
+  toGraphData,
+  upsertDocument,
+} from '../../../server/utils/linkIndex'
+import { buildGraphFromContent, type ContentItem } from '../../../server/utils/graph'
+import { buildBacklinksIndex } from '../../../server/utils/backlinks'
+import { buildContentMapWithLinks } from '../../../server/utils/mentions'
+
+function note(slug: string, links: string[] = [], overrides: Partial<ContentItem> = {}): ContentItem {
+  return {
+    path: `/${slug}`,
+    stem: slug,
+    title: slug.toUpperCase(),
+    type: 'note',
+    body: {
+      type: 'minimark',
+      value: links.map(target => ['p', {}, ['a', { href: `/${target}` }, target]]),
+    },
+    ...overrides,
+  }
+}
+
+const vault: ContentItem[] = [
+  note('a', ['b', 'c', 'b', 'a']),
+  note('b', ['a', 'missing']),
+  note('c'),
+  note('my-map', ['a', 'c'], { type: 'map' }),
+]
+
+describe('server/utils/linkIndex', () => {
+  describe('createLinkIndexNode', () => {
+    it('copies metadata and marks maps', () => {
+      const node = createLinkIndexNode(note('my-map', [], { type: 'map', tags: ['x'], authors: ['y'], summary: 's' }))
+
+      expect(node).toEqual({
+        id: 'my-map',
+        title: 'MY-MAP',
+        type: 'map',
+        tags: ['x'],
+        authors: ['y'],
+        summary: 's',
+        isMap: true,
+      })
+    })
+
+    it('applies fallbacks for missing fields', () => {
+      const node = createLinkIndexNode({ path: '/untitled' })
+
+      expect(node).toMatchObject({ id: 'untitled', title: 'untitled', type: 'note', tags: [], authors: [], isMap: false })
+    })
+  })
+
+  describe('buildLinkIndex', () => {
+    it('deduplicates links and drops self-links', () => {
+      const index = buildLinkIndex(vault)
+
+      expect([...index.outgoing.get('a') ?? []]).toEqual(['b', 'c'])
+    })
+
+    it('keeps dangling targets in the adjacency', () => {
+      const index = buildLinkIndex(vault)
+
+      expect(index.incoming.get('missing')).toEqual(new Set(['b']))
+      expect(getOutgoingLinks(index, 'b')).toEqual(['a'])
+    })
+
+    it('returns empty adjacency for unknown slugs', () => {
+      const index = createEmptyLinkIndex()
+
+      expect(getOutgoingLinks(index, 'nope')).toEqual([])
+      expect(getBacklinkSlugs(index, 'nope')).toEqual([])
+    })
+  })
+
+  describe('lookups', () => {
+    const index = buildLinkIndex(vault)
+
+    it('returns backlinks for a slug', () => {
+      expect(getBacklinkSlugs(index, 'a')).toEqual(['b', 'my-map'])
+    })
+
+    it('returns maps linking to a slug', () => {
+      expect(getMapSlugs(index, 'c')).toEqual(['my-map'])
+      expect(getMapSlugs(index, 'b')).toEqual([])
+    })
+
+    it('counts connections in both directions', () => {
+      expect(getConnectionCount(index, 'a')).toBe(4)
+      expect(getConnectionCount(index, 'c')).toBe(2)
+    })
+  })
+
+  describe('upsertDocument', () => {
+    it('replaces the adjacency of a changed document only', () => {
+      const index = buildLinkIndex(vault)
+
+      upsertDocument(index, note('b', ['c']))
+
+      expect(getBacklinkSlugs(index, 'a')).toEqual(['my-map'])
+      expect(getBacklinkSlugs(index, 'c')).toEqual(['a', 'my-map', 'b'])
+      expect(index.incoming.has('missing')).toBe(false)
+    })
+
+    it('adds new documents', () => {
+      const index = buildLinkIndex(vault)
+
+      upsertDocument(index, note('d', ['c']))
+
+      expect(index.nodes.get('d')?.title).toBe('D')
+      expect(getBacklinkSlugs(index, 'c')).toContain('d')
+    })
+  })
+
+  describe('removeDocument', () => {
+    it('drops the node and its outgoing edges', () => {
+      const index = buildLinkIndex(vault)
+
+      removeDocument(index, 'my-map')
+
+      expect(index.nodes.has('my-map')).toBe(false)
+      expect(getMapSlugs(index, 'c')).toEqual([])
+    })
+
+    it('keeps links pointing at the removed slug as dangling', () => {
+      const index = buildLinkIndex(vault)
+
+      removeDocument(index, 'c')
+
+      expect(getOutgoingLinks(index, 'a')).toEqual(['b'])
+      expect(getBacklinkSlugs(index, 'c')).toEqual(['a', 'my-map'])
+    })
+  })
+
+  describe('views', () => {
+    it('matches buildGraphFromContent', () => {
+      expect(toGraphData(buildLinkIndex(vault))).toEqual(buildGraphFromContent(vault))
+    })
+
+    it('matches buildBacklinksIndex', () => {
+      expect(toBacklinksIndex(buildLinkIndex(vault))).toEqual(buildBacklinksIndex(vault))
+    })
+
+    it('matches buildContentMapWithLinks apart from self-links', () => {
+      const contentMap = toContentMetaMap(buildLinkIndex(vault))
+      const expected = buildContentMapWithLinks(vault)
+
+      expect(contentMap.get('b')).toEqual(expected.get('b'))
+      expect(contentMap.get('a')?.linksTo).toEqual(new Set(['b', 'c']))
+    })
+
+    it('stays consistent with a full rebuild after patches', () => {
+      const index = buildLinkIndex(vault)
+      const editedA = note('a', ['c'])
+      const added = note('e', ['a'])
+      const edited = [editedA, ...vault.slice(1, 3), added]
+
+      upsertDocument(index, editedA)
+      removeDocument(index, 'my-map')
+      upsertDocument(index, added)
+
+      expect(toGraphData(index)).toEqual(buildGraphFromContent(edited))
+    })
+  })
+
+  describe('diffFingerprints', () => {
+    it('reports changed, added and removed slugs', () => {
+      const previous = new Map([['a', '1'], ['b', '2'], ['c', '3']])
+      const next = new Map([['a', '1'], ['b', '9'], ['d', '4']])
+
+      expect(diffFingerprints(previous, next)).toEqual({ changed: ['b', 'd'], removed: ['c'] })
+    })
+
+    it('treats everything as changed against an empty baseline', () => {
+      expect(diffFingerprints(new Map(), new Map([['a', '1']]))).toEqual({ changed: ['a'], removed: [] })
+    })
+  })
+})
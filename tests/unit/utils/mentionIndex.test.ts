@@ -0,0 +1,157 @@
+import { describe, it, expect } from 'vitest'
+import {
+  MIN_MENTION_TITLE_LENGTH,
+  buildMentionAutomaton,
+  buildMentionsIndex,
+  collectMentionPatterns,
+  scanTokens,
+  toLinkSuggestions,
+  tokenizeWithOffsets,
+} from '../../../server/utils/mentionIndex'
+import { findUnlinkedMentions, type ContentMeta, type SearchSection } from '../../../server/utils/mentions'
+import type { ContentItem } from '../../../server/utils/graph'
+
+function meta(title: string, linksTo: string[] = [], type = 'note'): ContentMeta {
+  return { title, type, linksTo: new Set(linksTo) }
+}
+
+const contentMap = new Map<string, ContentMeta>([
+  ['atomic-habits', meta('Atomic Habits', [], 'book')],
+  ['habits', meta('Habits')],
+  ['article-one', meta('Article One', ['atomic-habits'], 'article')],
+  ['article-two', meta('Article Two', [], 'article')],
+  ['vue', meta('Vue')],
+])
+
+const sections: SearchSection[] = [
+  { id: '/article-one#intro', content: 'This article discusses Atomic Habits and how to build better routines.' },
+  { id: '/article-two#main', content: 'Some habits stick. Atomic habits compound over time.' },
+  { id: '/article-two#more', content: 'Atomic Habits again, in a second section.' },
+  { id: '/atomic-habits#self', content: 'Atomic Habits talks about itself.' },
+  { id: '/unknown#x', content: 'Atomic Habits from a page outside the collection.' },
+  { id: '/vue#empty' },
+]
+
+describe('server/utils/mentionIndex', () => {
+  describe('tokenizeWithOffsets', () => {
+    it('returns lowercase word tokens with offsets', () => {
+      expect(tokenizeWithOffsets('Vue.js, Über!')).toEqual([
+        { value: 'vue', start: 0, end: 3 },
+        { value: 'js', start: 4, end: 6 },
+        { value: 'über', start: 8, end: 12 },
+      ])
+    })
+  })
+
+  describe('buildMentionAutomaton / scanTokens', () => {
+    const automaton = buildMentionAutomaton([
+      { slug: 'he', text: 'he' },
+      { slug: 'she', text: 'she he' },
+      { slug: 'hers', text: 'he rs' },
+      { slug: 'empty', text: '!!!' },
+    ])
+
+    it('ignores patterns without word tokens', () => {
+      expect(automaton.patterns.map(p => p.slug)).toEqual(['he', 'she', 'hers'])
+    })
+
+    it('reports overlapping matches through failure links', () => {
+      const matches = scanTokens(automaton, tokenizeWithOffsets('she he rs'))
+
+      expect(matches.map(m => [automaton.patterns[m.pattern]?.slug, m.startToken, m.endToken])).toEqual([
+        ['she', 0, 1],
+        ['he', 1, 1],
+        ['hers', 1, 2],
+      ])
+    })
+
+    it('resets on tokens outside the vocabulary', () => {
+      expect(scanTokens(automaton, tokenizeWithOffsets('she xx he'))).toEqual([{ pattern: 0, startToken: 2, endToken: 2 }])
+    })
+  })
+
+  describe('collectMentionPatterns', () => {
+    it('includes titles and aliases long enough to match', () => {
+      const patterns = collectMentionPatterns(
+        new Map([['a', meta('AB')], ['b', meta('Beta')]]),
+        new Map([['a', ['Alpha', 'A']]]),
+      )
+
+      expect(patterns).toEqual([{ slug: 'a', text: 'Alpha' }, { slug: 'b', text: 'Beta' }])
+      expect(MIN_MENTION_TITLE_LENGTH).toBe(3)
+    })
+
+    it('measures length on word tokens, not punctuation', () => {
+      const patterns = collectMentionPatterns(
+        new Map([['cpp', meta('C++')], ['rnd', meta('R&D')], ['csharp', meta('C#.NET')]]),
+        new Map([['cpp', ['C/C++']]]),
+      )
+
+      expect(patterns).toEqual([{ slug: 'csharp', text: 'C#.NET' }])
+    })
+
+    it('does not report standalone letters for punctuation-heavy titles', () => {
+      const notes = new Map([['cpp', meta('C++')], ['article', meta('Article')]])
+      const index = buildMentionsIndex(notes, [{ id: '/article#plan', content: 'Plan c is to learn C++ and R&D.' }])
+
+      expect(index.get('cpp')).toBeUndefined()
+    })
+  })
+
+  describe('buildMentionsIndex', () => {
+    const index = buildMentionsIndex(contentMap, sections)
+
+    it('finds mentions of every note in one pass', () => {
+      expect(index.get('atomic-habits')?.map(m => m.slug)).toEqual(['article-two'])
+      // "Atomic Habits" also mentions "Habits", as with the per-note regex
+      expect(index.get('habits')?.map(m => m.slug)).toEqual(['article-one', 'article-two', 'atomic-habits'])
+    })
+
+    it('skips self-mentions, linked sources and unknown pages', () => {
+      const sources = index.get('atomic-habits')?.map(m => m.slug)
+
+      expect(sources).not.toContain('atomic-habits')
+      expect(sources).not.toContain('article-one')
+      expect(sources).not.toContain('unknown')
+    })
+
+    it('keeps the first matching section per source with the matched text highlighted', () => {
+      const [mention] = index.get('atomic-habits') ?? []
+
+      expect(mention).toMatchObject({ slug: 'article-two', title: 'Article Two', type: 'article' })
+      expect(mention?.snippet).toContain('Atomic habits compound')
+      expect(mention?.highlightedSnippet).toContain('<mark')
+    })
+
+    it('matches aliases', () => {
+      const aliased = buildMentionsIndex(contentMap, sections, collectMentionPatterns(contentMap, new Map([['vue', ['routines']]])))
+
+      expect(aliased.get('vue')?.map(m => m.slug)).toEqual(['article-one'])
+    })
+
+    it('agrees with findUnlinkedMentions for a single note', () => {
+      const content: ContentItem[] = [
+        { path: '/article-one', title: 'Article One', type: 'article', body: { type: 'minimark', value: [['p', {}, ['a', { href: '/atomic-habits' }, 'x']]] } },
+        { path: '/article-two', title: 'Article Two', type: 'article', body: { type: 'minimark', value: [] } },
+        { path: '/atomic-habits', title: 'Atomic Habits', type: 'book', body: { type: 'minimark', value: [] } },
+      ]
+
+      const expected = findUnlinkedMentions(content, sections, 'atomic-habits', 'Atomic Habits').map(m => m.slug)
+
+      expect(index.get('atomic-habits')?.map(m => m.slug)).toEqual(expected)
+    })
+  })
+
+  describe('toLinkSuggestions', () => {
+    it('lists suggestions by source then target', () => {
+      const suggestions = toLinkSuggestions(buildMentionsIndex(contentMap, sections), contentMap)
+
+      expect(suggestions.map(s => [s.source, s.target, s.targetTitle])).toEqual([
+        ['article-one', 'habits', 'Habits'],
+        ['article-two', 'atomic-habits', 'Atomic Habits'],
+        ['article-two', 'habits', 'Habits'],
+        ['atomic-habits', 'habits', 'Habits'],
+      ])
+    })
+  })
+})
@@ -0,0 +1,115 @@
+import { describe, it, expect } from 'vitest'
+import {
+  MAX_LEVEL2_NODES,
+  buildL1Edges,
+  buildNoteGraph,
+  collectLevel2Edges,
+  isValidL2Slug,
+} from '../../../server/utils/noteGraph'
+import { buildLinkIndex } from '../../../server/utils/linkIndex'
+import type { ContentItem } from '../../../server/utils/graph'
+
+function note(slug: string, links: string[] = [], type = 'note'): ContentItem {
+  return {
+    path: `/${slug}`,
+    title: `Title ${slug}`,
+    type,
+    body: {
+      type: 'minimark',
+      value: links.map(target => ['p', {}, ['a', { href: `/${target}` }, target]]),
+    },
+  }
+}
+
+// center → l1-out → l2-out, l1-in → center, l2-in → l1-in
+const index = buildLinkIndex([
+  note('center', ['l1-out', 'missing']),
+  note('l1-out', ['l2-out', 'center']),
+  note('l1-in', ['center']),
+  note('l2-out'),
+  note('l2-in', ['l1-in'], 'book'),
+  note('isolated'),
+])
+
+describe('server/utils/noteGraph', () => {
+  describe('buildL1Edges', () => {
+    it('creates outgoing then incoming edges', () => {
+      expect(buildL1Edges('c', ['a'], ['b'])).toEqual([
+        { source: 'c', target: 'a', level: 1 },
+        { source: 'b', target: 'c', level: 1 },
+      ])
+    })
+  })
+
+  describe('isValidL2Slug', () => {
+    const level1Set = new Set(['l1'])
+
+    it('rejects the center, the L1 node itself and other L1 nodes', () => {
+      expect(isValidL2Slug('center', 'center', 'x', level1Set)).toBe(false)
+      expect(isValidL2Slug('x', 'center', 'x', level1Set)).toBe(false)
+      expect(isValidL2Slug('l1', 'center', 'x', level1Set)).toBe(false)
+    })
+
+    it('accepts other slugs', () => {
+      expect(isValidL2Slug('other', 'center', 'x', level1Set)).toBe(true)
+    })
+  })
+
+  describe('collectLevel2Edges', () => {
+    it('collects neighbours of L1 nodes in both directions', () => {
+      const result = collectLevel2Edges(index, ['l1-out', 'l1-in'], 'center')
+
+      expect([...result.level2Slugs]).toEqual(['l2-out', 'l2-in'])
+      expect(result.level2Edges).toEqual([
+        { source: 'l1-out', target: 'l2-out', level: 2 },
+        { source: 'l2-in', target: 'l1-in', level: 2 },
+      ])
+    })
+
+    it(`caps L2 nodes at ${MAX_LEVEL2_NODES}`, () => {
+      const leaves = Array.from({ length: MAX_LEVEL2_NODES + 5 }, (_, i) => `leaf-${i}`)
+      const hubIndex = buildLinkIndex([
+        note('hub', ['spoke']),
+        note('spoke', leaves),
+        ...leaves.map(leaf => note(leaf)),
+      ])
+
+      const result = collectLevel2Edges(hubIndex, ['spoke'], 'hub')
+
+      expect(result.level2Slugs.size).toBe(MAX_LEVEL2_NODES)
+      expect(result.level2Edges).toHaveLength(MAX_LEVEL2_NODES)
+    })
+  })
+
+  describe('buildNoteGraph', () => {
+    it('returns null for unknown slugs', () => {
+      expect(buildNoteGraph(index, 'nope')).toBeNull()
+    })
+
+    it('builds center, L1 and L2 nodes', () => {
+      const graph = buildNoteGraph(index, 'center')
+
+      expect(graph?.center).toEqual({ id: 'center', title: 'Title center', type: 'note', isCenter: true, level: 0 })
+      expect(graph?.connected).toEqual([
+        { id: 'l1-out', title: 'Title l1-out', type: 'note', level: 1 },
+        { id: 'l1-in', title: 'Title l1-in', type: 'note', level: 1 },
+        { id: 'l2-out', title: 'Title l2-out', type: 'note', level: 2 },
+        { id: 'l2-in', title: 'Title l2-in', type: 'book', level: 2 },
+      ])
+    })
+
+    it('ignores dangling links and includes mutual links in both directions', () => {
+      const graph = buildNoteGraph(index, 'center')
+
+      expect(graph?.edges.filter(e => e.level === 1)).toEqual([
+        { source: 'center', target: 'l1-out', level: 1 },
+        { source: 'l1-out', target: 'center', level: 1 },
+        { source: 'l1-in', target: 'center', level: 1 },
+      ])
+    })
+
+    it('returns an isolated note with no connections', () => {
+      expect(buildNoteGraph(index, 'isolated')).toMatchObject({ connected: [], edges: [] })
+    })
+  })
+})
@@ -1,5 +1,5 @@
 import { describe, expect, it } from 'vitest'
-import { escapeRegex, getSnippet, highlightMatch } from '../../../server/utils/text'
+import { escapeRegex, getSnippet, hashString, highlightMatch } from '../../../server/utils/text'
 
 describe('escapeRegex', () => {
   it('escapes dots', () => {
@@ -157,3 +157,21 @@ describe('highlightMatch', () => {
     expect(result).toBe(text)
   })
 })
+
+describe('hashString', () => {
+  it('returns the FNV-1a offset basis for an empty string', () => {
+    expect(hashString('')).toBe('811c9dc5')
+  })
+
+  it('returns 8 hex characters', () => {
+    expect(hashString('hello world')).toMatch(/^[0-9a-f]{8}$/)
+  })
+
+  it('is deterministic', () => {
+    expect(hashString('same input')).toBe(hashString('same input'))
+  })
+
+  it('changes when the input changes', () => {
+    expect(hashString('note body v1')).not.toBe(hashString('note body v2'))
+  })
+})
@@ -0,0 +1,55 @@
+import { describe, expect, it } from 'vitest'
+import { createTopK } from '../../../shared/utils/topK'
+
+describe('shared/utils/topK', () => {
+  it('keeps the K highest scores in descending order', () => {
+    const heap = createTopK(3, 6)
+    const scores = [0.1, 0.9, 0.4, 0.7, 0.2, 0.8]
+    scores.forEach((score, row) => heap.push(row, score))
+
+    expect(heap.results()).toEqual([
+      { row: 1, score: 0.9 },
+      { row: 5, score: 0.8 },
+      { row: 3, score: 0.7 },
+    ])
+  })
+
+  it('returns fewer results than K when underfilled', () => {
+    const heap = createTopK(5, 5)
+    heap.push(0, 1)
+
+    expect(heap.results()).toEqual([{ row: 0, score: 1 }])
+  })
+
+  it('returns nothing for K = 0', () => {
+    const heap = createTopK(0, 1)
+    heap.push(0, 1)
+
+    expect(heap.results()).toEqual([])
+  })
+
+  it('floors a fractional K', () => {
+    const heap = createTopK(2.5, 4)
+    for (const row of [0, 1, 2, 3]) heap.push(row, row)
+
+    expect(heap.results().map(hit => hit.row)).toEqual([3, 2])
+  })
+
+  it('clamps K to the number of candidate rows', () => {
+    const heap = createTopK(1e12, 2)
+    heap.push(0, 1)
+    heap.push(1, 2)
+    heap.push(2, 3)
+
+    expect(heap.results().map(hit => hit.row)).toEqual([2, 1])
+  })
+
+  it('treats negative and NaN K as empty', () => {
+    for (const k of [-3, Number.NaN]) {
+      const heap = createTopK(k, 4)
+      heap.push(0, 1)
+
+      expect(heap.results()).toEqual([])
+    }
+  })
+})
@@ -0,0 +1,212 @@
+import { IncomingMessage, ServerResponse } from 'node:http'
+import { Socket } from 'node:net'
+import { createEvent } from 'h3'
+import { afterEach, describe, expect, it } from 'vitest'
+import { tryCatch } from '../../../shared/utils/tryCatch'
+import {
+  configureTracing,
+  defineTracedEventHandler,
+  formatServerTiming,
+  getLatencyStats,
+  getTraceTimings,
+  isHistogramEnabled,
+  isTracingEnabled,
+  recordSpan,
+  resetTracing,
+  runWithTrace,
+  startRequestTrace,
+  summarizeSpans,
+  traceSpan,
+  traceSpanAsync,
+  type RequestTrace,
+} from '../../../server/utils/tracing'
+
+function createTestEvent() {
+  const req = new IncomingMessage(new Socket())
+  const res = new ServerResponse(req)
+  return { event: createEvent(req, res), res }
+}
+
+function tracedRun<T>(fn: () => T): { trace: RequestTrace, result: T } {
+  const trace = startRequestTrace()
+  if (!trace) throw new Error('tracing is disabled')
+  return { trace, result: runWithTrace(trace, fn) }
+}
+
+afterEach(() => {
+  resetTracing()
+})
+
+describe('configureTracing', () => {
+  it('is disabled by default', () => {
+    expect(isTracingEnabled()).toBe(false)
+    expect(isHistogramEnabled()).toBe(false)
+    expect(startRequestTrace()).toBeNull()
+  })
+
+  it('enables tracing when histograms are requested', () => {
+    configureTracing({ histogram: true })
+
+    expect(isTracingEnabled()).toBe(true)
+    expect(isHistogramEnabled()).toBe(true)
+  })
+})
+
+describe('when disabled', () => {
+  it('runs spans without recording them', async () => {
+    const trace: RequestTrace = { start: 0, spans: [] }
+
+    const value = runWithTrace(trace, () => traceSpan('sync', () => 1))
+    const asyncValue = await runWithTrace(trace, () => traceSpanAsync('async', async () => 2))
+
+    expect([value, asyncValue]).toEqual([1, 2])
+    expect(trace.spans).toEqual([])
+  })
+
+  it('runs the function directly without a trace', () => {
+    expect(runWithTrace(null, () => 'ran')).toBe('ran')
+  })
+})
+
+describe('spans', () => {
+  it('records sync and async spans on the active trace', async () => {
+    configureTracing({ enabled: true })
+
+    const { trace, result } = tracedRun(async () => {
+      traceSpan('index.build', () => 'built')
+      return traceSpanAsync('content.query', async () => 'rows')
+    })
+
+    expect(await result).toBe('rows')
+    expect(trace.spans.map(span => span.name)).toEqual(['index.build', 'content.query'])
+    expect(trace.spans.every(span => span.duration >= 0)).toBe(true)
+  })
+
+  it('records failed spans and rethrows', async () => {
+    configureTracing({ enabled: true })
+    const error = new Error('boom')
+
+    const sync = tracedRun(() => tryCatch(() => traceSpan('sync', () => {
+      throw error
+    })))
+    const rejected = tracedRun(() => traceSpanAsync('async', () => Promise.reject(error)))
+
+    await expect(rejected.result).rejects.toBe(error)
+    expect(sync.result[0]).toBe(error)
+    expect(sync.trace.spans.map(span => span.name)).toEqual(['sync'])
+    expect(rejected.trace.spans.map(span => span.name)).toEqual(['async'])
+  })
+
+  it('keeps concurrent traces apart', async () => {
+    configureTracing({ enabled: true })
+    const wait = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+    const first = tracedRun(() => traceSpanAsync('first', () => wait(5)))
+    const second = tracedRun(() => traceSpanAsync('second', () => wait(1)))
+    await Promise.all([first.result, second.result])
+
+    expect(first.trace.spans.map(span => span.name)).toEqual(['first'])
+    expect(second.trace.spans.map(span => span.name)).toEqual(['second'])
+  })
+
+  it('feeds only the histograms from spans outside a request', () => {
+    configureTracing({ enabled: true })
+    recordSpan('background', 3)
+    expect(getLatencyStats()).toEqual({})
+
+    configureTracing({ histogram: true })
+    recordSpan('background', 3)
+    expect(getLatencyStats().background?.count).toBe(1)
+  })
+})
+
+describe('summarizeSpans', () => {
+  it('sums spans per name in first-seen order', () => {
+    const summary = summarizeSpans([
+      { name: 'content.query', duration: 1.23 },
+      { name: 'tool.search_notes', duration: 10 },
+      { name: 'content.query', duration: 2.01 },
+    ])
+
+    expect(summary).toEqual([
+      { name: 'content.query', duration: 3.2, count: 2 },
+      { name: 'tool.search_notes', duration: 10, count: 1 },
+    ])
+  })
+})
+
+describe('getTraceTimings', () => {
+  it('reports elapsed time and summarized spans', () => {
+    const trace: RequestTrace = { start: performance.now() - 50, spans: [{ name: 'model.load', duration: 40 }] }
+    const timings = getTraceTimings(trace)
+
+    expect(timings.totalMs).toBeGreaterThanOrEqual(50)
+    expect(timings.spans).toEqual([{ name: 'model.load', duration: 40, count: 1 }])
+  })
+})
+
+describe('formatServerTiming', () => {
+  it('formats one metric per span name plus the total', () => {
+    const header = formatServerTiming({
+      totalMs: 12.5,
+      spans: [
+        { name: 'content.query', duration: 4, count: 2 },
+        { name: 'index.link.build', duration: 7.3, count: 1 },
+      ],
+    })
+
+    expect(header).toBe('content.query;dur=4;desc="2x", index.link.build;dur=7.3, total;dur=12.5')
+  })
+
+  it('reports only the total without spans', () => {
+    expect(formatServerTiming({ totalMs: 0.4, spans: [] })).toBe('total;dur=0.4')
+  })
+})
+
+describe('getLatencyStats', () => {
+  it('reports percentiles per span name, sorted by name', async () => {
+    configureTracing({ histogram: true })
+    const { result } = tracedRun(async () => {
+      traceSpan('vector.search', () => null)
+      traceSpan('embeddings.query', () => null)
+      await traceSpanAsync('embeddings.query', async () => null)
+    })
+    await result
+
+    const stats = getLatencyStats()
+    expect(Object.keys(stats)).toEqual(['embeddings.query', 'vector.search'])
+    expect(stats['embeddings.query']?.count).toBe(2)
+    expect(Object.keys(stats['vector.search'] ?? {})).toEqual(['count', 'mean', 'p50', 'p95', 'p99', 'max'])
+  })
+
+  it('is cleared by resetTracing', () => {
+    configureTracing({ histogram: true })
+    recordSpan('content.query', 1)
+    resetTracing()
+
+    expect(getLatencyStats()).toEqual({})
+  })
+})
+
+describe('defineTracedEventHandler', () => {
+  it('returns the handler result without a header when disabled', async () => {
+    const { event, res } = createTestEvent()
+    const handler = defineTracedEventHandler(() => ({ ok: true }))
+
+    expect(await handler(event)).toEqual({ ok: true })
+    expect(res.getHeader('server-timing')).toBeUndefined()
+  })
+
+  it('sets a Server-Timing header with the request spans', async () => {
+    configureTracing({ enabled: true })
+    const { event, res } = createTestEvent()
+    const handler = defineTracedEventHandler(async () => {
+      await traceSpanAsync('content.query', async () => null)
+      await traceSpanAsync('content.query', async () => null)
+      return 'done'
+    })
+
+    expect(await handler(event)).toBe('done')
+    expect(String(res.getHeader('server-timing'))).toMatch(/^content\.query;dur=[\d.]+;desc="2x", total;dur=[\d.]+$/)
+  })
+})
@@ -0,0 +1,207 @@
+import { describe, expect, it } from 'vitest'
+import {
+  buildIvfIndex,
+  buildTypeRanges,
+  createVectorIndex,
+  groupRowsByType,
+  isGroupedByType,
+  scoreRow,
+  searchVectors,
+} from '../../../shared/utils/vectorSearch'
+import {
+  decodeEmbeddingsBinary,
+  encodeEmbeddingsBinary,
+  getRowVector,
+  type EmbeddingsManifest,
+  type EmbeddingsMatrix,
+} from '../../../shared/utils/embeddingsBinary'
+
+function normalize(vector: number[]): number[] {
+  const norm = Math.sqrt(vector.reduce((sum, v) => sum + v * v, 0))
+  return vector.map(v => v / norm)
+}
+
+function createMatrix(rows: Array<{ slug: string, type: string, vector: number[] }>): EmbeddingsMatrix {
+  const manifest: EmbeddingsManifest = {
+    version: '1.1.0',
+    model: 'test-model',
+    entries: rows.map(({ slug, type }) => ({ slug, title: slug.toUpperCase(), type })),
+  }
+  return decodeEmbeddingsBinary(encodeEmbeddingsBinary(manifest, rows.map(r => normalize(r.vector))).buffer)
+}
+
+// Deterministic pseudo-random unit vectors
+function randomMatrix(count: number, dimensions: number): EmbeddingsMatrix {
+  let seed = 42
+  const next = () => {
+    seed = (seed * 1664525 + 1013904223) % 4294967296
+    return seed / 4294967296 - 0.5
+  }
+  return createMatrix(Array.from({ length: count }, (_, i) => ({
+    slug: `n${i}`,
+    type: i % 3 === 0 ? 'book' : 'note',
+    vector: Array.from({ length: dimensions }, next),
+  })))
+}
+
+const mixed = createMatrix([
+  { slug: 'a', type: 'note', vector: [1, 0, 0, 0, 0] },
+  { slug: 'b', type: 'book', vector: [0.9, 0.1, 0, 0, 0] },
+  { slug: 'c', type: 'note', vector: [0, 1, 0, 0, 0] },
+  { slug: 'd', type: 'book', vector: [0.5, 0.5, 0, 0, 0] },
+  { slug: 'e', type: 'note', vector: [0.8, 0, 0.6, 0, 0] },
+])
+
+describe('shared/utils/vectorSearch', () => {
+  describe('groupRowsByType', () => {
+    it('detects interleaved types', () => {
+      expect(isGroupedByType(mixed)).toBe(false)
+    })
+
+    it('groups rows and carries their scales and vectors along', () => {
+      const grouped = groupRowsByType(mixed)
+
+      expect(isGroupedByType(grouped)).toBe(true)
+      expect(grouped.manifest.entries.map(e => e.slug)).toEqual(['b', 'd', 'a', 'c', 'e'])
+      expect(getRowVector(grouped, 0)).toEqual(getRowVector(mixed, 1))
+    })
+
+    it('returns already grouped matrices untouched', () => {
+      const grouped = groupRowsByType(mixed)
+
+      expect(groupRowsByType(grouped)).toBe(grouped)
+    })
+  })
+
+  describe('buildTypeRanges', () => {
+    it('maps each type to its contiguous rows', () => {
+      const ranges = buildTypeRanges(groupRowsByType(mixed))
+
+      expect(ranges.get('book')).toEqual({ start: 0, end: 2 })
+      expect(ranges.get('note')).toEqual({ start: 2, end: 5 })
+    })
+  })
+
+  describe('scoreRow', () => {
+    it('matches a plain dot product with the dequantized row', () => {
+      const matrix = randomMatrix(4, 13)
+      const query = Float32Array.from(normalize(Array.from({ length: 13 }, (_, i) => i - 6)))
+
+      for (let row = 0; row < matrix.count; row++) {
+        const expected = getRowVector(matrix, row).reduce((sum, value, i) => sum + value * (query[i] ?? 0), 0)
+        expect(scoreRow(matrix, row, query)).toBeCloseTo(expected, 5)
+      }
+    })
+  })
+
+  describe('searchVectors', () => {
+    const index = createVectorIndex(mixed)
+    const slugsOf = (hits: Array<{ row: number }>) => hits.map(h => index.matrix.manifest.entries[h.row]?.slug)
+
+    it('returns the top K rows by score', () => {
+      expect(slugsOf(searchVectors(index, [1, 0, 0, 0, 0], { topK: 3 }))).toEqual(['a', 'b', 'e'])
+    })
+
+    it('only scores rows of the requested type', () => {
+      expect(slugsOf(searchVectors(index, [1, 0, 0, 0, 0], { topK: 3, type: 'book' }))).toEqual(['b', 'd'])
+    })
+
+    it('tolerates fractional and oversized K', () => {
+      expect(slugsOf(searchVectors(index, [1, 0, 0, 0, 0], { topK: 2.5 }))).toEqual(['a', 'b'])
+      expect(searchVectors(index, [1, 0, 0, 0, 0], { topK: 1e12 })).toHaveLength(index.matrix.count)
+    })
+
+    it('returns nothing for unknown types', () => {
+      expect(searchVectors(index, [1, 0, 0, 0, 0], { topK: 3, type: 'podcast' })).toEqual([])
+    })
+
+    it('skips the excluded row', () => {
+      const row = index.rowBySlug.get('a')
+
+      expect(slugsOf(searchVectors(index, [1, 0, 0, 0, 0], { topK: 2, excludeRow: row }))).toEqual(['b', 'e'])
+    })
+
+    it('throws on dimension mismatch', () => {
+      expect(() => searchVectors(index, [1, 0], { topK: 1 })).toThrow('Vector length mismatch')
+    })
+  })
+
+  describe('IVF index', () => {
+    const matrix = randomMatrix(400, 16)
+
+    it('assigns every row to exactly one list', () => {
+      const ivf = buildIvfIndex(matrix, 10, 3)
+      const rows = ivf.lists.flatMap(list => Array.from(list)).sort((a, b) => a - b)
+
+      expect(rows).toEqual(Array.from({ length: 400 }, (_, i) => i))
+      expect(ivf.probes).toBe(3)
+    })
+
+    it('is only built above the threshold', () => {
+      expect(createVectorIndex(matrix).ivf).toBeNull()
+      expect(createVectorIndex(matrix, { annThreshold: 100 }).ivf).not.toBeNull()
+    })
+
+    it('finds the exact nearest neighbour of an indexed row', () => {
+      const index = createVectorIndex(matrix, { annThreshold: 100, ivfLists: 20, ivfProbes: 4 })
+      const query = Array.from({ length: 16 }, (_, i) => (index.matrix.data[37 * 16 + i] ?? 0) * (index.matrix.scales[37] ?? 1))
+
+      const approximate = searchVectors(index, query, { topK: 1 })
+      const exact = searchVectors(index, query, { topK: 1, exact: true })
+
+      expect(approximate[0]?.row).toBe(37)
+      expect(exact[0]?.row).toBe(37)
+    })
+
+    it('respects the type filter', () => {
+      const index = createVectorIndex(matrix, { annThreshold: 100, ivfProbes: 20 })
+      const range = index.typeRanges.get('book')
+      const hits = searchVectors(index, Array.from({ length: 16 }, () => 0.25), { topK: 10, type: 'book' })
+
+      expect(hits).toHaveLength(10)
+      expect(hits.every(h => range !== undefined && h.row >= range.start && h.row < range.end)).toBe(true)
+    })
+
+    describe('with a type missing from the nearest lists', () => {
+      // Notes cluster on the first axis, podcasts on the second and third
+      const clustered = createMatrix([
+        { slug: 'n0', type: 'note', vector: [1, 0.1, 0, 0] },
+        { slug: 'n1', type: 'note', vector: [1, 0, 0.1, 0] },
+        { slug: 'n2', type: 'note', vector: [1, 0, 0, 0.1] },
+        { slug: 'p0', type: 'podcast', vector: [0.3, 1, 0, 0] },
+        { slug: 'p1', type: 'podcast', vector: [0.2, 1, 0.1, 0] },
+        { slug: 'p2', type: 'podcast', vector: [0.1, 0, 1, 0] },
+      ])
+      const centroids = Float32Array.from([1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0])
+      const query = [1, 0.1, 0, 0]
+
+      function withLists(lists: number[][]) {
+        const index = createVectorIndex(clustered)
+        index.ivf = { centroids, lists: lists.map(rows => Uint32Array.from(rows)), probes: 1 }
+        return index
+      }
+
+      it('only probes lists holding rows of the type', () => {
+        const index = withLists([[0, 1, 2], [3, 4], [5]])
+        const hits = searchVectors(index, query, { topK: 2, type: 'podcast' })
+
+        expect(hits).toEqual(searchVectors(index, query, { topK: 2, type: 'podcast', exact: true }))
+      })
+
+      it('falls back to an exact scan when the probed lists run short', () => {
+        const index = withLists([[0, 1, 2, 3], [4], [5]])
+        const hits = searchVectors(index, query, { topK: 3, type: 'podcast' })
+
+        expect(hits).toHaveLength(3)
+        expect(hits).toEqual(searchVectors(index, query, { topK: 3, type: 'podcast', exact: true }))
+      })
+
+      it('does not count the excluded row as missing', () => {
+        const index = withLists([[0, 1, 2, 3, 4], [5]])
+        const hits = searchVectors(index, query, { topK: 3, type: 'podcast', excludeRow: 5 })
+
+        expect(hits.map(h => h.row)).toEqual([3, 4])
+      })
+    })
+  })
+})
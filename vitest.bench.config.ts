@@ -0,0 +1,21 @@
+import { fileURLToPath } from 'node:url'
+import { defineConfig } from 'vitest/config'
+
+// Vitest config for `vitest bench` over synthetic vaults (tests/bench)
+// Results go to reports/bench/latest.json, see scripts/compare-bench.ts
+export default defineConfig({
+  test: {
+    environment: 'node',
+    benchmark: {
+      include: ['tests/bench/**/*.bench.ts'],
+      outputJson: 'reports/bench/latest.json',
+    },
+  },
+  resolve: {
+    alias: {
+      '~': fileURLToPath(new URL('./app', import.meta.url)),
+      '~~': fileURLToPath(new URL('./', import.meta.url)),
+      '#shared': fileURLToPath(new URL('./shared', import.meta.url)),
+    },
+  },
+})
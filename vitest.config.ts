@@ -33,9 +33,12 @@ export default defineConfig({
         'app/composables/useRandomNote.ts',
         // App utils not part of FC/IS extraction (D3/graph helpers, YouTube embed utils)
         'app/utils/graphColors.ts',
-        'app/utils/graphForces.ts',
         'app/utils/graphNormalize.ts',
         'app/utils/youtube.ts',
+        // Content query shells - index logic lives in the matching pure modules
+        'server/utils/linkIndexStore.ts',
+        'server/utils/chat/keywordIndexStore.ts',
+        'server/utils/mentionIndexStore.ts',
         // Nitro plugin - logic extracted to server/utils/wikilinks.ts
         'server/plugins/**/*.ts',
       ],
@@ -62,6 +65,7 @@ export default defineConfig({
           alias: {
             '~': fileURLToPath(new URL('./app', import.meta.url)),
             '~~': fileURLToPath(new URL('./', import.meta.url)),
+            '#shared': fileURLToPath(new URL('./shared', import.meta.url)),
             '#imports': fileURLToPath(new URL('./tests/mocks/imports.ts', import.meta.url)),
           },
         },